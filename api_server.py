@@ -0,0 +1,238 @@
+"""ASGI API server for running screenings without Streamlit.
+
+Exposes the same interview flow as app.py over REST and WebSocket, with one
+ScreeningSession per candidate kept in a pluggable SessionStore. Generated
+questions are streamed over the WebSocket as soon as the LLM produces them.
+Prometheus metrics are served at GET /metrics.
+
+Usage (from the repository root):
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+    python api_server.py
+    python api_server.py --profile-startup   # report import and initialization cost first
+"""
+import sys
+import asyncio
+import logging
+import weakref
+from contextlib import aclosing
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+if "--profile-startup" in sys.argv:
+    from utils.startup_profile import profile_startup
+    profile_startup()
+
+from modules.screening_session import ScreeningSession
+from modules.candidate_info import CandidateInfoCollector
+from modules.tech_questions import TechQuestionGenerator
+from utils.session_store import create_session_store
+from utils.metrics import render_prometheus, PROMETHEUS_CONTENT_TYPE
+from config.config import Config
+
+class MessageRequest(BaseModel):
+    """A candidate message."""
+    content: str
+
+def create_app(store=None):
+    """Create the API application.
+
+    Args:
+        store (SessionStore, optional): Where sessions are kept. Defaults to the
+            Config.SESSION_STORE backend.
+
+    Returns:
+        FastAPI: The ASGI application
+    """
+    # Both are stateless, so every session shares one instance
+    collector = CandidateInfoCollector()
+    generator = TechQuestionGenerator()
+
+    def restore_session(data):
+        return ScreeningSession.from_dict(data, candidate_collector=collector, question_generator=generator)
+
+    store = store if store else create_session_store(session_factory=restore_session)
+    # Serializes requests that touch the same session id; a lock is dropped once no request holds it
+    locks = weakref.WeakValueDictionary()
+
+    api = FastAPI(title=f"{Config.APP_NAME} API", description=Config.APP_DESCRIPTION)
+    api.state.store = store
+
+    def new_session():
+        return ScreeningSession(candidate_collector=collector, question_generator=generator)
+
+    # Store backends do blocking I/O (SQLite, Redis), so they run on worker threads
+    async def load_session(session_id):
+        session = await asyncio.to_thread(store.get, session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+
+    async def save_session(session):
+        await asyncio.to_thread(store.save, session)
+
+    def lock_for(session_id):
+        """Get the lock for a session id. Load the session after taking it, so every request sees the last save."""
+        lock = locks.get(session_id)
+        if lock is None:
+            lock = locks[session_id] = asyncio.Lock()
+        return lock
+
+    def session_status(session, responses):
+        return {
+            "session_id": session.session_id,
+            "stage": session.current_stage,
+            "generating_questions": session.is_generating_questions(),
+            "responses": responses
+        }
+
+    @api.post("/sessions", status_code=201)
+    async def create_session():
+        session = new_session()
+        responses = await asyncio.to_thread(session.start)
+        await save_session(session)
+        return session_status(session, responses)
+
+    async def load_graded_session(session_id):
+        """Load a session and take in LLM grades that arrived since it was last saved."""
+        session = await load_session(session_id)
+        if await asyncio.to_thread(session.refresh_evaluation):
+            await save_session(session)
+        return session
+
+    @api.get("/sessions/{session_id}")
+    async def get_session(session_id: str):
+        async with lock_for(session_id):
+            session = await load_graded_session(session_id)
+            return session.to_dict()
+
+    @api.post("/sessions/{session_id}/messages")
+    async def post_message(session_id: str, message: MessageRequest, wait: bool = False):
+        """Handle a candidate message.
+
+        With wait=true the call also waits for the first question when the
+        message starts question generation; otherwise poll GET
+        /sessions/{session_id}/poll or use the WebSocket.
+        """
+        async with lock_for(session_id):
+            session = await load_session(session_id)
+            responses = await session.ahandle_input(message.content)
+            if wait:
+                responses += await session.await_questions()
+            await save_session(session)
+            return session_status(session, responses)
+
+    @api.get("/sessions/{session_id}/poll")
+    async def poll_session(session_id: str):
+        async with lock_for(session_id):
+            session = await load_session(session_id)
+            responses = await asyncio.to_thread(session.poll)
+            if responses:
+                await save_session(session)
+            return session_status(session, responses)
+
+    @api.get("/sessions/{session_id}/profile")
+    async def get_profile(session_id: str):
+        async with lock_for(session_id):
+            session = await load_graded_session(session_id)
+            return session.export_profile()
+
+    @api.delete("/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str):
+        async with lock_for(session_id):
+            if not await asyncio.to_thread(store.delete, session_id):
+                raise HTTPException(status_code=404, detail="Session not found")
+
+    @api.get("/metrics")
+    async def metrics():
+        """Timings, token counts and fallbacks in the Prometheus text format."""
+        return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    async def send_messages(websocket, session, responses):
+        for content in responses:
+            await websocket.send_json({"type": "message", "role": "assistant", "content": content, "stage": session.current_stage})
+
+    async def stream_questions(websocket, session):
+        """Send each question as it is generated, then the interview intro."""
+        job = session.question_job
+        async with aclosing(session.astream_questions()) as questions:
+            async for index, question in questions:
+                await websocket.send_json({
+                    "type": "question",
+                    "index": index,
+                    "total": job.question_count,
+                    "content": question
+                })
+                if index == 0:
+                    await send_messages(websocket, session, await asyncio.to_thread(session.poll))
+        # Covers a job that finished without producing any questions
+        await send_messages(websocket, session, await asyncio.to_thread(session.poll))
+        await websocket.send_json({"type": "questions_ready", "total": len(job.questions())})
+
+    @api.websocket("/sessions/{session_id}/ws")
+    async def session_socket(websocket: WebSocket, session_id: str):
+        """Run an interview over a WebSocket.
+
+        Use the id "new" to start a new session. The client sends plain text
+        or {"content": "..."} messages; the server replies with "session",
+        "message", "question" and "questions_ready" events.
+        """
+        await websocket.accept()
+        if session_id == "new":
+            session = new_session()
+            session_id = session.session_id
+            await save_session(session)
+        else:
+            session = await asyncio.to_thread(store.get, session_id)
+            if session is None:
+                await websocket.close(code=4404, reason="Session not found")
+                return
+
+        async def run_turn(content=None):
+            """Reload the session under its lock, handle a message (or start), and save it even if the client left."""
+            async with lock_for(session_id):
+                session = await asyncio.to_thread(store.get, session_id)
+                if session is None:
+                    await websocket.close(code=4404, reason="Session not found")
+                    return False
+                try:
+                    if content is None:
+                        responses = await asyncio.to_thread(session.start)
+                    else:
+                        responses = await session.ahandle_input(content)
+                    await send_messages(websocket, session, responses)
+                    if session.is_generating_questions():
+                        await stream_questions(websocket, session)
+                finally:
+                    await save_session(session)
+            return True
+
+        try:
+            await websocket.send_json({"type": "session", "session_id": session.session_id, "stage": session.current_stage})
+            if not await run_turn():
+                return
+
+            while True:
+                data = await websocket.receive_text()
+                if data.lstrip().startswith("{"):
+                    try:
+                        content = MessageRequest.model_validate_json(data).content
+                    except ValueError as e:
+                        await websocket.send_json({"type": "error", "detail": str(e)})
+                        continue
+                else:
+                    content = data
+
+                if not await run_turn(content):
+                    return
+        except WebSocketDisconnect:
+            pass
+
+    return api
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+    logging.basicConfig(level=Config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    uvicorn.run(app, host=Config.API_HOST, port=Config.API_PORT)
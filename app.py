@@ -1,17 +1,26 @@
 import streamlit as st
 import os
-import time
+import sys
 import json
+import logging
+import textwrap
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, List, Optional
-import re
-import pandas as pd
 
-from modules.conversation import ConversationManager
+# streamlit run app.py -- --profile-startup reports what the imports below cost
+if "--profile-startup" in sys.argv:
+    from utils.startup_profile import profile_startup
+    profile_startup()
+
+from modules.screening_session import ScreeningSession
 from modules.candidate_info import CandidateInfoCollector
 from modules.tech_questions import TechQuestionGenerator
+from utils.metrics import start_metrics_server
+from utils.session_store import create_session_store
 from config.config import Config
 
+logging.basicConfig(level=Config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
 st.set_page_config(
     page_title=f"{Config.APP_NAME}",
     page_icon="🎯",
@@ -19,420 +28,442 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Progress shown in the sidebar for each stage; the main progress bar also counts answered questions
+STAGE_PROGRESS = {
+    "greeting": 5, "collect_name": 15, "collect_email": 25,
+    "collect_phone": 35, "collect_experience": 45, "collect_position": 55,
+    "collect_location": 65, "collect_tech_stack": 75, "generate_questions": 85,
+    "interview_complete": 100
+}
+
+@lru_cache(maxsize=1)
+def read_css(path: str, mtime: float) -> str:
+    """Read the stylesheet as a <style> block; cached until the file's modification time changes"""
+    with open(path) as f:
+        return f"<style>{f.read()}</style>"
+
+def load_css(path: str = "static/style.css") -> str:
+    """Get the stylesheet, read from disk once per process rather than on every run"""
+    return read_css(path, os.path.getmtime(path))
+
 # Load CSS
-with open("static/style.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
+
+@st.cache_resource
+def get_shared_helpers():
+    """Stateless helpers shared by every browser session, so each session only holds its own state"""
+    return CandidateInfoCollector(), TechQuestionGenerator()
+
+@st.cache_resource
+def get_metrics_server():
+    """Prometheus /metrics server, started once per process if Config.METRICS_PORT is set; None otherwise"""
+    return start_metrics_server()
+
+@st.cache_resource
+def get_session_store():
+    """Shared session store, so any replica can resume an interview; None with the default in-process state"""
+    if Config.SESSION_STORE.lower() == "memory":
+        return None
+    collector, generator = get_shared_helpers()
+    return create_session_store(session_factory=lambda data: ScreeningSession.from_dict(
+        data, candidate_collector=collector, question_generator=generator
+    ))
 
 # Initialize session state
 def initialize_session_state():
-    defaults = {
-        'conversation_manager': ConversationManager(),
-        'candidate_collector': CandidateInfoCollector(),
-        'question_generator': TechQuestionGenerator(),
-        'messages': [],
-        'current_stage': "greeting",
-        'candidate_info': {},
-        'tech_stack': [],
-        'questions_generated': False,
-        'session_start_time': datetime.now(),
-        'current_questions': [],
-        'interview_complete': False,
-        'current_question_index': 0,
-        'answered_questions': 0,
-        'skipped_questions': 0,
-        'questions_intro_shown': False
-    }
-    
-    for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    if 'screening_session' not in st.session_state:
+        collector, generator = get_shared_helpers()
+        store = get_session_store()
+        session = None
+        session_id = st.query_params.get("session")
+        if store is not None and session_id:
+            # Resume an interview started on another replica or before a restart
+            session = store.get(session_id)
+        if session is None:
+            session = ScreeningSession(candidate_collector=collector, question_generator=generator)
+            if store is not None:
+                st.query_params["session"] = session.session_id
+        st.session_state.screening_session = session
+        st.session_state.saved_state = None
+
+def save_session():
+    """Save the session to the shared store when it has moved on since the last save"""
+    store = get_session_store()
+    if store is None:
+        return
+    session = get_session()
+    state = (session.current_stage, len(session.messages), session.current_question_index)
+    if st.session_state.get("saved_state") != state:
+        store.save(session)
+        st.session_state.saved_state = state
+
+def clear_session():
+    """Forget this browser's interview so the next run starts a new one"""
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.query_params.clear()
+
+def get_session() -> ScreeningSession:
+    """Get the screening session for this browser session"""
+    initialize_session_state()
+    return st.session_state.screening_session
 
 def get_progress_percentage():
-    stages = {
-        "greeting": 5, "collect_name": 15, "collect_email": 25,
-        "collect_phone": 35, "collect_experience": 45, "collect_position": 55,
-        "collect_location": 65, "collect_tech_stack": 75, "generate_questions": 85,
-        "interview_complete": 100
-    }
+    session = get_session()
     
     # If we're in the question stage, calculate progress based on questions answered
-    if st.session_state.current_stage == "generate_questions" and st.session_state.current_questions:
-        base_progress = stages["generate_questions"]
+    if session.current_stage == "generate_questions" and session.current_questions:
+        base_progress = STAGE_PROGRESS["generate_questions"]
         # Calculate progress based on questions completed (answered + skipped)
-        completed_questions = st.session_state.answered_questions + st.session_state.skipped_questions
-        question_progress = (completed_questions / len(st.session_state.current_questions)) * 10
+        completed_questions = session.answered_questions + session.skipped_questions
+        question_progress = (completed_questions / len(session.current_questions)) * 10
         return min(base_progress + question_progress, 95)
     
-    return stages.get(st.session_state.current_stage, 0)
+    return STAGE_PROGRESS.get(session.current_stage, 0)
 
 def get_status_info():
-    stage = st.session_state.current_stage
+    """Status badge for the current stage (per-question progress is shown next to the chat)"""
+    stage = get_session().current_stage
     if stage in ["greeting", "collect_name", "collect_email", "collect_phone", 
                 "collect_experience", "collect_position", "collect_location"]:
         return ("📝 Collecting Information", "status-collecting")
     elif stage == "collect_tech_stack":
         return ("💻 Tech Stack Analysis", "status-collecting")
     elif stage == "generate_questions":
-        if st.session_state.current_questions:
-            # Show the next question to be answered
-            current_q = st.session_state.current_question_index + 1
-            total_q = len(st.session_state.current_questions)
-            return (f"🎯 Question {current_q}/{total_q}", "status-ready")
-        return ("🎯 Interview Ready", "status-ready")
+        return ("🎯 Technical Interview", "status-ready")
     elif stage == "interview_complete":
         return ("✅ Complete", "status-complete")
     return ("", "")
 
+def get_page_state(session: ScreeningSession) -> tuple:
+    """Everything outside the chat fragments depends on: stage, candidate profile and tech stack"""
+    return (session.session_id, session.current_stage, tuple(session.candidate_info.items()), tuple(session.tech_stack))
+
+def rerun_if_page_changed():
+    """Rerun the whole page when a fragment rerun changed what the rest of the page shows.
+    
+    Fragments only redraw themselves, so answering a question redraws the chat alone;
+    a new stage or profile detail also needs the sidebar and layout redrawn.
+    """
+    if get_page_state(get_session()) != st.session_state.get("page_state"):
+        st.rerun()
+
 def add_message(role: str, content: str):
-    st.session_state.messages.append({
-        "role": role, 
-        "content": content,
-        "timestamp": datetime.now().strftime("%H:%M")
-    })
+    get_session().add_message(role, content)
+
+@lru_cache(maxsize=2048)
+def render_message(role: str, timestamp: str, display: str) -> str:
+    """Build the markdown block for one chat message (header, text and divider)"""
+    speaker = "🤖 TalentScout" if role == "assistant" else "👤 You"
+    return f"**{speaker}** ({timestamp})\n\n{textwrap.dedent(display).strip()}\n\n---"
+
+@lru_cache(maxsize=1024)
+def render_profile(candidate_info: tuple) -> str:
+    """Build the sidebar's candidate profile cards as one HTML block"""
+    return "".join(
+        f'<div style="background: rgba(255,255,255,0.1); padding: 0.5rem; border-radius: 0.5rem; margin: 0.25rem 0;">'
+        f'<strong>{key.title()}:</strong> {value}</div>'
+        for key, value in candidate_info if value  # Only show if value exists
+    )
+
+@lru_cache(maxsize=1024)
+def render_tech_stack(tech_stack: tuple) -> str:
+    """Build the sidebar's technology stack card"""
+    return (
+        f'<div style="background: rgba(255,255,255,0.1); padding: 0.75rem; border-radius: 0.5rem; margin: 0.25rem 0;">'
+        f'{", ".join(tech_stack)}</div>'
+    )
 
 def display_chat():
     """Display chat messages with better formatting"""
-    for message in st.session_state.messages:
-        if message["role"] == "assistant":
-            # Use markdown formatting instead of HTML
-            st.markdown(f"**🤖 TalentScout** ({message['timestamp']})")
-            # Debug: print the message content
-            print(f"DEBUG - Assistant message content: {repr(message['content'])}")
-            # Clean the content to ensure no HTML-like characters cause issues
-            clean_content = message['content'].replace('<', '&lt;').replace('>', '&gt;')
-            st.markdown(clean_content)
-            st.divider()
-        else:
-            # Use markdown formatting instead of HTML
-            st.markdown(f"**👤 You** ({message['timestamp']})")
-            # Clean the content to ensure no HTML-like characters cause issues
-            clean_content = message['content'].replace('<', '&lt;').replace('>', '&gt;')
-            st.markdown(clean_content)
-            st.divider()
+    messages = get_session().messages
+    
+    # Only the latest messages are rendered unless the candidate asks for the rest
+    hidden = 0
+    if not st.session_state.get('show_full_transcript'):
+        hidden = max(0, len(messages) - Config.CHAT_WINDOW_SIZE)
+    if hidden and st.button(f"⬆️ Show {hidden} earlier messages", key="show_full_transcript_button"):
+        st.session_state.show_full_transcript = True
+        hidden = 0
+    
+    for message in messages[hidden:]:
+        # Messages are sanitized once when they are added
+        st.markdown(render_message(message.role, message.timestamp, message.display))
 
 
 def handle_user_input(user_input: str):
     """Handle user input based on current stage"""
-    add_message("user", user_input)
-    stage = st.session_state.current_stage
-    manager = st.session_state.conversation_manager
-    collector = st.session_state.candidate_collector
-    
-    if manager.is_conversation_ending(user_input):
+    get_session().handle_input(user_input)
+    save_session()
 
-        exit_response = "👋 Interview session terminated. Starting fresh..."
-        
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
-        
+def submit_message():
+    """Chat form callback: handle the typed message before the chat is redrawn"""
+    user_input = st.session_state.get("user_input", "")
+    if user_input.strip():
+        handle_user_input(user_input)
 
-        initialize_session_state()
-        
-        add_message("assistant", exit_response)
-        
-        new_greeting = st.session_state.conversation_manager.get_greeting()
-        add_message("assistant", new_greeting)
-        
-        st.rerun()
-        
-        return 
-    
-    if stage == "greeting":
-        # First, ask for the name
-        st.session_state.current_stage = "collect_name"
-        response = manager.get_name_prompt()
-    
-    elif stage == "collect_name":
-        st.session_state.candidate_info["name"] = user_input.strip()
-        st.session_state.current_stage = "collect_email"
-        response = manager.get_email_prompt()
-    
-    elif stage == "collect_email":
-        if collector.validate_email(user_input):
-            st.session_state.candidate_info["email"] = user_input.strip()
-            st.session_state.current_stage = "collect_phone"
-            response = manager.get_phone_prompt()
-        else:
-            response = "⚠️ Please provide a valid email address (e.g., john@example.com)"
-    
-    elif stage == "collect_phone":
-        if collector.validate_phone(user_input):
-            st.session_state.candidate_info["phone"] = user_input.strip()
-            st.session_state.current_stage = "collect_experience"
-            response = manager.get_experience_prompt()
-        else:
-            response = "⚠️ Please provide a valid phone number (10-15 digits)"
-    
-    elif stage == "collect_experience":
-        st.session_state.candidate_info["experience"] = user_input.strip()
-        st.session_state.current_stage = "collect_position"
-        response = manager.get_position_prompt()
-    
-    elif stage == "collect_position":
-        st.session_state.candidate_info["position"] = user_input.strip()
-        st.session_state.current_stage = "collect_location"
-        response = manager.get_location_prompt()
-    
-    elif stage == "collect_location":
-        st.session_state.candidate_info["location"] = user_input.strip()
-        st.session_state.current_stage = "collect_tech_stack"
-        response = manager.get_tech_stack_prompt()
+def view_summary():
+    """Reopen the interview to show the candidate summary"""
+    get_session().current_stage = "generate_questions"
+    handle_user_input("summary")
+
+def poll_question_job():
+    """Show the questions once the background question job has produced them.
     
-    elif stage == "collect_tech_stack":
-        st.session_state.tech_stack = collector.parse_tech_stack(user_input)
-        st.session_state.current_stage = "generate_questions"
-        
-        # Generate combined questions based on experience
-        questions_list = st.session_state.question_generator.generate_combined_questions(
-            st.session_state.tech_stack, 
-            st.session_state.candidate_info.get("experience", "1")
-        )
-        st.session_state.current_questions = questions_list
-        
-        # Show questions introduction and first question
-        intro_response = manager.format_questions_intro(questions_list, st.session_state.candidate_info.get("experience", "1"))
-        first_question_response = manager.format_single_question(
-            questions_list[0],
-            0,
-            len(questions_list)
-        )
-        # Combine responses with proper formatting
-        response = f"{intro_response}\n\n{first_question_response}"
-        # Debug: print the response to see if there are any HTML tags
-        print(f"DEBUG - Response content: {repr(response)}")
-        st.session_state.questions_intro_shown = True
+    Returns:
+        bool: True if questions are still being generated
+    """
+    session = get_session()
+    if session.poll():
+        save_session()
+    return session.is_generating_questions()
+
+@st.fragment
+def stream_first_question():
+    """Stream the first question into the chat as soon as it is generated."""
+    session = get_session()
+    job = session.question_job
+    generator = session.question_generator
     
-    elif stage == "generate_questions":
-        user_lower = user_input.lower().strip()
-        
-        if user_lower in ["summary", "profile", "info"]:
-            profile_data = st.session_state.candidate_info.copy()
-            profile_data["tech_stack"] = ", ".join(st.session_state.tech_stack)
-            
-            summary_text = "\n".join([f"**{k.title()}:** {v}" for k, v in profile_data.items()])
-            duration = datetime.now() - st.session_state.session_start_time
-            duration_str = f"{int(duration.total_seconds() / 60)} minutes"
-            
-            response = f"""
-            📊 **Your Complete Profile:**
-            
-            {summary_text}
-            
-            **Generated Questions:** {len(st.session_state.current_questions)}
-            **Session Duration:** {duration_str}
-            
-            Would you like to download your profile or generate more questions?
-            """
-        
-        elif user_lower in ["next", "more", "continue"]:
-            response = "I can't generate more questions at this moment. You can provide your answers to the current questions or type 'done' to finish."
-        
-        elif user_lower == "skip":
-            # Handle skip request
-            if st.session_state.current_question_index < len(st.session_state.current_questions):
-                st.session_state.skipped_questions += 1
-                
-                if st.session_state.current_question_index + 1 >= len(st.session_state.current_questions):
-                    # All questions completed
-                    response = manager.format_question_completion(
-                        len(st.session_state.current_questions),
-                        st.session_state.answered_questions,
-                        st.session_state.skipped_questions
-                    )
-                    st.session_state.current_stage = "interview_complete"
-                else:
-                    # Move to next question
-                    st.session_state.current_question_index += 1
-                    next_question = st.session_state.current_questions[st.session_state.current_question_index]
-                    response = manager.format_single_question(
-                        next_question,
-                        st.session_state.current_question_index,
-                        len(st.session_state.current_questions)
-                    )
-            else:
-                response = "All questions have been completed!"
-        
-        elif user_lower == "done":
-            # Handle early completion
-            response = manager.format_question_completion(
-                len(st.session_state.current_questions),
-                st.session_state.answered_questions,
-                st.session_state.skipped_questions
-            )
-            st.session_state.current_stage = "interview_complete"
-        
-        else:
-            # Handle question answers
-            if not st.session_state.questions_intro_shown:
-                # Show first question if intro hasn't been shown
-                first_question = st.session_state.current_questions[0]
-                response = manager.format_single_question(
-                    first_question,
-                    0,
-                    len(st.session_state.current_questions)
-                )
-                st.session_state.questions_intro_shown = True
-            else:
-                # Process the answer and move to next question
-                if st.session_state.current_question_index < len(st.session_state.current_questions):
-                    st.session_state.answered_questions += 1
-                    
-                    if st.session_state.current_question_index + 1 >= len(st.session_state.current_questions):
-                        # All questions completed
-                        response = manager.format_question_completion(
-                            len(st.session_state.current_questions),
-                            st.session_state.answered_questions,
-                            st.session_state.skipped_questions
-                        )
-                        st.session_state.current_stage = "interview_complete"
-                    else:
-                        # Move to next question
-                        st.session_state.current_question_index += 1
-                        next_question = st.session_state.current_questions[st.session_state.current_question_index]
-                        response = manager.format_single_question(
-                            next_question,
-                            st.session_state.current_question_index,
-                            len(st.session_state.current_questions)
-                        )
-                else:
-                    # All questions completed
-                    response = manager.format_question_completion(
-                        len(st.session_state.current_questions),
-                        st.session_state.answered_questions,
-                        st.session_state.skipped_questions
-                    )
-                    st.session_state.current_stage = "interview_complete"
-            
-    else:
-        response = manager.get_end_conversation_message()
+    st.markdown(f"**🤖 TalentScout** ({datetime.now().strftime('%H:%M')})")
+    with st.spinner("Generating your technical questions..."):
+        st.write_stream(
+            generator.format_question_with_options(question, 0, job.question_count)
+            for question in job.iter_questions(limit=1)
+        )
     
-    add_message("assistant", response)
+    poll_question_job()
+    st.rerun()
 
 def export_profile():
     """Export candidate profile as JSON"""
-    profile = {
-        "candidate_info": st.session_state.candidate_info,
-        "tech_stack": st.session_state.tech_stack,
-        "questions": st.session_state.current_questions,
-        "session_date": datetime.now().isoformat(),
-        "duration": str(datetime.now() - st.session_state.session_start_time)
-    }
-    return json.dumps(profile, indent=2)
+    return json.dumps(get_session().export_profile(), indent=2)
 
-def main():
-    initialize_session_state()
+def profile_download_button(label: str):
+    """Offer the candidate profile as a JSON download"""
+    st.download_button(
+        label=label,
+        data=export_profile(),
+        file_name=f"candidate_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json",
+        use_container_width=True
+    )
+
+def render_sidebar(session: ScreeningSession):
+    """Draw the sidebar; everything in it only changes with the page state, so its markup is cached"""
+    # App Title with better styling
+    st.markdown(f"""
+    <div style="text-align: center; padding: 1rem 0;">
+        <h2 style="margin: 0; color: #667eea; font-weight: 700;">🎯 {Config.APP_NAME}</h2>
+    </div>
+    """, unsafe_allow_html=True)
     
-    # Enhanced Sidebar with better organization
-    with st.sidebar:
-        # App Title with better styling
-        st.markdown(f"""
-        <div style="text-align: center; padding: 1rem 0;">
-            <h2 style="margin: 0; color: #667eea; font-weight: 700;">🎯 {Config.APP_NAME}</h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
+    st.divider()
+    
+    # Progress Section with enhanced styling
+    st.markdown("**📊 Progress Overview**")
+    progress = STAGE_PROGRESS.get(session.current_stage, 0)
+    
+    # Enhanced progress display
+    col_prog1, col_prog2 = st.columns([3, 1])
+    with col_prog1:
+        st.progress(progress / 100)
+    with col_prog2:
+        st.markdown(f"**{progress}%**")
+    
+    st.markdown(f"<small>Stage: {session.current_stage.replace('_', ' ').title()}</small>", unsafe_allow_html=True)
+    
+    st.divider()
+    
+    # Status Section
+    status_text, status_class = get_status_info()
+    if status_text:
+        st.markdown("**🎯 Current Status**")
+        st.markdown(f'<div class="status-badge {status_class}">{status_text}</div>', 
+                   unsafe_allow_html=True)
         st.divider()
-        
-        # Progress Section with enhanced styling
-        st.markdown("**📊 Progress Overview**")
-        progress = get_progress_percentage()
-        
-        # Enhanced progress display
-        col_prog1, col_prog2 = st.columns([3, 1])
-        with col_prog1:
-            st.progress(progress / 100)
-        with col_prog2:
-            st.markdown(f"**{progress}%**")
-        
-        st.markdown(f"<small>Stage: {st.session_state.current_stage.replace('_', ' ').title()}</small>", unsafe_allow_html=True)
-        
+    
+    # Candidate Info Section with better organization
+    if session.candidate_info:
+        st.markdown("**👤 Candidate Profile**")
+        st.markdown(render_profile(tuple(session.candidate_info.items())), unsafe_allow_html=True)
         st.divider()
-        
-        # Status Section
-        status_text, status_class = get_status_info()
-        if status_text:
-            st.markdown("**🎯 Current Status**")
-            st.markdown(f'<div class="status-badge {status_class}">{status_text}</div>', 
-                       unsafe_allow_html=True)
-            st.divider()
-        
-        # Candidate Info Section with better organization
-        if st.session_state.candidate_info:
-            st.markdown("**👤 Candidate Profile**")
-            
-            # Create a nice info display
-            for key, value in st.session_state.candidate_info.items():
-                if value:  # Only show if value exists
-                    st.markdown(f"""
-                    <div style="background: rgba(255,255,255,0.1); padding: 0.5rem; border-radius: 0.5rem; margin: 0.25rem 0;">
-                        <strong>{key.title()}:</strong> {value}
-                    </div>
-                    """, unsafe_allow_html=True)
+    
+    # Tech Stack Section
+    if session.tech_stack:
+        st.markdown("**💻 Technology Stack**")
+        st.markdown(render_tech_stack(tuple(session.tech_stack)), unsafe_allow_html=True)
+        st.divider()
+    
+    sidebar_actions()
+    
+    st.divider()
+    
+    # Footer
+    st.markdown("""
+    <div style="text-align: center; padding: 1rem 0; color: rgba(255,255,255,0.6);">
+        <small>Powered by AI 🤖</small>
+    </div>
+    """, unsafe_allow_html=True)
+
+@st.fragment
+def sidebar_actions():
+    """Sidebar buttons; exporting only redraws this fragment"""
+    rerun_if_page_changed()
+    session = get_session()
+    
+    # Action Buttons Section
+    st.markdown("**⚡ Quick Actions**")
+    
+    # Exit functionality hint
+    st.info("💡 Type 'bye' or 'exit' anytime to restart")
+    
+    # Export functionality
+    if session.current_stage in ["generate_questions", "interview_complete"]:
+        if st.button("📥 Export Profile", use_container_width=True, type="primary"):
+            profile_download_button("💾 Download JSON")
+    
+    # Reset functionality
+    st.button("🔄 Start Over", use_container_width=True, on_click=clear_session)
+
+@st.fragment
+def chat_panel():
+    """Progress bar, conversation, input and interview controls.
+    
+    Sending a message reruns only this fragment. Input is handled in widget
+    callbacks, which run before the fragment is redrawn, so the reply shows
+    up without a second run; if the message moved the interview to a new
+    stage, rerun_if_page_changed redraws the whole page instead.
+    """
+    rerun_if_page_changed()
+    session = get_session()
+    
+    # Enhanced Progress Bar with better spacing
+    progress = get_progress_percentage()
+    st.markdown(f"""
+    <div class="progress-container">
+        <div class="progress-bar" style="width: {progress}%"></div>
+    </div>
+    """, unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Enhanced chat display with better spacing
+    st.markdown("**💬 Interview Conversation**")
+    
+    # Chat container with better styling
+    chat_container = st.container()
+    with chat_container:
+        # Add some padding around the chat
+        st.markdown("<div style='padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 1rem; margin: 1rem 0;'>", unsafe_allow_html=True)
+        question_pending = poll_question_job()
+        display_chat()
+        # Filled in at the end of the run so the rest of the page stays usable
+        question_stream_slot = st.container()
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Enhanced Input Section
+    if session.current_stage != "interview_complete":
+        st.markdown("**💭 Your Response**")
+        
+        # Add helpful hint about exit functionality
+        st.info("💡 **Tip:** You can type 'bye' or 'exit' at any time to start a new interview session.")
+        
+        # Use st.form for better input handling
+        with st.form("chat_form", clear_on_submit=True):
+            # Enhanced input field
+            st.text_input(
+                "Your response:", 
+                key="user_input",
+                placeholder="Type your message here...",
+                label_visibility="collapsed"
+            )
             
-            st.divider()
-        
-        # Tech Stack Section
-        if st.session_state.tech_stack:
-            st.markdown("**💻 Technology Stack**")
-            tech_display = ", ".join(st.session_state.tech_stack)
-            st.markdown(f"""
-            <div style="background: rgba(255,255,255,0.1); padding: 0.75rem; border-radius: 0.5rem; margin: 0.25rem 0;">
-                {tech_display}
-            </div>
-            """, unsafe_allow_html=True)
-            st.divider()
-        
-        # Interview Progress Section
-        if st.session_state.current_stage == "generate_questions" and st.session_state.current_questions:
+            # Better button layout
+            col_input1, col_input2, col_input3 = st.columns([6, 1, 1])
+            with col_input2:
+                st.form_submit_button("Send 📤", use_container_width=True, type="primary", on_click=submit_message)
+            with col_input3:
+                st.form_submit_button("⏭️ Skip", use_container_width=True, on_click=handle_user_input, args=("skip",))
+    
+    # Enhanced Quick Actions Section
+    if session.current_stage == "generate_questions":
+        if session.current_questions:
+            st.markdown("<br>", unsafe_allow_html=True)
             st.markdown("**🎯 Interview Progress**")
             
-            current_q = st.session_state.current_question_index + 1
-            total_q = len(st.session_state.current_questions)
-            completed_q = st.session_state.answered_questions + st.session_state.skipped_questions
+            current_q = session.current_question_index + 1
+            total_q = len(session.current_questions)
+            completed_q = session.answered_questions + session.skipped_questions
             
             # Progress metrics
-            col_met1, col_met2 = st.columns(2)
-            with col_met1:
-                st.metric("Current", f"Q{current_q}")
-                st.metric("Completed", f"{completed_q}/{total_q}")
-            with col_met2:
-                st.metric("Answered", st.session_state.answered_questions)
-                st.metric("Skipped", st.session_state.skipped_questions)
-            
-            st.divider()
+            col_met1, col_met2, col_met3, col_met4 = st.columns(4)
+            col_met1.metric("Current", f"Q{min(current_q, total_q)}/{total_q}")
+            col_met2.metric("Completed", f"{completed_q}/{total_q}")
+            col_met3.metric("Answered", session.answered_questions)
+            col_met4.metric("Skipped", session.skipped_questions)
         
-        # Action Buttons Section
+        st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("**⚡ Quick Actions**")
         
-        # Exit functionality hint
-        st.info("💡 Type 'bye' or 'exit' anytime to restart")
+        # Better button grid layout
+        col_q1, col_q2, col_q3, col_q4 = st.columns(4)
         
-        # Export functionality
-        if st.session_state.current_stage in ["generate_questions", "interview_complete"]:
-            if st.button("📥 Export Profile", use_container_width=True, type="primary"):
-                profile_data = export_profile()
-                st.download_button(
-                    label="💾 Download JSON",
-                    data=profile_data,
-                    file_name=f"candidate_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json",
-                    use_container_width=True
-                )
+        with col_q1:
+            st.button("📋 Summary", use_container_width=True, type="secondary", on_click=handle_user_input, args=("summary",))
         
-        # Reset functionality
-        if st.button("🔄 Start Over", use_container_width=True):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+        with col_q2:
+            st.button("⏭️ Skip", use_container_width=True, type="secondary", on_click=handle_user_input, args=("skip",))
         
-        st.divider()
+        with col_q3:
+            st.button("✅ Done", use_container_width=True, type="primary", on_click=handle_user_input, args=("done",))
         
-        # Footer
-        st.markdown("""
-        <div style="text-align: center; padding: 1rem 0; color: rgba(255,255,255,0.6);">
-            <small>Powered by AI 🤖</small>
-        </div>
-        """, unsafe_allow_html=True)
+        with col_q4:
+            st.button("🔄 Reset", use_container_width=True, type="secondary", on_click=clear_session)
+    
+    if question_pending:
+        with question_stream_slot:
+            stream_first_question()
+
+@st.fragment
+def final_actions():
+    """Completion message and final actions; exporting only redraws this fragment"""
+    rerun_if_page_changed()
+    
+    # Enhanced completion message
+    st.markdown("""
+    <div style="text-align: center; padding: 2rem; background: rgba(16, 185, 129, 0.1); border-radius: 1rem; margin: 2rem 0;">
+        <h2 style="color: #059669;">🎉 Interview Session Completed!</h2>
+        <p style="color: #065f46;">Great job! You've successfully completed the interview process.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Final actions with better layout
+    st.markdown("**📋 Final Actions**")
+    col_final1, col_final2, col_final3 = st.columns([1, 1, 1])
+    
+    with col_final1:
+        st.button("📊 View Summary", use_container_width=True, type="secondary", on_click=view_summary)
+    
+    with col_final2:
+        st.button("🔄 New Session", use_container_width=True, type="primary", on_click=clear_session)
+    
+    with col_final3:
+        if st.button("📥 Export Profile", use_container_width=True, type="secondary"):
+            profile_download_button("💾 Download")
+
+def main():
+    get_metrics_server()
+    session = get_session()
+    if session.start():
+        save_session()
+    # What this full run draws; fragments rerun the page once it changes
+    st.session_state.page_state = get_page_state(session)
+    
+    # Enhanced Sidebar with better organization
+    with st.sidebar:
+        render_sidebar(session)
     
     # Main Content Area with improved layout
     # Use a centered layout with proper spacing
@@ -442,132 +473,15 @@ def main():
         # Enhanced Header Section
         st.markdown(f'<h1 class="main-header">{Config.APP_NAME}</h1>', unsafe_allow_html=True)
         st.markdown('<p class="sub-header">🚀 AI-powered recruitment made simple and effective</p>', unsafe_allow_html=True)
-        
-        # Enhanced Progress Bar with better spacing
-        st.markdown("<br>", unsafe_allow_html=True)
-        progress = get_progress_percentage()
-        st.markdown(f"""
-        <div class="progress-container">
-            <div class="progress-bar" style="width: {progress}%"></div>
-        </div>
-        """, unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         
-        # Chat Interface with enhanced container
-        if not st.session_state.messages:
-            greeting = st.session_state.conversation_manager.get_greeting()
-            add_message("assistant", greeting)
-        
-        # Enhanced chat display with better spacing
-        st.markdown("**💬 Interview Conversation**")
-        
-        # Chat container with better styling
-        chat_container = st.container()
-        with chat_container:
-            # Add some padding around the chat
-            st.markdown("<div style='padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 1rem; margin: 1rem 0;'>", unsafe_allow_html=True)
-            display_chat()
-            st.markdown("</div>", unsafe_allow_html=True)
+        chat_panel()
         
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Enhanced Input Section
-        if st.session_state.current_stage != "interview_complete":
-            st.markdown("**💭 Your Response**")
-            
-            # Add helpful hint about exit functionality
-            st.info("💡 **Tip:** You can type 'bye' or 'exit' at any time to start a new interview session.")
-            
-            # Use st.form for better input handling
-            with st.form("chat_form", clear_on_submit=True):
-                # Enhanced input field
-                user_input = st.text_input(
-                    "Your response:", 
-                    key="user_input",
-                    placeholder="Type your message here...",
-                    label_visibility="collapsed"
-                )
-                
-                # Better button layout
-                col_input1, col_input2, col_input3 = st.columns([6, 1, 1])
-                with col_input2:
-                    submitted = st.form_submit_button("Send 📤", use_container_width=True, type="primary")
-                with col_input3:
-                    if st.form_submit_button("⏭️ Skip", use_container_width=True):
-                        handle_user_input("skip")
-                        st.rerun()
-                
-                # Handle input if form is submitted
-                if submitted and user_input.strip():
-                    handle_user_input(user_input)
-                    st.rerun()
-        else:
-            # Enhanced completion message
-            st.markdown("""
-            <div style="text-align: center; padding: 2rem; background: rgba(16, 185, 129, 0.1); border-radius: 1rem; margin: 2rem 0;">
-                <h2 style="color: #059669;">🎉 Interview Session Completed!</h2>
-                <p style="color: #065f46;">Great job! You've successfully completed the interview process.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Final actions with better layout
-            st.markdown("**📋 Final Actions**")
-            col_final1, col_final2, col_final3 = st.columns([1, 1, 1])
-            
-            with col_final1:
-                if st.button("📊 View Summary", use_container_width=True, type="secondary"):
-                    st.session_state.current_stage = "generate_questions"
-                    handle_user_input("summary")
-                    st.rerun()
-            
-            with col_final2:
-                if st.button("🔄 New Session", use_container_width=True, type="primary"):
-                    for key in list(st.session_state.keys()):
-                        del st.session_state[key]
-                    st.rerun()
-            
-            with col_final3:
-                if st.button("📥 Export Profile", use_container_width=True, type="secondary"):
-                    profile_data = export_profile()
-                    st.download_button(
-                        label="💾 Download",
-                        data=profile_data,
-                        file_name=f"candidate_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json",
-                        use_container_width=True
-                    )
-        
-        # Enhanced Quick Actions Section
-        if st.session_state.current_stage == "generate_questions":
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("**⚡ Quick Actions**")
-            
-            # Better button grid layout
-            col_q1, col_q2, col_q3, col_q4 = st.columns(4)
-            
-            with col_q1:
-                if st.button("📋 Summary", use_container_width=True, type="secondary"):
-                    handle_user_input("summary")
-                    st.rerun()
-            
-            with col_q2:
-                if st.button("⏭️ Skip", use_container_width=True, type="secondary"):
-                    handle_user_input("skip")
-                    st.rerun()
-            
-            with col_q3:
-                if st.button("✅ Done", use_container_width=True, type="primary"):
-                    handle_user_input("done")
-                    st.rerun()
-            
-            with col_q4:
-                if st.button("🔄 Reset", use_container_width=True, type="secondary"):
-                    for key in list(st.session_state.keys()):
-                        del st.session_state[key]
-                    st.rerun()
+        if session.current_stage == "interview_complete":
+            final_actions()
         
         # Add some bottom spacing
         st.markdown("<br><br>", unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,267 @@
+"""End-to-end benchmark for the screening pipeline.
+
+Drives the headless interview state machine (ScreeningSession) for N
+synthetic candidates, against a local OpenAI-compatible stub with
+configurable latency, and reports throughput, p50/p95/p99 latency per stage
+and peak RSS.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pipeline --candidates 200 --latency 0.5 --concurrency 16
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TECH_STACKS = [
+    "Python, Django, PostgreSQL",
+    "Python; Django and PostgreSQL, Docker",
+    "JavaScript, React, Node.js",
+    "React, TypeScript, Express, MongoDB",
+    "Java, Spring Boot, MySQL, Kubernetes",
+    "Python, Flask, AWS, Docker",
+    "Go, Kubernetes, AWS",
+    "Python, Machine Learning, Data Science",
+    "Vue.js, Node.js, MongoDB",
+    "Angular, Java, SQL"
+]
+
+def percentile(samples, pct):
+    """Get a percentile of a list of samples using nearest-rank.
+
+    Args:
+        samples (list): The samples
+        pct (float): The percentile, between 0 and 100
+
+    Returns:
+        float: The percentile value, or 0.0 for no samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def peak_rss_mb():
+    """Get the peak resident set size of this process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class StageTimer:
+    """Collects wall-clock durations per named stage."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def time(self, stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def report(self, elapsed=None):
+        """Summarize the collected samples.
+
+        Args:
+            elapsed (dict, optional): Wall-clock seconds per stage, used for throughput
+
+        Returns:
+            dict: Per-stage count, throughput and latency percentiles in milliseconds
+        """
+        elapsed = elapsed or {}
+        summary = {}
+        for stage, samples in self.samples.items():
+            total = elapsed.get(stage, sum(samples))
+            summary[stage] = {
+                "count": len(samples),
+                "throughput_per_s": len(samples) / total if total else 0.0,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000
+            }
+        return summary
+
+def synthetic_candidates(count, seed):
+    """Generate deterministic synthetic candidates.
+
+    Args:
+        count (int): Number of candidates
+        seed (int): Random seed
+
+    Returns:
+        list: Candidate dictionaries with the inputs for each interview stage
+    """
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        candidates.append({
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "phone": f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            "experience": f"{rng.randint(0, 12)} years",
+            "position": rng.choice(["Backend Engineer", "Frontend Engineer", "Data Scientist", "DevOps Engineer"]),
+            "location": rng.choice(["Berlin, Germany", "Austin, USA", "Pune, India"]),
+            "tech_stack": rng.choice(TECH_STACKS)
+        })
+    return candidates
+
+def run_interview(candidate, timer, answer_words):
+    """Run one candidate through the whole interview.
+
+    Args:
+        candidate (dict): Synthetic candidate inputs
+        timer (StageTimer): Collects stage durations
+        answer_words (int): Words per synthetic answer
+
+    Returns:
+        tuple: (candidate info, tech stack, conversation history, session id)
+    """
+    from modules.screening_session import ScreeningSession
+
+    session = ScreeningSession()
+    session.start()
+
+    inputs = ["Hi!", candidate["name"], candidate["email"], candidate["phone"], candidate["experience"],
+              candidate["position"], candidate["location"], candidate["tech_stack"]]
+    for text in inputs:
+        timer.time(f"handle_input:{session.current_stage}", session.handle_input, text)
+
+    # Time until the first question is ready to be shown
+    timer.time("time_to_first_question", session.wait_for_questions)
+
+    manager = session.conversation_manager
+    answer = " ".join(["detail"] * answer_words)
+    while session.current_stage == "generate_questions":
+        timer.time(
+            "create_follow_up_prompt",
+            manager.create_follow_up_prompt,
+            answer,
+            session.candidate_info,
+            session.tech_stack
+        )
+        timer.time("handle_input:generate_questions", session.handle_input, answer)
+
+    return session.candidate_info, session.tech_stack, manager.conversation_history, session.session_id
+
+def run_benchmark(args):
+    """Run every benchmark stage and return the report.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+
+    Returns:
+        dict: The benchmark report
+    """
+    data_dir = tempfile.mkdtemp(prefix="talentscout-bench-")
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        from benchmarks.stub_llm_server import start_stub_server
+        server, base_url = start_stub_server(args.latency, args.jitter)
+
+    # Configuration is read at import time, so set it before importing any modules
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["DATA_DIR"] = data_dir
+    # Candidates are saved directly below so the save is timed
+    os.environ["JOBS_ENABLED"] = "false"
+    if args.no_cache:
+        os.environ["QUESTION_CACHE_VARIANTS"] = str(args.candidates + 1)
+
+    os.chdir(REPO_ROOT)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    from modules.candidate_info import CandidateInfoCollector
+    from modules.tech_questions import TechQuestionGenerator
+    from utils.data_handler import DataHandler
+
+    candidates = synthetic_candidates(args.candidates, args.seed)
+    timer = StageTimer()
+    elapsed = {}
+
+    # Tech stack parsing
+    collector = CandidateInfoCollector()
+    start = time.perf_counter()
+    for _ in range(args.parse_rounds):
+        for candidate in candidates:
+            timer.time("parse_tech_stack", collector.parse_tech_stack, candidate["tech_stack"])
+    elapsed["parse_tech_stack"] = time.perf_counter() - start
+
+    # Question generation under concurrent load
+    generator = TechQuestionGenerator()
+    def generate(candidate):
+        stack = collector.parse_tech_stack(candidate["tech_stack"])
+        return timer.time("generate_combined_questions", generator.generate_combined_questions, stack, candidate["experience"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(generate, candidates))
+    elapsed["generate_combined_questions"] = time.perf_counter() - start
+
+    # Full interviews through the state machine, then persistence
+    handler = DataHandler(data_dir)
+    start = time.perf_counter()
+    for candidate in candidates:
+        info, stack, history, session_id = timer.time("interview_total", run_interview, candidate, timer, args.answer_words)
+        timer.time("save_candidate_data", handler.save_candidate_data, info, stack, history, session_id)
+    elapsed["interview_total"] = time.perf_counter() - start
+
+    timer.time("export_to_csv", handler.export_to_csv, os.path.join(data_dir, "candidates.csv"))
+
+    if server:
+        server.shutdown()
+
+    return {
+        "candidates": args.candidates,
+        "latency_s": args.latency,
+        "concurrency": args.concurrency,
+        "peak_rss_mb": peak_rss_mb(),
+        "data_dir": data_dir,
+        "stages": timer.report(elapsed)
+    }
+
+def print_report(report):
+    """Print the benchmark report as a table."""
+    print(f"Candidates: {report['candidates']}  stub latency: {report['latency_s']}s  "
+          f"concurrency: {report['concurrency']}  peak RSS: {report['peak_rss_mb']:.1f} MB")
+    print(f"{'stage':<42}{'count':>8}{'ops/s':>12}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for stage, stats in sorted(report["stages"].items()):
+        print(f"{stage:<42}{stats['count']:>8}{stats['throughput_per_s']:>12.1f}"
+              f"{stats['p50_ms']:>11.2f}{stats['p95_ms']:>11.2f}{stats['p99_ms']:>11.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TalentScout screening pipeline.")
+    parser.add_argument("--candidates", type=int, default=50, help="Number of synthetic candidates")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub LLM mean latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Stub LLM latency jitter in seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent question generations")
+    parser.add_argument("--answer-words", type=int, default=60, help="Words per synthetic answer")
+    parser.add_argument("--parse-rounds", type=int, default=20, help="Repetitions of the parse benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for synthetic candidates")
+    parser.add_argument("--no-cache", action="store_true", help="Keep the question cache from serving hits")
+    parser.add_argument("--base-url", help="Use an already running OpenAI-compatible endpoint")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
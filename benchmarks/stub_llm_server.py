@@ -0,0 +1,239 @@
+"""Deterministic OpenAI-compatible stub server for benchmarks.
+
+Serves POST /v1/chat/completions (plain and streaming) with canned interview
+questions and a configurable, seeded latency, so benchmarks exercise the real
+client stack without calling OpenAI.
+
+It can also answer an OpenAI Batch API input file offline, producing the
+matching output file.
+
+Usage:
+    python -m benchmarks.stub_llm_server --port 8765 --latency 0.8 --jitter 0.2
+    python -m benchmarks.stub_llm_server --process-batch batch_input.jsonl batch_output.jsonl
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_QUESTION_COUNT_PATTERN = re.compile(r"Generate (\d+) technical interview questions")
+_TECHNOLOGIES_PATTERN = re.compile(r"cover the following technologies: (.+?)\.\s*\n")
+_ANSWER_ID_PATTERN = re.compile(r'"id": "([^"]+)"')
+
+# Distinct topics, so generated questions are not near-duplicates of each other
+_QUESTION_TOPICS = [
+    "How would you design a production service using {technologies}, and what trade-offs would you weigh at scale?",
+    "Walk through how you would debug an intermittent memory leak in a {technologies} application.",
+    "What testing strategy would you set up for a codebase built on {technologies}?",
+    "How do you secure authentication and secrets handling when deploying {technologies}?",
+    "Which metrics and logs would you monitor for {technologies} in production, and why?",
+    "Explain how you would migrate a legacy system onto {technologies} with zero downtime."
+]
+
+def _prompt_text(body):
+    return "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+
+def build_reply(prompt):
+    """Build a deterministic reply for a prompt.
+
+    Question-generation prompts get a JSON array of questions, grading
+    prompts get a JSON object with a grade per answer id, and anything else
+    gets a short acknowledgement.
+
+    Args:
+        prompt (str): The prompt text
+
+    Returns:
+        str: The reply content
+    """
+    if '{"grades":' in prompt:
+        grades = [
+            {"id": answer_id, "score": int(hashlib.sha256(answer_id.encode()).hexdigest(), 16) % 11, "feedback": "Stub grade."}
+            for answer_id in _ANSWER_ID_PATTERN.findall(prompt)
+        ]
+        return json.dumps({"grades": grades})
+
+    count_match = _QUESTION_COUNT_PATTERN.search(prompt)
+    if not count_match:
+        return "Thanks for the detailed answer. Could you expand on the trade-offs you considered?"
+
+    tech_match = _TECHNOLOGIES_PATTERN.search(prompt)
+    technologies = tech_match.group(1) if tech_match else "your stack"
+    questions = [
+        _QUESTION_TOPICS[i % len(_QUESTION_TOPICS)].format(technologies=technologies)
+        for i in range(int(count_match.group(1)))
+    ]
+    return json.dumps(questions)
+
+def build_completion(body):
+    """Build a chat completion response for a request body.
+
+    Args:
+        body (dict): The chat completions request body
+
+    Returns:
+        dict: The chat completion response
+    """
+    prompt = _prompt_text(body)
+    reply = build_reply(prompt)
+    # JSON mode only ever returns an object, so arrays come back wrapped in one
+    if (body.get("response_format") or {}).get("type") == "json_object" and reply.startswith("["):
+        reply = json.dumps({"questions": json.loads(reply)})
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub-model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": reply},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(reply) // 4,
+            "total_tokens": (len(prompt) + len(reply)) // 4
+        }
+    }
+
+def process_batch(input_path, output_path):
+    """Answer a Batch API input file the way the Batch API would.
+
+    Args:
+        input_path (str): Batch input JSONL path
+        output_path (str): Where to write the batch output JSONL
+
+    Returns:
+        int: Number of requests answered
+    """
+    count = 0
+    with open(input_path, "r") as source, open(output_path, "w") as output:
+        for line in source:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            count += 1
+            result = {
+                "id": f"batch_req_{count}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": f"req_{count}",
+                    "body": build_completion(request["body"])
+                },
+                "error": None
+            }
+            output.write(json.dumps(result) + "\n")
+    return count
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the chat completions endpoint."""
+
+    latency = 0.0
+    jitter = 0.0
+    chunk_size = 16
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self, prompt):
+        # Seeded by the prompt so repeated runs see the same latencies
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        jitter = random.Random(seed).uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + jitter)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = _prompt_text(body)
+        reply = build_reply(prompt)
+        delay = self._delay(prompt)
+        model = body.get("model", "stub-model")
+
+        if body.get("stream"):
+            self._stream(reply, delay, model)
+            return
+
+        time.sleep(delay)
+        data = json.dumps(build_completion(body)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, reply, delay, model):
+        chunks = [reply[i:i + self.chunk_size] for i in range(0, len(reply), self.chunk_size)]
+        # Spend a fifth of the latency before the first token and spread the rest
+        time.sleep(delay * 0.2)
+        per_chunk = delay * 0.8 / max(1, len(chunks))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for chunk in chunks:
+            event = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(per_chunk)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+class _StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under benchmark load
+    request_queue_size = 256
+
+def start_stub_server(latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+    """Start the stub server on a background thread.
+
+    Args:
+        latency (float): Mean response latency in seconds
+        jitter (float): Maximum deviation from the mean latency in seconds
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for any free port
+
+    Returns:
+        tuple: (server, base_url) where base_url is suitable for OPENAI_BASE_URL
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"latency": latency, "jitter": jitter})
+    server = _StubServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a deterministic OpenAI-compatible stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum latency deviation in seconds")
+    parser.add_argument("--process-batch", nargs=2, metavar=("INPUT", "OUTPUT"), help="Answer a Batch API input file and exit")
+    args = parser.parse_args()
+
+    if args.process_batch:
+        count = process_batch(*args.process_batch)
+        print(f"Answered {count} batch requests")
+        return
+
+    server, base_url = start_stub_server(args.latency, args.jitter, args.host, args.port)
+    print(f"Stub LLM server listening; set OPENAI_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""In-memory stand-in for a Redis server.
+
+Speaks enough of the Redis protocol (RESP2) for RedisSessionStore: strings,
+hashes, key expiry and a few connection commands, so the store can be run
+and benchmarked without a real Redis.
+
+Usage:
+    python -m benchmarks.stub_redis_server --port 6390
+    SESSION_STORE=redis REDIS_URL=redis://127.0.0.1:6390/0 streamlit run app.py
+"""
+import time
+import socket
+import argparse
+import threading
+import socketserver
+
+class StubRedis:
+    """Thread-safe key space with expiry."""
+
+    def __init__(self):
+        self._data = {}  # key -> (value, expires_at or None); hashes are dicts
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _hash(self, key):
+        value = self._get(key)
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def execute(self, args):
+        """Run one command.
+
+        Args:
+            args (list): The command name and arguments, as bytes
+
+        Returns:
+            The reply: str for a status, int, bytes, None, a list, or an Exception for an error
+        """
+        command = args[0].decode().upper()
+        args = args[1:]
+        with self._lock:
+            try:
+                handler = getattr(self, f"_cmd_{command.lower()}", None)
+                if handler is None:
+                    return ValueError(f"ERR unknown command '{command}'")
+                return handler(*args)
+            except TypeError as e:
+                message = str(e)
+                return ValueError(message if message.startswith("WRONGTYPE") else f"ERR wrong number of arguments for '{command}'")
+
+    def _cmd_ping(self, message=None):
+        return message if message is not None else "PONG"
+
+    def _cmd_auth(self, *credentials):
+        return "OK"
+
+    def _cmd_select(self, db):
+        return "OK"
+
+    def _cmd_flushdb(self):
+        self._data.clear()
+        return "OK"
+
+    def _cmd_get(self, key):
+        value = self._get(key)
+        if isinstance(value, dict):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _cmd_set(self, key, value, *options):
+        expires_at = None
+        if len(options) >= 2 and options[0].upper() == b"EX":
+            expires_at = time.monotonic() + int(options[1])
+        self._data[key] = (value, expires_at)
+        return "OK"
+
+    def _cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._get(key) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    def _cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._get(key) is not None)
+
+    def _cmd_expire(self, key, seconds):
+        value = self._get(key)
+        if value is None:
+            return 0
+        self._data[key] = (value, time.monotonic() + int(seconds))
+        return 1
+
+    def _cmd_ttl(self, key):
+        if self._get(key) is None:
+            return -2
+        expires_at = self._data[key][1]
+        return -1 if expires_at is None else int(expires_at - time.monotonic())
+
+    def _cmd_hset(self, key, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise TypeError()
+        value = self._hash(key)
+        expires_at = self._data[key][1] if key in self._data else None
+        added = sum(1 for field in pairs[::2] if field not in value)
+        value.update(zip(pairs[::2], pairs[1::2]))
+        self._data[key] = (value, expires_at)
+        return added
+
+    def _cmd_hget(self, key, field):
+        return self._hash(key).get(field)
+
+    def _cmd_hmget(self, key, *fields):
+        value = self._hash(key)
+        return [value.get(field) for field in fields]
+
+    def _cmd_hdel(self, key, *fields):
+        value = self._hash(key)
+        return sum(1 for field in fields if value.pop(field, None) is not None)
+
+def _encode(reply):
+    if isinstance(reply, Exception):
+        return f"-{reply}\r\n".encode()
+    if isinstance(reply, str):
+        return f"+{reply}\r\n".encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+class StubRedisHandler(socketserver.StreamRequestHandler):
+    """Reads RESP command arrays and writes the replies."""
+
+    def setup(self):
+        super().setup()
+        # Pipelined replies are written one by one; don't let Nagle hold them back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, as typed into telnet
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        while True:
+            try:
+                args = self._read_command()
+            except (OSError, ValueError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            self.wfile.write(_encode(self.server.redis.execute(args)))
+            self.wfile.flush()
+
+class _StubRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+def start_stub_redis(host="127.0.0.1", port=0):
+    """Start the stand-in on a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for any free port
+
+    Returns:
+        tuple: (server, url) where url is suitable for REDIS_URL
+    """
+    server = _StubRedisServer((host, port), StubRedisHandler)
+    server.redis = StubRedis()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://{host}:{server.server_address[1]}/0"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an in-memory stand-in for a Redis server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server, url = start_stub_redis(args.host, args.port)
+    print(f"Stub Redis server listening; set REDIS_URL={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
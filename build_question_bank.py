@@ -0,0 +1,285 @@
+"""Pre-generate interview question sets into the question bank.
+
+Generates question sets for common tech stacks and experience bands ahead of
+time, so live screenings are served from the bank without waiting for the
+LLM. Stacks are read from a text file with one comma-separated stack per line
+(lines starting with # are ignored).
+
+Usage (from the repository root):
+    # Call the LLM directly with bounded concurrency
+    python build_question_bank.py --stacks stacks.txt --concurrency 8
+
+    # Or go through the OpenAI Batch API: write the requests, run the batch,
+    # then import its output file
+    python build_question_bank.py --stacks stacks.txt --write-batch batch_input.jsonl
+    python build_question_bank.py --read-batch batch_output.jsonl
+
+Set OPENAI_BASE_URL to run against a local stub such as
+benchmarks/stub_llm_server.py.
+"""
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules.candidate_info import CandidateInfoCollector
+from modules.tech_questions import TechQuestionGenerator
+from utils.question_bank import QuestionBank, EXPERIENCE_BANDS
+from utils.llm_utils import get_llm_response, build_request_params, parse_json_content, extract_json_array
+from config.config import Config
+
+# Save the bank after this many new sets so an interrupted run keeps its progress
+SAVE_EVERY = 50
+
+def read_stacks(path):
+    """Read tech stacks from a file, one comma-separated stack per line.
+
+    Args:
+        path (str): Path of the stacks file
+
+    Returns:
+        list: Parsed tech stacks, without duplicates
+    """
+    collector = CandidateInfoCollector()
+    stacks = []
+    seen = set()
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            stack = collector.parse_tech_stack(line)
+            key = tuple(sorted(stack))
+            if stack and key not in seen:
+                seen.add(key)
+                stacks.append(stack)
+    return stacks
+
+def extract_questions(response, question_count):
+    """Get the question list from an LLM response.
+
+    Accepts a JSON array, or an object wrapping one (as JSON mode returns).
+
+    Args:
+        response (list or dict or str): The parsed LLM response
+        question_count (int): Number of questions required
+
+    Returns:
+        list or None: Exactly question_count questions, or None if there are too few
+    """
+    response = extract_json_array(response)
+    if response is None:
+        return None
+
+    questions = []
+    for question in response:
+        if isinstance(question, str) and question.strip() and question.strip() not in questions:
+            questions.append(question.strip())
+    return questions[:question_count] if len(questions) >= question_count else None
+
+class BankBuilder:
+    """Plans and runs the generation of missing question sets."""
+
+    def __init__(self, bank, generator=None, variants=None):
+        """Initialize the builder.
+
+        Args:
+            bank (QuestionBank): The bank to fill
+            generator (TechQuestionGenerator, optional): Used for prompts and keys
+            variants (int, optional): Question sets wanted per entry. Defaults to Config.QUESTION_CACHE_VARIANTS.
+        """
+        self.bank = bank
+        self.generator = generator if generator else TechQuestionGenerator(question_bank=bank)
+        self.variants = variants if variants else Config.QUESTION_CACHE_VARIANTS
+
+    def plan(self, stacks, bands):
+        """List the generation tasks still needed to fill the bank.
+
+        Args:
+            stacks (list): Tech stacks
+            bands (list): Experience band names
+
+        Returns:
+            list: One task dictionary per missing question set
+        """
+        tasks = []
+        planned = set()
+        for stack in stacks:
+            for band in bands:
+                years = str(EXPERIENCE_BANDS[band])
+                question_count = self.generator.determine_question_count(years)
+                key = self.generator.get_bank_key(stack, years, question_count)
+                # Stacks that only differ in spelling share one entry
+                if key in planned:
+                    continue
+                planned.add(key)
+                for variant in range(self.bank.count(key), self.variants):
+                    tasks.append({
+                        "key": key,
+                        "stack": stack,
+                        "band": band,
+                        "years": years,
+                        "question_count": question_count,
+                        "variant": variant
+                    })
+        return tasks
+
+    def prompt_for(self, task):
+        return self.generator.build_combined_prompt(task["stack"], task["years"], task["question_count"])
+
+    def store(self, task, response):
+        """Validate a response and add it to the bank.
+
+        Returns:
+            bool: True if a new set was added
+        """
+        questions = extract_questions(response, task["question_count"])
+        if not questions:
+            return False
+        return self.bank.add(
+            task["key"],
+            questions,
+            self.generator.normalize_stack(task["stack"]),
+            task["band"],
+            task["question_count"]
+        )
+
+    def run_live(self, tasks, concurrency):
+        """Generate the sets by calling the LLM with bounded concurrency.
+
+        Args:
+            tasks (list): Tasks from plan()
+            concurrency (int): Maximum requests in flight
+
+        Returns:
+            tuple: (added, failed) set counts
+        """
+        added = failed = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {
+                pool.submit(get_llm_response, self.prompt_for(task), response_format="json"): task
+                for task in tasks
+            }
+            for future in as_completed(futures):
+                try:
+                    stored = self.store(futures[future], future.result())
+                except Exception as e:
+                    print(f"Error generating question set: {e}")
+                    stored = False
+
+                if stored:
+                    added += 1
+                    if added % SAVE_EVERY == 0:
+                        self.bank.save()
+                else:
+                    failed += 1
+        self.bank.save()
+        return added, failed
+
+    def write_batch(self, tasks, path):
+        """Write the tasks as an OpenAI Batch API input file.
+
+        The task metadata travels in each request's custom_id, so the output
+        file can be imported without any other state.
+
+        Args:
+            tasks (list): Tasks from plan()
+            path (str): Output JSONL path
+        """
+        with open(path, "w") as f:
+            for task in tasks:
+                custom_id = json.dumps({
+                    "stack": task["stack"],
+                    "band": task["band"],
+                    "variant": task["variant"]
+                }, separators=(",", ":"))
+                request = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": build_request_params(self.prompt_for(task), response_format="json")
+                }
+                f.write(json.dumps(request) + "\n")
+
+    def read_batch(self, path):
+        """Import an OpenAI Batch API output file into the bank.
+
+        Args:
+            path (str): Batch output JSONL path
+
+        Returns:
+            tuple: (added, failed) set counts
+        """
+        added = failed = 0
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    result = json.loads(line)
+                    meta = json.loads(result["custom_id"])
+                    response = result.get("response") or {}
+                    if response.get("status_code") != 200:
+                        raise ValueError(result.get("error") or f"status {response.get('status_code')}")
+
+                    years = str(EXPERIENCE_BANDS[meta["band"]])
+                    question_count = self.generator.determine_question_count(years)
+                    task = {
+                        "key": self.generator.get_bank_key(meta["stack"], years, question_count),
+                        "stack": meta["stack"],
+                        "band": meta["band"],
+                        "question_count": question_count
+                    }
+                    content = response["body"]["choices"][0]["message"]["content"]
+                    stored = self.store(task, parse_json_content(content))
+                except Exception as e:
+                    print(f"Error importing batch result: {e}")
+                    stored = False
+
+                if stored:
+                    added += 1
+                else:
+                    failed += 1
+        self.bank.save()
+        return added, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate interview question sets into the question bank.")
+    parser.add_argument("--stacks", help="File with one comma-separated tech stack per line")
+    parser.add_argument("--bands", default=",".join(EXPERIENCE_BANDS), help="Comma-separated experience bands")
+    parser.add_argument("--variants", type=int, default=Config.QUESTION_CACHE_VARIANTS, help="Question sets per stack and band")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent LLM requests")
+    parser.add_argument("--bank", default=Config.QUESTION_BANK_PATH, help="Question bank file")
+    parser.add_argument("--write-batch", help="Write a Batch API input file instead of calling the LLM")
+    parser.add_argument("--read-batch", help="Import a Batch API output file")
+    args = parser.parse_args()
+
+    builder = BankBuilder(QuestionBank(args.bank), variants=args.variants)
+
+    if args.read_batch:
+        added, failed = builder.read_batch(args.read_batch)
+        print(f"Imported {added} question sets ({failed} failed) into {args.bank}")
+        return
+
+    if not args.stacks:
+        parser.error("--stacks is required unless --read-batch is given")
+
+    bands = [band.strip() for band in args.bands.split(",") if band.strip()]
+    unknown = [band for band in bands if band not in EXPERIENCE_BANDS]
+    if unknown:
+        parser.error(f"unknown experience bands: {', '.join(unknown)}")
+
+    tasks = builder.plan(read_stacks(args.stacks), bands)
+    if not tasks:
+        print(f"{args.bank} already has {args.variants} question sets for every stack and band")
+        return
+
+    if args.write_batch:
+        builder.write_batch(tasks, args.write_batch)
+        print(f"Wrote {len(tasks)} requests to {args.write_batch}")
+        return
+
+    added, failed = builder.run_live(tasks, args.concurrency)
+    print(f"Added {added} question sets ({failed} failed or duplicate) to {args.bank}")
+
+if __name__ == "__main__":
+    main()
@@ -9,21 +9,109 @@ class Config:
     # API settings
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gpt-3.5-turbo")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # Optional OpenAI-compatible endpoint
+    
+    # LLM client settings
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 30))  # Seconds to wait for a response
+    LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 5))  # Seconds to wait for a connection
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))  # Retries on rate limits, timeouts and 5xx errors
+    LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))  # Initial backoff delay in seconds
+    LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 8))  # Maximum backoff delay in seconds
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 32))  # Pooled HTTP connections
+    LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", 16))  # Idle connections kept alive
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))  # Concurrent requests per process
+    LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", 60))  # Seconds to wait for a free request slot
+    LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", 0))  # Requests per second per process (0 disables)
+    LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", 10))  # Requests allowed in a burst
     
     # Application settings
     APP_NAME = "TalentScout Hiring Assistant"
     APP_DESCRIPTION = "AI-powered recruitment assistant for technical screening"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING")  # DEBUG shows message contents
+    CHAT_WINDOW_SIZE = int(os.getenv("CHAT_WINDOW_SIZE", 30))  # Latest messages shown before older ones are collapsed
     
     # Data settings
     DATA_DIR = os.getenv("DATA_DIR", "data")
+    CANDIDATE_DB_PATH = os.getenv("CANDIDATE_DB_PATH", os.path.join(DATA_DIR, "candidates.db"))
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 5000))  # Candidates per export chunk
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 20000))  # Rows validated and stored per bulk-import chunk
+    
+    # Event log settings
+    EVENT_LOG_ENABLED = os.getenv("EVENT_LOG_ENABLED", "true").lower() == "true"  # Append every message to the event log
+    EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", os.path.join(DATA_DIR, "events"))
+    EVENT_LOG_SHARDS = int(os.getenv("EVENT_LOG_SHARDS", 16))  # Shard files sessions are spread over
+    EVENT_LOG_FSYNC_INTERVAL = float(os.getenv("EVENT_LOG_FSYNC_INTERVAL", 1.0))  # Seconds between fsyncs (0 = every append, negative = never)
+    EVENT_LOG_COMPACT_BYTES = int(os.getenv("EVENT_LOG_COMPACT_BYTES", 1024 * 1024))  # Shard growth that triggers compaction
     
     # Conversation settings
     MAX_HISTORY_LENGTH = 20  # Maximum number of messages to keep in history
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 3000))  # Maximum tokens in a follow-up prompt
+    PROMPT_SUMMARY_TOKENS = int(os.getenv("PROMPT_SUMMARY_TOKENS", 300))  # Tokens reserved for the summary of older turns
     DEFAULT_TEMPERATURE = 0.7  # Temperature for LLM responses
     
     # Technical question settings
     QUESTIONS_PER_TECH = 3  # Number of questions to generate per technology
     
+    QUESTION_WORKERS = int(os.getenv("QUESTION_WORKERS", 8))  # Background threads generating question sets
+    
+    # Question cache settings
+    QUESTION_CACHE_DIR = os.getenv("QUESTION_CACHE_DIR", os.path.join(DATA_DIR, "question_cache"))
+    QUESTION_CACHE_TTL = int(os.getenv("QUESTION_CACHE_TTL", 7 * 24 * 3600))  # Seconds before a cached set expires
+    QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", 1000))  # LRU eviction threshold
+    QUESTION_CACHE_VARIANTS = int(os.getenv("QUESTION_CACHE_VARIANTS", 3))  # Question sets kept per key
+    QUESTION_CACHE_FLUSH_INTERVAL = float(os.getenv("QUESTION_CACHE_FLUSH_INTERVAL", 30))  # Seconds between writes of cache cursors and access times
+    QUESTION_CACHE_REFILL_WORKERS = int(os.getenv("QUESTION_CACHE_REFILL_WORKERS", 2))  # Threads generating the missing variants of cached keys
+    QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join(DATA_DIR, "question_bank", "bank.json"))  # Pre-generated question sets; kept out of the top level of DATA_DIR, where candidate files live
+    
+    # Answer grading settings
+    GRADING_ENABLED = os.getenv("GRADING_ENABLED", "true").lower() == "true"  # Grade answers with the LLM after the interview
+    GRADING_BATCH_SIZE = int(os.getenv("GRADING_BATCH_SIZE", 40))  # Answers graded per LLM call
+    GRADING_BATCH_WAIT = float(os.getenv("GRADING_BATCH_WAIT", 2.0))  # Seconds to wait for more interviews to share a call
+    GRADING_MIN_WORDS = int(os.getenv("GRADING_MIN_WORDS", 5))  # Shorter answers only get a rubric score
+    GRADING_MAX_ANSWER_TOKENS = int(os.getenv("GRADING_MAX_ANSWER_TOKENS", 400))  # Answer tokens sent to the grader
+    
+    # Post-interview job settings
+    JOBS_ENABLED = os.getenv("JOBS_ENABLED", "true").lower() == "true"  # Save and export completed interviews in the background
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(DATA_DIR, "jobs.db"))
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))  # Background threads running jobs
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))  # Attempts before a job is marked failed
+    JOB_BACKOFF_BASE = float(os.getenv("JOB_BACKOFF_BASE", 2))  # Seconds before the first retry, doubled each time
+    JOB_BACKOFF_MAX = float(os.getenv("JOB_BACKOFF_MAX", 300))  # Maximum seconds between retries
+    JOB_LEASE = float(os.getenv("JOB_LEASE", 300))  # Seconds before a job claimed by a dead worker is retried
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 5))  # Seconds between checks for jobs from other processes
+    JOB_RETENTION = float(os.getenv("JOB_RETENTION", 7 * 24 * 3600))  # Seconds completed jobs are kept
+    CSV_EXPORT_PATH = os.getenv("CSV_EXPORT_PATH", os.path.join(DATA_DIR, "candidates.csv"))  # Refreshed after new candidates are saved
+    CSV_REFRESH_INTERVAL = float(os.getenv("CSV_REFRESH_INTERVAL", 60))  # Seconds between CSV refreshes
+    
+    # Question diversity settings
+    EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", 1024))  # Size of the hashed n-gram question embeddings
+    DIVERSITY_LAMBDA = float(os.getenv("DIVERSITY_LAMBDA", 0.6))  # MMR weight of relevance versus novelty
+    DUPLICATE_SIMILARITY = float(os.getenv("DUPLICATE_SIMILARITY", 0.6))  # Cosine similarity treated as a near-duplicate
+    
+    # Metrics settings
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # Record timings, token counts and fallbacks
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")  # Interface the Streamlit app serves /metrics on
+    METRICS_PORT = int(os.getenv("METRICS_PORT", 0))  # Port of the Streamlit app's /metrics endpoint, e.g. 9464 (0 disables it)
+    METRICS_LOG_PATH = os.getenv("METRICS_LOG_PATH", "")  # Write every timed operation here as JSON lines
+    METRICS_SLOS = os.getenv(  # Seconds per operation or operation:stage; slower runs count as SLO breaches
+        "METRICS_SLOS",
+        "handle_input=0.25,handle_input:collect_tech_stack=0.5,get_llm_response=10,create_chat_completion=10,"
+        "stream_completion=15,first_question=3,generate_combined_questions=15,save_candidate_data=0.5"
+    )
+    
+    # API server settings
+    API_HOST = os.getenv("API_HOST", "127.0.0.1")
+    API_PORT = int(os.getenv("API_PORT", 8000))
+    SESSION_TTL = float(os.getenv("SESSION_TTL", 2 * 3600))  # Idle seconds before a session expires
+    MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", 10000))  # Sessions kept in memory per process
+    
+    # Session store settings
+    SESSION_STORE = os.getenv("SESSION_STORE", "memory")  # "memory" (per process), "sqlite" or "redis"
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join(DATA_DIR, "sessions.db"))  # Shared database for the sqlite store
+    REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")  # Server for the redis store
+    REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", 5))  # Seconds to wait for the Redis server
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", 1000))  # Loaded sessions kept in memory by the shared stores
+    
     # Privacy settings
     PRIVACY_DISCLAIMER = (
         "Your information will be processed in accordance with our privacy policy. "
@@ -41,6 +129,12 @@ class Config:
         "exit", "quit", "bye", "goodbye", "end", "stop"
     ]
     
+    # Interview command keywords (matched against the whole input)
+    SKIP_KEYWORDS = ["skip"]
+    DONE_KEYWORDS = ["done"]
+    SUMMARY_KEYWORDS = ["summary", "profile", "info"]
+    NEXT_KEYWORDS = ["next", "more", "continue"]
+    
     @staticmethod
     def validate_config():
         """Validate that all required configuration settings are present.
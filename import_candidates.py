@@ -0,0 +1,224 @@
+"""Bulk-import candidates from job-board exports into the candidate store.
+
+Reads a CSV file or a JSONL file (one candidate object per line) in chunks.
+Emails and phone numbers are validated and normalized a whole column at a
+time, tech stacks are parsed in batch, and valid rows are written straight
+to the candidate store in one transaction per chunk, without a chat session.
+Each imported candidate is keyed by email, so importing the same applicants
+again (from this file or another board) skips them.
+
+Expected columns are name, email, phone, experience, position, location and
+tech_stack; common variants such as full_name, skills or job_title are
+mapped onto them. Name, email and tech stack are required; a phone number
+is optional but must be valid when given.
+
+Usage (from the repository root):
+    python import_candidates.py applicants.csv
+    python import_candidates.py applicants.jsonl --rejects rejects.csv
+"""
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from modules.candidate_info import CandidateInfoCollector, EMAIL_PATTERN, PHONE_SEPARATORS, PHONE_PATTERN
+from utils.candidate_store import CandidateStore
+from config.config import Config
+
+# Candidate fields in the order they are stored
+INFO_FIELDS = ["name", "email", "phone", "experience", "position", "location"]
+FIELDS = INFO_FIELDS + ["tech_stack"]
+
+# Column names used by job boards for the same fields (after lowercasing and replacing spaces with _)
+COLUMN_ALIASES = {
+    "full_name": "name", "candidate_name": "name",
+    "e-mail": "email", "email_address": "email",
+    "phone_number": "phone", "mobile": "phone", "telephone": "phone",
+    "years_of_experience": "experience", "years_experience": "experience", "experience_years": "experience",
+    "desired_position": "position", "job_title": "position", "title": "position", "role": "position",
+    "city": "location",
+    "skills": "tech_stack", "tech": "tech_stack", "technologies": "tech_stack", "tech_stack_input": "tech_stack"
+}
+
+# Prefix of the store's source_file key for imported candidates
+SOURCE_PREFIX = "import:"
+
+def read_chunks(path, chunk_size):
+    """Read a CSV or JSONL file as DataFrames of at most chunk_size rows.
+
+    Every value is read as text, so phone numbers keep their leading + and
+    zeros and numbers in JSON are not turned into floats.
+
+    Args:
+        path (str): Path of a .csv, .jsonl or .ndjson file
+        chunk_size (int): Maximum rows per chunk
+
+    Yields:
+        pandas.DataFrame: The next chunk of rows
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, "r") as f:
+            lines = (line for line in f if line.strip())
+            while True:
+                batch = list(islice(lines, chunk_size))
+                if not batch:
+                    break
+                yield pd.DataFrame.from_records(
+                    [json.loads(line, parse_int=str, parse_float=str) for line in batch]
+                )
+    else:
+        yield from pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+class CandidateImporter:
+    """Validates rows of candidates column-wise and writes the valid ones to the candidate store."""
+
+    def __init__(self, store=None, collector=None, chunk_size=None):
+        """Initialize the importer.
+
+        Args:
+            store (CandidateStore, optional): Where candidates are written. Defaults to Config.CANDIDATE_DB_PATH.
+            collector (CandidateInfoCollector, optional): Parses tech stacks
+            chunk_size (int, optional): Rows per chunk. Defaults to Config.IMPORT_CHUNK_SIZE.
+        """
+        self.store = store if store else CandidateStore()
+        self.collector = collector if collector else CandidateInfoCollector()
+        self.chunk_size = chunk_size if chunk_size else Config.IMPORT_CHUNK_SIZE
+
+    @staticmethod
+    def normalize(chunk):
+        """Map a chunk's columns onto the candidate fields and normalize their values.
+
+        Args:
+            chunk (pandas.DataFrame): Rows as read from the import file
+
+        Returns:
+            pandas.DataFrame: One stripped string column per field; emails are
+                lowercased and phone separators removed
+        """
+        columns = {}
+        for column in chunk.columns:
+            key = str(column).strip().lower().replace(" ", "_")
+            field = COLUMN_ALIASES.get(key, key)
+            # The first column mapped onto a field wins
+            if field in FIELDS and field not in columns.values():
+                columns[column] = field
+
+        frame = chunk[list(columns)].rename(columns=columns).reindex(columns=FIELDS, fill_value="")
+        frame = frame.fillna("").astype(str).apply(lambda column: column.str.strip())
+        frame["email"] = frame["email"].str.lower()
+        frame["phone"] = frame["phone"].str.replace(PHONE_SEPARATORS, "", regex=True)
+        return frame
+
+    @staticmethod
+    def validate(frame):
+        """Find the rows that cannot be imported.
+
+        Uses the chat's email and phone patterns, applied to whole columns.
+
+        Args:
+            frame (pandas.DataFrame): Rows returned by normalize
+
+        Returns:
+            pandas.Series: The first problem with each row, or "" for valid rows
+        """
+        has_phone = frame["phone"] != ""
+        conditions = [
+            frame["name"] == "",
+            ~frame["email"].str.match(EMAIL_PATTERN),
+            has_phone & ~frame["phone"].str.match(PHONE_PATTERN),
+            frame["tech_stack"] == ""
+        ]
+        reasons = ["missing name", "invalid email", "invalid phone", "missing tech stack"]
+        return pd.Series(np.select(conditions, reasons, default=""), index=frame.index)
+
+    def build_records(self, frame, source, timestamp):
+        """Turn valid rows into (data, source_file) pairs for CandidateStore.add_candidates.
+
+        Args:
+            frame (pandas.DataFrame): Valid rows returned by normalize
+            source (str): Name of the import file, kept with each record
+            timestamp (str): Import timestamp in "%Y%m%d_%H%M%S" format
+
+        Returns:
+            list: (data, source_file) pairs
+        """
+        tech_stacks = self.collector.parse_tech_stacks(frame["tech_stack"].tolist())
+        records = []
+        for values, tech_stack in zip(frame[INFO_FIELDS].itertuples(index=False, name=None), tech_stacks):
+            candidate_info = {field: value for field, value in zip(INFO_FIELDS, values) if value}
+            data = {
+                "candidate_info": candidate_info,
+                "tech_stack": tech_stack,
+                "timestamp": timestamp,
+                "source": source
+            }
+            records.append((data, f"{SOURCE_PREFIX}{candidate_info['email']}"))
+        return records
+
+    def import_file(self, path, rejects_path=None):
+        """Import every valid candidate in a file.
+
+        Args:
+            path (str): Path of a .csv, .jsonl or .ndjson file
+            rejects_path (str, optional): Write rejected rows here as CSV, with a reason column
+
+        Returns:
+            dict: rows, imported, skipped (already in the store), rejected (reason -> count) and seconds
+        """
+        start = time.perf_counter()
+        source = os.path.basename(path)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stats = {"rows": 0, "imported": 0, "skipped": 0, "rejected": {}}
+        rejects_written = 0
+
+        for chunk in read_chunks(path, self.chunk_size):
+            frame = self.normalize(chunk)
+            reasons = self.validate(frame)
+            valid = reasons == ""
+
+            records = self.build_records(frame[valid], source, timestamp)
+            imported = self.store.add_candidates(records)
+            stats["rows"] += len(frame)
+            stats["imported"] += imported
+            stats["skipped"] += len(records) - imported
+
+            for reason, count in reasons[~valid].value_counts().items():
+                stats["rejected"][reason] = stats["rejected"].get(reason, 0) + int(count)
+            if rejects_path and not valid.all():
+                rejected = frame[~valid].assign(reason=reasons[~valid])
+                # Write the header with the first rejected chunk only
+                rejected.to_csv(rejects_path, mode="a" if rejects_written else "w", header=not rejects_written, index=False)
+                rejects_written += len(rejected)
+
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import candidates from a CSV or JSONL file into the candidate store.")
+    parser.add_argument("path", help="CSV file, or JSONL file with one candidate object per line")
+    parser.add_argument("--db", default=Config.CANDIDATE_DB_PATH, help="Candidate store database")
+    parser.add_argument("--rejects", help="Write rejected rows and the reason to this CSV file")
+    parser.add_argument("--chunk-size", type=int, default=Config.IMPORT_CHUNK_SIZE, help="Rows validated and stored at a time")
+    args = parser.parse_args()
+
+    importer = CandidateImporter(CandidateStore(args.db), chunk_size=args.chunk_size)
+    stats = importer.import_file(args.path, args.rejects)
+
+    rejected = sum(stats["rejected"].values())
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    print(
+        f"Read {stats['rows']} rows in {stats['seconds']:.2f}s ({rate:,.0f} rows/s): "
+        f"{stats['imported']} imported, {stats['skipped']} already in {args.db}, {rejected} rejected"
+    )
+    for reason, count in sorted(stats["rejected"].items(), key=lambda item: -item[1]):
+        print(f"  {reason}: {count}")
+    if args.rejects and rejected:
+        print(f"Rejected rows written to {args.rejects}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+import re
+import json
+import queue
+import threading
+from utils.llm_utils import get_llm_response
+from utils.token_utils import truncate_to_tokens
+from modules.question_diversity import content_words
+from config.config import Config
+
+# Prompt for grading a batch of answers in one call
+GRADING_PROMPT = """
+        You are a senior technical interviewer grading written answers from candidates.
+        Grade every answer below from 0 to 10 for technical correctness, depth and clarity,
+        relative to the question it answers. Treat each answer independently.
+
+        Answers (JSON):
+        {answers}
+
+        Respond with a JSON object of this exact form, with one grade per answer id:
+        {{"grades": [{{"id": "<answer id>", "score": <0-10>, "feedback": "<one sentence>"}}]}}
+        """
+
+# Output tokens allowed per graded answer
+GRADE_TOKENS = 80
+
+# Words that show an answer engages with engineering detail
+TECHNICAL_TERMS = frozenset(content_words("""
+    algorithm api async authentication authorization benchmark cache complexity concurrency
+    consistency container database deadlock deploy design encryption endpoint exception index
+    latency load lock log memory metric migration monitor network optimize partition performance
+    pipeline profile protocol query queue race replica request retry rollback scale schema
+    security server session shard state test thread throughput timeout transaction
+    validation version
+"""))
+
+# Words that signal reasoning rather than a bare claim
+REASONING_TERMS = frozenset(content_words("because therefore instead however tradeoff example depends avoid ensure"))
+
+_NON_ANSWER_PATTERN = re.compile(
+    r"^\s*(i\s+(don'?t|do\s+not)\s+know|no\s+idea|not\s+sure|idk|n/?a|pass|dunno)\b",
+    re.IGNORECASE
+)
+
+# Words after which an answer counts as fully developed
+DEPTH_WORDS = 60
+
+# Weights of the rubric components; they sum to 1
+RUBRIC_WEIGHTS = {
+    "coverage": 0.45,
+    "depth": 0.3,
+    "terms": 0.25
+}
+
+class AnswerEvaluator:
+    """Scores interview answers with a local rubric and grades them with the LLM.
+
+    The rubric is a keyword scorer that runs in microseconds: how much of the
+    question an answer addresses, how developed it is, and how much technical
+    vocabulary and reasoning it uses. Every answer gets a rubric score right
+    away. Answers that are not obvious non-answers are then graded by the LLM
+    in batches, many answers (and candidates) per call; if that fails the
+    rubric score stands.
+    """
+
+    def __init__(self, batch_size=None, min_words=None, max_answer_tokens=None):
+        """Initialize the evaluator.
+
+        Args:
+            batch_size (int, optional): Answers per LLM call. Defaults to Config.GRADING_BATCH_SIZE.
+            min_words (int, optional): Shorter answers are only scored by the rubric.
+                Defaults to Config.GRADING_MIN_WORDS.
+            max_answer_tokens (int, optional): Answer tokens sent to the LLM.
+                Defaults to Config.GRADING_MAX_ANSWER_TOKENS.
+        """
+        self.batch_size = batch_size if batch_size else Config.GRADING_BATCH_SIZE
+        self.min_words = min_words if min_words is not None else Config.GRADING_MIN_WORDS
+        self.max_answer_tokens = max_answer_tokens if max_answer_tokens else Config.GRADING_MAX_ANSWER_TOKENS
+
+    def is_non_answer(self, answer):
+        """Check whether an answer is too short or a refusal to be worth grading.
+
+        Args:
+            answer (str): The candidate's answer
+
+        Returns:
+            bool: True if the answer should only get a rubric score
+        """
+        return len(answer.split()) < self.min_words or bool(_NON_ANSWER_PATTERN.match(answer))
+
+    def score_answer(self, question, answer, tech_stack=None):
+        """Score an answer with the local rubric.
+
+        Args:
+            question (str): The interview question
+            answer (str): The candidate's answer
+            tech_stack (list, optional): The candidate's technologies, counted as technical terms
+
+        Returns:
+            tuple: (score from 0 to 10, one-line feedback)
+        """
+        if _NON_ANSWER_PATTERN.match(answer):
+            return 0.0, "The candidate did not attempt an answer."
+
+        answer_words = content_words(answer)
+        if not answer_words:
+            return 0.0, "The answer is empty."
+        answer_set = set(answer_words)
+
+        question_set = set(content_words(question))
+        coverage = len(question_set & answer_set) / len(question_set) if question_set else 0.0
+        depth = min(1.0, len(answer.split()) / DEPTH_WORDS)
+
+        stack_terms = set(content_words(" ".join(tech_stack or [])))
+        terms = len(answer_set & (TECHNICAL_TERMS | stack_terms)) + len(answer_set & REASONING_TERMS)
+        terms = min(1.0, terms / 4)
+
+        score = 10 * (
+            RUBRIC_WEIGHTS["coverage"] * min(1.0, coverage * 2)
+            + RUBRIC_WEIGHTS["depth"] * depth
+            + RUBRIC_WEIGHTS["terms"] * terms
+        )
+
+        if depth < 0.25:
+            feedback = "The answer is brief; it may lack depth."
+        elif coverage < 0.2:
+            feedback = "The answer does not seem to address the question directly."
+        elif terms < 0.5:
+            feedback = "The answer addresses the question with little technical detail."
+        else:
+            feedback = "The answer addresses the question with technical detail."
+        return round(score, 1), feedback
+
+    def _rubric_grade(self, answer, tech_stack):
+        score, feedback = self.score_answer(answer["question"], answer["answer"], tech_stack)
+        return {
+            "question_index": answer["question_index"],
+            "question": answer["question"],
+            "answer": answer["answer"],
+            "score": score,
+            "rubric_score": score,
+            "feedback": feedback,
+            "method": "rubric"
+        }
+
+    def _grade_with_llm(self, items):
+        """Grade (id, question, answer) items in one LLM call.
+
+        Returns:
+            dict: Answer id -> (score, feedback) for every valid grade in the response
+        """
+        answers = [
+            {"id": item_id, "question": question, "answer": truncate_to_tokens(answer, self.max_answer_tokens)}
+            for item_id, question, answer in items
+        ]
+        prompt = GRADING_PROMPT.format(answers=json.dumps(answers, ensure_ascii=False, indent=1))
+        response = get_llm_response(
+            prompt,
+            temperature=0,
+            max_tokens=GRADE_TOKENS * len(items) + 50,
+            response_format="json"
+        )
+
+        grades = response.get("grades") if isinstance(response, dict) else None
+        if not isinstance(grades, list):
+            return {}
+
+        results = {}
+        for grade in grades:
+            try:
+                score = min(10.0, max(0.0, float(grade["score"])))
+                results[str(grade["id"])] = (round(score, 1), str(grade.get("feedback", "")).strip())
+            except (KeyError, TypeError, ValueError):
+                continue
+        return results
+
+    def rubric_grades(self, answers, tech_stack=None):
+        """Score answers with the rubric only.
+
+        Args:
+            answers (list): Answer dictionaries with question_index, question and answer
+            tech_stack (list, optional): The candidate's technologies
+
+        Returns:
+            list: One grade dictionary per answer
+        """
+        return [self._rubric_grade(answer, tech_stack) for answer in answers]
+
+    def evaluate_batch(self, submissions):
+        """Grade the answers of several candidates, sharing LLM calls between them.
+
+        Args:
+            submissions (list): (answers, tech_stack) tuples, one per candidate
+
+        Returns:
+            list: For each submission, one grade dictionary per answer. Grades
+            the LLM returned have method "llm"; the rest keep the rubric score.
+        """
+        results = []
+        pending = []
+        for submission, (answers, tech_stack) in enumerate(submissions):
+            grades = self.rubric_grades(answers, tech_stack)
+            results.append(grades)
+            for position, grade in enumerate(grades):
+                if not self.is_non_answer(grade["answer"]):
+                    pending.append((f"{submission}.{position}", grade))
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            try:
+                llm_grades = self._grade_with_llm([(item_id, grade["question"], grade["answer"]) for item_id, grade in chunk])
+            except Exception as e:
+                print(f"Error grading answers: {e}")
+                continue
+
+            for item_id, grade in chunk:
+                if item_id in llm_grades:
+                    grade["score"], feedback = llm_grades[item_id]
+                    grade["feedback"] = feedback or grade["feedback"]
+                    grade["method"] = "llm"
+        return results
+
+    def evaluate(self, answers, tech_stack=None):
+        """Grade one candidate's answers, in as few LLM calls as the batch size allows.
+
+        Args:
+            answers (list): Answer dictionaries with question_index, question and answer
+            tech_stack (list, optional): The candidate's technologies
+
+        Returns:
+            list: One grade dictionary per answer
+        """
+        return self.evaluate_batch([(answers, tech_stack)])[0]
+
+    @staticmethod
+    def summarize(grades, status):
+        """Build the evaluation summary stored with a session.
+
+        Args:
+            grades (list): Grade dictionaries
+            status (str): "pending" while LLM grading is queued, otherwise "complete"
+
+        Returns:
+            dict: Status, average score and the grades
+        """
+        scores = [grade["score"] for grade in grades]
+        return {
+            "status": status,
+            "average_score": round(sum(scores) / len(scores), 1) if scores else None,
+            "graded_by_llm": sum(1 for grade in grades if grade["method"] == "llm"),
+            "grades": grades
+        }
+
+class GradingWorker:
+    """Grades finished interviews on a background thread.
+
+    Interviews submitted within batch_wait seconds of each other are graded
+    together, so a busy process makes one LLM call per batch of answers
+    instead of one per candidate.
+    """
+
+    def __init__(self, evaluator=None, batch_wait=None):
+        """Initialize the worker.
+
+        Args:
+            evaluator (AnswerEvaluator, optional): The evaluator to use
+            batch_wait (float, optional): Seconds to wait for more interviews before
+                grading. Defaults to Config.GRADING_BATCH_WAIT.
+        """
+        self.evaluator = evaluator if evaluator else AnswerEvaluator()
+        self.batch_wait = batch_wait if batch_wait is not None else Config.GRADING_BATCH_WAIT
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, answers, tech_stack, callback):
+        """Queue a finished interview for grading.
+
+        Args:
+            answers (list): Answer dictionaries with question_index, question and answer
+            tech_stack (list): The candidate's technologies
+            callback (callable): Called on the worker thread with the list of grades
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="answer-grading", daemon=True)
+                self._thread.start()
+        self._queue.put((answers, tech_stack, callback))
+
+    def _collect(self):
+        """Wait for a submission, then gather more until the batch is full or batch_wait passes."""
+        batch = [self._queue.get()]
+        answer_count = len(batch[0][0])
+        while answer_count < self.evaluator.batch_size:
+            try:
+                item = self._queue.get(timeout=self.batch_wait)
+            except queue.Empty:
+                break
+            batch.append(item)
+            answer_count += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                results = self.evaluator.evaluate_batch([(answers, tech_stack) for answers, tech_stack, _ in batch])
+            except Exception as e:
+                print(f"Error grading answers: {e}")
+                results = [self.evaluator.rubric_grades(answers, tech_stack) for answers, tech_stack, _ in batch]
+
+            for (_, _, callback), grades in zip(batch, results):
+                try:
+                    callback(grades)
+                except Exception as e:
+                    print(f"Error in grading callback: {e}")
+
+_shared_worker = None
+_shared_worker_lock = threading.Lock()
+
+def get_grading_worker():
+    """Get the process-wide grading worker.
+
+    Returns:
+        GradingWorker or None: The shared worker, or None if Config.GRADING_ENABLED is off
+    """
+    global _shared_worker
+    if not Config.GRADING_ENABLED:
+        return None
+    if _shared_worker is None:
+        with _shared_worker_lock:
+            if _shared_worker is None:
+                _shared_worker = GradingWorker()
+    return _shared_worker
@@ -1,4 +1,10 @@
 import re
+from modules.tech_taxonomy import get_tech_taxonomy
+
+# Compiled once; import_candidates.py applies the same patterns to whole columns
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@([\w\-]+\.)+[A-Za-z]{2,}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-\(\)\.]')
+PHONE_PATTERN = re.compile(r'^\+?\d{10,15}$')
 
 class CandidateInfoCollector:
     """Handles the collection and validation of candidate information."""
@@ -17,8 +23,7 @@ class CandidateInfoCollector:
             bool: True if the email is valid, False otherwise
         """
         # Basic email validation pattern
-        pattern = r'^[\w\.-]+@([\w\-]+\.)+[A-Za-z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(EMAIL_PATTERN.match(email))
     
     def validate_phone(self, phone):
         """Validate a phone number format.
@@ -30,28 +35,36 @@ class CandidateInfoCollector:
             bool: True if the phone number is valid, False otherwise
         """
         # Remove common separators and spaces
-        cleaned_phone = re.sub(r'[\s\-\(\)\.]', '', phone)
+        cleaned_phone = PHONE_SEPARATORS.sub('', phone)
         
         # Check if it's a valid phone number (basic check for length and digits)
-        return bool(re.match(r'^\+?\d{10,15}$', cleaned_phone))
+        return bool(PHONE_PATTERN.match(cleaned_phone))
     
     def parse_tech_stack(self, tech_stack_input):
         """Parse the tech stack input into a list of technologies.
         
+        Uses the tech taxonomy tokenizer, so inputs such as "Python/Django",
+        "React + Redux" or "AWS (EC2, S3)" are split correctly and known
+        technologies get their standard names ("postgres 15" -> "PostgreSQL").
+        
         Args:
             tech_stack_input (str): The raw tech stack input from the user
             
         Returns:
             list: A list of individual technologies
         """
-        # Split by commas, semicolons, or 'and'
-        separators = r'[,;]|\sand\s'
-        technologies = re.split(separators, tech_stack_input)
-        
-        # Clean up each technology name
-        cleaned_technologies = [tech.strip() for tech in technologies if tech.strip()]
+        return get_tech_taxonomy().parse_labels(tech_stack_input)
+    
+    def parse_tech_stacks(self, tech_stack_inputs):
+        """Parse many tech stack inputs at once, e.g. a column of an import file.
         
-        return cleaned_technologies
+        Args:
+            tech_stack_inputs (list): Raw tech stack strings
+            
+        Returns:
+            list: A list of technologies for each input, in the same order
+        """
+        return get_tech_taxonomy().parse_batch(tech_stack_inputs, labels=True)
     
     def format_candidate_info(self, candidate_info):
         """Format the candidate information for display or storage.
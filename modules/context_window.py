@@ -0,0 +1,152 @@
+from collections import deque
+from utils.token_utils import count_tokens, truncate_to_tokens
+from config.config import Config
+
+# Static system section of the follow-up prompt, formatted once per candidate
+FOLLOW_UP_SYSTEM_PROMPT = """
+        You are the {app_name}, an AI chatbot helping with technical recruitment screening.
+
+        Candidate Information:
+        - Name: {name}
+        - Position: {position}
+        - Experience: {experience}
+        - Tech Stack: {tech_stack}
+
+        The candidate has answered some technical questions. Provide a thoughtful, professional response that:
+        1. Acknowledges their answer
+        2. Provides additional insights or follow-up questions related to their response
+        3. Stays focused on technical assessment
+        4. Maintains a friendly, conversational tone
+
+        Do not introduce new topics unrelated to the technical assessment or the candidate's background.
+        If the candidate asks about next steps or the hiring process, provide general information about TalentScout's process.
+        """
+
+# Tokens of each evicted message kept in the running summary
+SUMMARY_LINE_TOKENS = 30
+
+class ContextWindow:
+    """Builds follow-up prompts that fit within a token budget.
+
+    Messages are tokenized once as they are added to the history. When the
+    prompt would exceed the budget, the oldest messages are evicted from the
+    verbatim window into a short running summary, so long interviews keep
+    their context without growing the prompt.
+    """
+
+    def __init__(self, token_budget=None, summary_budget=None, model=None):
+        """Initialize the context window.
+
+        Args:
+            token_budget (int, optional): Maximum prompt tokens. Defaults to Config.PROMPT_TOKEN_BUDGET.
+            summary_budget (int, optional): Maximum summary tokens. Defaults to Config.PROMPT_SUMMARY_TOKENS.
+            model (str, optional): Model whose tokenizer to use. Defaults to Config.DEFAULT_MODEL.
+        """
+        self.token_budget = token_budget if token_budget else Config.PROMPT_TOKEN_BUDGET
+        self.summary_budget = summary_budget if summary_budget is not None else Config.PROMPT_SUMMARY_TOKENS
+        self.model = model if model else Config.DEFAULT_MODEL
+
+        self._system_key = None
+        self._system_text = ""
+        self._system_tokens = 0
+
+        self._lines = []  # Rendered history lines, one per message seen so far
+        self._line_tokens = []
+        self._start = 0  # Index of the oldest message still in the verbatim window
+        self._window_tokens = 0
+
+        self._summary = deque()  # (line, tokens) for evicted messages
+        self._summary_tokens = 0
+
+    def reset(self):
+        """Forget all tokenized history and the running summary."""
+        self.__init__(self.token_budget, self.summary_budget, self.model)
+
+    def _system_section(self, candidate_info, tech_stack):
+        """Get the system section, formatting it only when its inputs change."""
+        key = (
+            candidate_info.get('name', 'Unknown'),
+            candidate_info.get('position', 'Unknown'),
+            candidate_info.get('experience', 'Unknown'),
+            tuple(tech_stack)
+        )
+        if key != self._system_key:
+            self._system_text = FOLLOW_UP_SYSTEM_PROMPT.format(
+                app_name=Config.APP_NAME,
+                name=key[0],
+                position=key[1],
+                experience=key[2],
+                tech_stack=', '.join(tech_stack)
+            ) + "\n\nConversation History:\n"
+            self._system_tokens = count_tokens(self._system_text, self.model)
+            self._system_key = key
+        return self._system_text
+
+    def _sync(self, history):
+        """Tokenize any messages added to the history since the last build."""
+        if len(history) < len(self._lines):
+            # The history was replaced; start over
+            self.reset()
+
+        for message in history[len(self._lines):]:
+            line = f"\n{message['role'].upper()}: {message['content']}"
+            tokens = count_tokens(line, self.model)
+            self._lines.append(line)
+            self._line_tokens.append(tokens)
+            self._window_tokens += tokens
+
+    def _evict_oldest(self):
+        """Move the oldest message in the window into the running summary."""
+        line = self._lines[self._start]
+        summary_line = truncate_to_tokens(line.strip(), SUMMARY_LINE_TOKENS, self.model)
+        if summary_line != line.strip():
+            summary_line += "..."
+        summary_line = f"\n- {summary_line}"
+        summary_tokens = count_tokens(summary_line, self.model)
+
+        self._window_tokens -= self._line_tokens[self._start]
+        self._start += 1
+
+        self._summary.append((summary_line, summary_tokens))
+        self._summary_tokens += summary_tokens
+        # Keep the summary itself bounded by dropping its oldest lines
+        while self._summary and self._summary_tokens > self.summary_budget:
+            _, dropped_tokens = self._summary.popleft()
+            self._summary_tokens -= dropped_tokens
+
+    def build(self, history, user_input, candidate_info, tech_stack):
+        """Build a follow-up prompt that fits the token budget.
+
+        Args:
+            history (list): Conversation history of messages with role and content
+            user_input (str): The user's latest message
+            candidate_info (dict): The candidate's information
+            tech_stack (list): The candidate's tech stack
+
+        Returns:
+            str: The prompt for the LLM
+        """
+        system_text = self._system_section(candidate_info, tech_stack)
+        self._sync(history)
+
+        tail = f"\n\nUser's latest response: {user_input}\n\nYour response:"
+        summary_header = "\nEarlier in the conversation (summarized):"
+        fixed_tokens = self._system_tokens + count_tokens(tail, self.model)
+        header_tokens = count_tokens(summary_header, self.model)
+
+        def total_tokens():
+            summary = header_tokens + self._summary_tokens if self._summary else 0
+            return fixed_tokens + summary + self._window_tokens
+
+        # Always keep the latest message verbatim, even if it alone exceeds the budget
+        while total_tokens() > self.token_budget and self._start < len(self._lines) - 1:
+            self._evict_oldest()
+
+        parts = [system_text]
+        if self._summary:
+            parts.append(summary_header)
+            parts.extend(line for line, _ in self._summary)
+            parts.append("\n")
+        parts.extend(self._lines[self._start:])
+        parts.append(tail)
+        return "".join(parts)
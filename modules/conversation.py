@@ -1,6 +1,10 @@
-import re
+import logging
 from utils.llm_utils import get_llm_response
-from config.config import Config
+from modules.intent import Intent, classify_input
+from modules.context_window import ContextWindow
+from modules.transcript import Message
+
+logger = logging.getLogger(__name__)
 
 class ConversationManager:
     """Manages the conversation flow and context for the TalentScout chatbot."""
@@ -8,7 +12,30 @@ class ConversationManager:
     def __init__(self):
         """Initialize the conversation manager with conversation history."""
         self.conversation_history = []
-        self.end_conversation_keywords = Config.END_CONVERSATION_KEYWORDS
+        self.shared_history = False
+        self._context_window = None
+    
+    @property
+    def context_window(self):
+        """The follow-up prompt window, created on first use since most sessions never build one."""
+        if self._context_window is None:
+            self._context_window = ContextWindow()
+        return self._context_window
+    
+    def share_history(self, history):
+        """Use a transcript recorded by the caller as the conversation history.
+        
+        The owner of the transcript records every message itself, so the
+        manager stops adding its own copies and a session keeps one list of
+        messages instead of two.
+        
+        Args:
+            history (list): The shared list of Message records
+        """
+        self.conversation_history = history
+        self.shared_history = True
+        if self._context_window is not None:
+            self._context_window.reset()
     
     def add_to_history(self, role, content):
         """Add a message to the conversation history.
@@ -17,7 +44,8 @@ class ConversationManager:
             role (str): The role of the message sender ("user" or "assistant")
             content (str): The content of the message
         """
-        self.conversation_history.append({"role": role, "content": content})
+        if not self.shared_history:
+            self.conversation_history.append(Message(role, content))
     
     def get_greeting(self):
         """Generate the initial greeting message.
@@ -106,17 +134,18 @@ class ConversationManager:
         self.add_to_history("assistant", prompt)
         return prompt
     
-    def format_questions_intro(self, questions, experience_years):
+    def format_questions_intro(self, questions, experience_years, question_count=None):
         """Format the introduction to the technical questions.
         
         Args:
             questions (list): List of combined questions
             experience_years (str): Years of experience
+            question_count (int, optional): Total number of questions, if not all generated yet
             
         Returns:
             str: Formatted introduction message
         """
-        question_count = len(questions)
+        question_count = question_count if question_count else len(questions)
         message = f"""
         🎯 **Technical Interview Time!**
         
@@ -169,8 +198,8 @@ class ConversationManager:
         total_completed = answered_questions + skipped_questions
         if total_completed != total_questions:
             # Log the discrepancy for debugging
-            print(f"Warning: Question count mismatch. Total: {total_questions}, Completed: {total_completed}")
-            print(f"Answered: {answered_questions}, Skipped: {skipped_questions}")
+            logger.warning("Question count mismatch. Total: %d, Completed: %d", total_questions, total_completed)
+            logger.debug("Answered: %d, Skipped: %d", answered_questions, skipped_questions)
         
         message = f"""
         🎉 **Interview Complete!**
@@ -183,8 +212,7 @@ class ConversationManager:
         Thank you for your time! Your responses have been recorded and will be reviewed by our recruitment team.
         """
         
-        # Debug: print the message to see if there are any HTML tags
-        print(f"DEBUG - Completion message: {repr(message)}")
+        logger.debug("Completion message: %r", message)
         
         self.add_to_history("assistant", message)
         return message
@@ -220,14 +248,7 @@ class ConversationManager:
         Returns:
             bool: True if the conversation should end, False otherwise
         """
-        user_input_lower = user_input.lower()
-        
-        # Check if any ending keyword is in the user input
-        for keyword in self.end_conversation_keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', user_input_lower):
-                return True
-        
-        return False
+        return self.classify_input(user_input) is Intent.END
     
     def is_skip_request(self, user_input):
         """Check if the user wants to skip the current question.
@@ -238,7 +259,18 @@ class ConversationManager:
         Returns:
             bool: True if user wants to skip, False otherwise
         """
-        return user_input.lower().strip() == "skip"
+        return self.classify_input(user_input) is Intent.SKIP
+    
+    def classify_input(self, user_input):
+        """Classify the user input as a command or an answer.
+        
+        Args:
+            user_input (str): The user's input message
+            
+        Returns:
+            Intent: The detected intent (end, skip, done, summary, next or answer)
+        """
+        return classify_input(user_input)
     
     def get_end_conversation_message(self):
         """Generate the end conversation message.
@@ -269,35 +301,5 @@ class ConversationManager:
         # Add the user input to history
         self.add_to_history("user", user_input)
         
-        # Create a system prompt that includes context about the conversation
-        system_prompt = f"""
-        You are the {Config.APP_NAME}, an AI chatbot helping with technical recruitment screening.
-        
-        Candidate Information:
-        - Name: {candidate_info.get('name', 'Unknown')}
-        - Position: {candidate_info.get('position', 'Unknown')}
-        - Experience: {candidate_info.get('experience', 'Unknown')}
-        - Tech Stack: {', '.join(tech_stack)}
-        
-        The candidate has answered some technical questions. Provide a thoughtful, professional response that:
-        1. Acknowledges their answer
-        2. Provides additional insights or follow-up questions related to their response
-        3. Stays focused on technical assessment
-        4. Maintains a friendly, conversational tone
-        
-        Do not introduce new topics unrelated to the technical assessment or the candidate's background.
-        If the candidate asks about next steps or the hiring process, provide general information about TalentScout's process.
-        """
-        
-        # Create a prompt that includes the conversation history
-        prompt = system_prompt + "\n\nConversation History:\n"
-        
-        # Add the last few exchanges from conversation history
-        max_messages = Config.MAX_HISTORY_LENGTH * 2  # Each exchange has 2 messages (user and assistant)
-        for message in self.conversation_history[-max_messages:]:
-            prompt += f"\n{message['role'].upper()}: {message['content']}"
-        
-        # Add the current user input
-        prompt += f"\n\nUser's latest response: {user_input}\n\nYour response:"
-        
-        return prompt
\ No newline at end of file
+        # Fit the static context, recent history and a summary of older turns into the token budget
+        return self.context_window.build(self.conversation_history, user_input, candidate_info, tech_stack)
@@ -0,0 +1,91 @@
+import re
+from enum import Enum
+from config.config import Config
+
+class Intent(Enum):
+    """What the candidate meant by a chat message."""
+
+    END = "end"
+    SKIP = "skip"
+    DONE = "done"
+    SUMMARY = "summary"
+    NEXT = "next"
+    ANSWER = "answer"
+
+# Commands only count when they are the whole message; end keywords count anywhere
+_COMMAND_INTENTS = (Intent.SKIP, Intent.DONE, Intent.SUMMARY, Intent.NEXT)
+
+class InputClassifier:
+    """Classifies chat input into an Intent with a single precompiled regex.
+
+    All keyword lists are folded into one alternation pattern, so classifying
+    a message is one scan of the input no matter how many keywords (or
+    localized keyword lists) are configured.
+    """
+
+    def __init__(self, end_keywords=None, skip_keywords=None, done_keywords=None,
+                 summary_keywords=None, next_keywords=None):
+        """Initialize the input classifier.
+
+        Args:
+            end_keywords (list, optional): Words that end the conversation. Defaults to Config.END_CONVERSATION_KEYWORDS.
+            skip_keywords (list, optional): Commands that skip a question. Defaults to Config.SKIP_KEYWORDS.
+            done_keywords (list, optional): Commands that finish the interview. Defaults to Config.DONE_KEYWORDS.
+            summary_keywords (list, optional): Commands that show the profile. Defaults to Config.SUMMARY_KEYWORDS.
+            next_keywords (list, optional): Commands that ask for more questions. Defaults to Config.NEXT_KEYWORDS.
+        """
+        keywords = {
+            Intent.END: end_keywords if end_keywords is not None else Config.END_CONVERSATION_KEYWORDS,
+            Intent.SKIP: skip_keywords if skip_keywords is not None else Config.SKIP_KEYWORDS,
+            Intent.DONE: done_keywords if done_keywords is not None else Config.DONE_KEYWORDS,
+            Intent.SUMMARY: summary_keywords if summary_keywords is not None else Config.SUMMARY_KEYWORDS,
+            Intent.NEXT: next_keywords if next_keywords is not None else Config.NEXT_KEYWORDS
+        }
+
+        command_groups = [
+            f"(?P<{intent.value}>{self._alternation(keywords[intent])})"
+            for intent in _COMMAND_INTENTS if keywords[intent]
+        ]
+        branches = []
+        if command_groups:
+            branches.append(r"^\s*(?:" + "|".join(command_groups) + r")\s*$")
+        if keywords[Intent.END]:
+            branches.append(r"\b(?P<end>" + self._alternation(keywords[Intent.END]) + r")\b")
+
+        self._pattern = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+
+    @staticmethod
+    def _alternation(words):
+        # Longest first so a keyword never shadows a longer one sharing its prefix
+        return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+
+    def classify(self, user_input):
+        """Classify a chat message.
+
+        Args:
+            user_input (str): The user's input message
+
+        Returns:
+            Intent: The detected intent, Intent.ANSWER if no keyword matched
+        """
+        if not self._pattern:
+            return Intent.ANSWER
+
+        match = self._pattern.search(user_input)
+        if not match:
+            return Intent.ANSWER
+        return Intent(match.lastgroup)
+
+# Compiled once at import and shared by every session
+_default_classifier = InputClassifier()
+
+def classify_input(user_input):
+    """Classify a chat message with the configured keyword lists.
+
+    Args:
+        user_input (str): The user's input message
+
+    Returns:
+        Intent: The detected intent
+    """
+    return _default_classifier.classify(user_input)
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import threading
+from utils.job_queue import JobQueue
+from utils.data_handler import DataHandler
+from config.config import Config
+
+# Job kinds run after an interview completes
+SAVE_CANDIDATE = "save_candidate"
+ANONYMIZE_CANDIDATE = "anonymize_candidate"
+REFRESH_CSV = "refresh_csv"
+
+class PostInterviewProcessor:
+    """Saves, anonymizes and exports completed interviews on the job queue.
+
+    The candidate-facing code only calls enqueue_save, which writes one row
+    to the queue and returns. Saving a candidate then queues an anonymized
+    copy and a refresh of the CSV export. CSV refreshes are debounced:
+    every save within the same CSV_REFRESH_INTERVAL shares one refresh job
+    that runs at the end of the interval.
+    """
+
+    def __init__(self, job_queue=None, data_handler=None):
+        """Initialize the processor and register its job handlers.
+
+        Args:
+            job_queue (JobQueue, optional): The queue to use. Defaults to a queue at Config.JOB_DB_PATH.
+            data_handler (DataHandler, optional): Where candidates are saved
+        """
+        self.job_queue = job_queue if job_queue else JobQueue()
+        self.data_handler = data_handler if data_handler else DataHandler()
+        self.anonymized_dir = os.path.join(self.data_handler.data_dir, "anonymized")
+
+        self.job_queue.register(SAVE_CANDIDATE, self.save_candidate)
+        self.job_queue.register(ANONYMIZE_CANDIDATE, self.anonymize_candidate)
+        self.job_queue.register(REFRESH_CSV, self.refresh_csv)
+
+    def enqueue_save(self, payload, idempotency_key, delay=0, replace_pending=False):
+        """Queue a completed interview to be saved.
+
+        Args:
+            payload (dict): candidate_info, tech_stack, timestamp and either session_id and
+                transcript_since or conversation_history, plus an optional evaluation
+            idempotency_key (str): Identifies the interview, so it is saved once
+            delay (float): Seconds to wait before saving
+            replace_pending (bool): Replace the payload of a save that has not run yet
+
+        Returns:
+            int: The job id
+        """
+        return self.job_queue.enqueue(SAVE_CANDIDATE, payload, idempotency_key, delay, replace_pending)
+
+    def save_candidate(self, payload):
+        """Job handler: save a candidate, then queue its anonymized copy and a CSV refresh.
+
+        The saved file holds the transcript, so the session's events are purged from the log.
+        """
+        file_path = self.data_handler.save_candidate_data(
+            payload["candidate_info"],
+            payload["tech_stack"],
+            payload.get("conversation_history", []),
+            session_id=payload.get("session_id"),
+            timestamp=payload.get("timestamp"),
+            evaluation=payload.get("evaluation"),
+            transcript_since=payload.get("transcript_since")
+        )
+        filename = os.path.basename(file_path)
+        if payload.get("session_id") and self.data_handler.event_log:
+            self.data_handler.event_log.purge(payload["session_id"], payload.get("transcript_since"))
+        # A save with the LLM grades after one with pending grades rewrites the anonymized copy too
+        status = (payload.get("evaluation") or {}).get("status", "")
+        self.job_queue.enqueue(ANONYMIZE_CANDIDATE, {"file": filename}, f"{ANONYMIZE_CANDIDATE}:{filename}:{status}")
+
+        interval = Config.CSV_REFRESH_INTERVAL
+        bucket = int(time.time() // interval)
+        delay = (bucket + 1) * interval - time.time()
+        self.job_queue.enqueue(REFRESH_CSV, {}, f"{REFRESH_CSV}:{bucket}", delay=delay)
+        return {"file": filename}
+
+    def anonymize_candidate(self, payload):
+        """Job handler: write an anonymized copy of a saved candidate file."""
+        data = self.data_handler.load_candidate_data(os.path.join(self.data_handler.data_dir, payload["file"]))
+        if data is None:
+            raise ValueError(f"Could not load {payload['file']}")
+
+        os.makedirs(self.anonymized_dir, exist_ok=True)
+        output_path = os.path.join(self.anonymized_dir, payload["file"])
+        with open(f"{output_path}.tmp", "w") as f:
+            json.dump(self.data_handler.anonymize_data(data), f, separators=(",", ":"))
+        os.replace(f"{output_path}.tmp", output_path)
+        return {"file": output_path}
+
+    def refresh_csv(self, payload):
+        """Job handler: rewrite the CSV export of every candidate."""
+        output_path = Config.CSV_EXPORT_PATH
+        if not self.data_handler.export_to_csv(f"{output_path}.tmp"):
+            return {"rows": 0}
+        os.replace(f"{output_path}.tmp", output_path)
+        return {"file": output_path}
+
+_shared_processor = None
+_shared_processor_lock = threading.Lock()
+
+def get_post_interview_processor():
+    """Get the process-wide post-interview processor, starting its workers on first use.
+
+    Returns:
+        PostInterviewProcessor or None: The shared processor, or None if Config.JOBS_ENABLED is off
+    """
+    global _shared_processor
+    if not Config.JOBS_ENABLED:
+        return None
+    if _shared_processor is None:
+        with _shared_processor_lock:
+            if _shared_processor is None:
+                _shared_processor = PostInterviewProcessor()
+                _shared_processor.job_queue.start()
+    return _shared_processor
@@ -0,0 +1,259 @@
+import re
+import threading
+from functools import lru_cache
+import numpy as np
+from modules.template_bank import get_template_bank
+from config.config import Config
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Words that say nothing about a question's topic
+_STOPWORDS = frozenset("""
+    a an and are as at be between by can describe do does explain for from how
+    in into is it its of on or please the their this to use used using what
+    when which while why with would you your
+""".split())
+
+# Suffixes stripped so that e.g. "lists"/"list" and "management"/"manage" match
+_SUFFIXES = ("ment", "ing", "ies", "es", "s", "ed")
+
+# Weight of character trigrams relative to whole words
+TRIGRAM_WEIGHT = 0.3
+
+@lru_cache(maxsize=16384)
+def _word_features(word):
+    """Get a word's stem and the hashes of its character trigrams, or None for a stopword."""
+    if word in _STOPWORDS:
+        return None
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            break
+    padded = f"<{word}>"
+    return word, tuple(hash(f"#{padded[i:i + 3]}") for i in range(len(padded) - 2))
+
+def content_words(text):
+    """Get the stemmed words of a text that say something about its topic.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        list: Stems in order, without stopwords
+    """
+    words = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        features = _word_features(token)
+        if features is not None:
+            words.append(features[0])
+    return words
+
+def _features(text):
+    """Get the hashed features of a text: word unigrams, word bigrams and character trigrams.
+
+    Vectors are never persisted, so the per-process string hash is good enough.
+
+    Returns:
+        tuple: (feature hashes, feature weights)
+    """
+    words = []
+    ids = []
+    trigram_ids = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        features = _word_features(token)
+        if features is None:
+            continue
+        word, trigrams = features
+        if words:
+            ids.append(hash((words[-1], word)))
+        words.append(word)
+        ids.append(hash(word))
+        trigram_ids.extend(trigrams)
+    return ids + trigram_ids, [1.0] * len(ids) + [TRIGRAM_WEIGHT] * len(trigram_ids)
+
+def embed_texts(texts, dim=None):
+    """Embed texts as L2-normalized hashed n-gram vectors.
+
+    Args:
+        texts (list): Texts to embed
+        dim (int, optional): Vector size. Defaults to Config.EMBEDDING_DIM.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(texts), dim), one unit vector per text
+    """
+    dim = dim if dim else Config.EMBEDDING_DIM
+    all_ids = []
+    all_weights = []
+    lengths = []
+    for text in texts:
+        ids, weights = _features(text)
+        all_ids.extend(ids)
+        all_weights.extend(weights)
+        lengths.append(len(ids))
+
+    # Accumulate every feature of every text in one pass
+    offsets = np.repeat(np.arange(len(texts), dtype=np.int64) * dim, lengths)
+    slots = np.asarray(all_ids, dtype=np.int64) % dim + offsets
+    counts = np.bincount(slots, weights=all_weights, minlength=len(texts) * dim)
+    vectors = counts.astype(np.float32).reshape(len(texts), dim)
+    # Sublinear term frequency, then unit length so dot products are cosines
+    np.log1p(vectors, out=vectors)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class QuestionSelector:
+    """Picks diverse question sets and filters near-duplicate questions.
+
+    Embeddings for every template question are computed once when the
+    selector is built. Per candidate only the LLM questions need embedding,
+    and selection is a handful of small matrix operations.
+    """
+
+    def __init__(self, template_bank=None, dim=None, diversity=None, duplicate_threshold=None):
+        """Initialize the selector.
+
+        Args:
+            template_bank (TemplateBank, optional): Templates to precompute. Defaults to the shared bank.
+            dim (int, optional): Embedding size. Defaults to Config.EMBEDDING_DIM.
+            diversity (float, optional): MMR weight of relevance versus novelty. Defaults to Config.DIVERSITY_LAMBDA.
+            duplicate_threshold (float, optional): Cosine similarity treated as a duplicate.
+                Defaults to Config.DUPLICATE_SIMILARITY.
+        """
+        template_bank = template_bank if template_bank else get_template_bank()
+        self.dim = dim if dim else Config.EMBEDDING_DIM
+        self.diversity = diversity if diversity is not None else Config.DIVERSITY_LAMBDA
+        self.duplicate_threshold = duplicate_threshold if duplicate_threshold is not None else Config.DUPLICATE_SIMILARITY
+
+        questions = []
+        for tech_questions in template_bank.templates.values():
+            questions.extend(question for question in tech_questions if question not in questions)
+        self._index = {question: row for row, question in enumerate(questions)}
+        self._vectors = embed_texts(questions, self.dim)
+
+    def embed(self, questions):
+        """Get embeddings for questions, reusing the precomputed template vectors.
+
+        Args:
+            questions (list): Questions to embed
+
+        Returns:
+            numpy.ndarray: One unit vector per question
+        """
+        rows = [self._index.get(question) for question in questions]
+        if all(row is not None for row in rows):
+            return self._vectors[rows]
+
+        vectors = np.empty((len(questions), self.dim), dtype=np.float32)
+        missing = [i for i, row in enumerate(rows) if row is None]
+        known = [i for i, row in enumerate(rows) if row is not None]
+        if known:
+            vectors[known] = self._vectors[[rows[i] for i in known]]
+        vectors[missing] = embed_texts([questions[i] for i in missing], self.dim)
+        return vectors
+
+    def is_near_duplicate(self, question, existing):
+        """Check whether a question repeats one of the existing questions.
+
+        Args:
+            question (str): The new question
+            existing (list): Questions already chosen
+
+        Returns:
+            bool: True if it is at least duplicate_threshold similar to any of them
+        """
+        if not existing:
+            return False
+        vectors = self.embed([question] + list(existing))
+        return bool((vectors[1:] @ vectors[0]).max() >= self.duplicate_threshold)
+
+    def dedupe(self, questions, existing=None):
+        """Drop questions that nearly duplicate an earlier one.
+
+        Args:
+            questions (list): Questions in order of preference
+            existing (list, optional): Questions already chosen, which are never dropped
+
+        Returns:
+            list: The questions that were kept, in their original order
+        """
+        existing = list(existing or [])
+        if not questions:
+            return []
+
+        vectors = self.embed(existing + list(questions))
+        similarity = vectors @ vectors.T
+        kept_rows = list(range(len(existing)))
+        kept = []
+        for offset, question in enumerate(questions):
+            row = len(existing) + offset
+            if kept_rows and similarity[row, kept_rows].max() >= self.duplicate_threshold:
+                continue
+            kept_rows.append(row)
+            kept.append(question)
+        return kept
+
+    def select(self, candidates, count, relevance=None, selected=None, rng=None):
+        """Choose a diverse subset of candidate questions with MMR.
+
+        Each step picks the candidate with the best trade-off between its
+        relevance and its similarity to the questions already chosen.
+        Near-duplicates of chosen questions are never picked.
+
+        Args:
+            candidates (list): Candidate questions
+            count (int): Number of questions to choose
+            relevance (list, optional): Relevance per candidate, higher is better. Defaults to equal relevance.
+            selected (list, optional): Questions already chosen, which new picks should differ from
+            rng (random.Random, optional): Random source that adds a little noise to
+                relevance, so candidates with the same stack see different sets
+
+        Returns:
+            list: Up to count chosen questions
+        """
+        selected = list(selected or [])
+        if count <= 0 or not candidates:
+            return []
+
+        vectors = self.embed(selected + list(candidates))
+        scores = np.asarray(relevance if relevance is not None else [1.0] * len(candidates), dtype=np.float32)
+        if rng is not None:
+            scores = scores + np.asarray([rng.random() * 0.1 for _ in candidates], dtype=np.float32)
+
+        candidate_vectors = vectors[len(selected):]
+        # Highest similarity of every candidate to anything chosen so far
+        if selected:
+            max_similarity = (candidate_vectors @ vectors[:len(selected)].T).max(axis=1)
+        else:
+            max_similarity = np.zeros(len(candidates), dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+        available &= max_similarity < self.duplicate_threshold
+
+        chosen = []
+        while len(chosen) < count and available.any():
+            mmr = self.diversity * scores - (1 - self.diversity) * max_similarity
+            mmr[~available] = -np.inf
+            best = int(mmr.argmax())
+            chosen.append(candidates[best])
+            available[best] = False
+
+            similarity = candidate_vectors @ candidate_vectors[best]
+            np.maximum(max_similarity, similarity, out=max_similarity)
+            available &= max_similarity < self.duplicate_threshold
+        return chosen
+
+_default_selector = None
+_default_selector_lock = threading.Lock()
+
+def get_question_selector():
+    """Get the shared question selector, embedding the templates on first use.
+
+    Returns:
+        QuestionSelector: The shared selector
+    """
+    global _default_selector
+    if _default_selector is None:
+        with _default_selector_lock:
+            if _default_selector is None:
+                _default_selector = QuestionSelector()
+    return _default_selector
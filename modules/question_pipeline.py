@@ -0,0 +1,178 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.metrics import timed, record, count_fallback
+from config.config import Config
+
+# Shared by every session in the process so a burst of candidates queues on a
+# bounded number of threads instead of spawning one per rerun.
+_executor = ThreadPoolExecutor(max_workers=Config.QUESTION_WORKERS, thread_name_prefix="question-gen")
+
+class QuestionJob:
+    """Tracks a question set being generated in the background.
+
+    Questions are published one at a time as the LLM stream produces them, so
+    the UI can show the first question long before the whole set is ready.
+    """
+
+    def __init__(self, question_count):
+        """Initialize the question job.
+
+        Args:
+            question_count (int): Number of questions expected from the job
+        """
+        self.question_count = question_count
+        self.future = None
+        self._questions = []
+        self._finished = False
+        self._listeners = []
+        self._condition = threading.Condition()
+
+    def add_questions(self, questions):
+        """Record questions produced by the worker.
+
+        Args:
+            questions (list): Newly generated questions
+        """
+        with self._condition:
+            self._questions.extend(questions)
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        self._notify(listeners)
+
+    def finish(self):
+        """Mark the job as finished and wake up any waiting readers."""
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        self._notify(listeners)
+
+    def add_listener(self, callback):
+        """Register a callback run (on the worker thread) whenever the job changes.
+
+        Args:
+            callback (callable): Function called with no arguments
+        """
+        with self._condition:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Unregister a callback added with add_listener.
+
+        Args:
+            callback (callable): The callback to remove
+        """
+        with self._condition:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    @staticmethod
+    def _notify(listeners):
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in question job listener: {e}")
+
+    def is_finished(self):
+        """Check whether the worker has published its last question.
+
+        Returns:
+            bool: True once no more questions will be added
+        """
+        with self._condition:
+            return self._finished
+
+    def questions(self):
+        """Get a snapshot of the questions generated so far.
+
+        Returns:
+            list: The generated questions
+        """
+        with self._condition:
+            return list(self._questions)
+
+    def has_first_question(self):
+        """Check whether at least one question is ready.
+
+        Returns:
+            bool: True if a question can be shown to the candidate
+        """
+        with self._condition:
+            return bool(self._questions)
+
+    def iter_questions(self, limit=None, timeout=None):
+        """Yield questions as the worker produces them.
+
+        Args:
+            limit (int, optional): Stop after this many questions
+            timeout (float, optional): Seconds to wait for each question
+
+        Yields:
+            str: Each question as soon as it is available
+        """
+        index = 0
+        while limit is None or index < limit:
+            with self._condition:
+                ready = self._condition.wait_for(
+                    lambda: len(self._questions) > index or self._finished,
+                    timeout=timeout
+                )
+                if not ready or len(self._questions) <= index:
+                    return
+                question = self._questions[index]
+            index += 1
+            yield question
+
+    def done(self):
+        """Check whether generation has finished.
+
+        Returns:
+            bool: True once the worker has completed
+        """
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        """Wait for generation to finish and return every question.
+
+        Args:
+            timeout (float, optional): Seconds to wait before raising TimeoutError
+
+        Returns:
+            list: The generated questions
+        """
+        self.future.result(timeout=timeout)
+        return self.questions()
+
+def _run_job(job, generator, tech_stack, experience_years):
+    start = time.perf_counter()
+    try:
+        with timed("stream_combined_questions"):
+            # Publish each question as soon as it is parsed from the stream
+            for question in generator.stream_combined_questions(tech_stack, experience_years):
+                if not job.has_first_question():
+                    record("first_question", time.perf_counter() - start)
+                job.add_questions([question])
+    except Exception as e:
+        print(f"Error in background question generation: {e}")
+        if not job.has_first_question():
+            count_fallback("stream_combined_questions", "error")
+            job.add_questions(generator.generate_combined_questions_from_templates(tech_stack, experience_years))
+    finally:
+        job.finish()
+
+def start_question_job(generator, tech_stack, experience_years):
+    """Start generating questions for a candidate in the background.
+
+    Args:
+        generator (TechQuestionGenerator): The generator to use
+        tech_stack (list): The candidate's tech stack
+        experience_years (str): Years of experience
+
+    Returns:
+        QuestionJob: The running job
+    """
+    job = QuestionJob(generator.determine_question_count(experience_years))
+    job.future = _executor.submit(_run_job, job, generator, list(tech_stack), experience_years)
+    return job
@@ -0,0 +1,605 @@
+import time
+import uuid
+import logging
+import asyncio
+from contextlib import aclosing
+from concurrent.futures import Future
+from datetime import datetime
+from modules.conversation import ConversationManager
+from modules.candidate_info import CandidateInfoCollector
+from modules.tech_questions import TechQuestionGenerator
+from modules.question_pipeline import start_question_job
+from modules.intent import Intent
+from config.config import Config
+from modules.transcript import Message
+from modules.answer_evaluator import AnswerEvaluator, get_grading_worker
+from modules.post_interview import get_post_interview_processor
+from utils.event_log import get_event_log
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Interview stages in order
+STAGES = [
+    "greeting", "collect_name", "collect_email", "collect_phone",
+    "collect_experience", "collect_position", "collect_location",
+    "collect_tech_stack", "generate_questions", "interview_complete"
+]
+
+# Fields that make up the serializable session state
+STATE_FIELDS = [
+    "session_id", "current_stage", "candidate_info", "tech_stack", "current_questions",
+    "question_count", "current_question_index", "answered_questions", "skipped_questions",
+    "questions_intro_shown", "session_start_time", "messages", "answers", "evaluation", "saved_as"
+]
+
+class ScreeningSession:
+    """Headless interview state machine for one candidate.
+
+    The session takes candidate messages in and returns assistant responses,
+    with no dependency on any UI framework. Its state is plain data
+    (see to_dict/from_dict), so Streamlit, a CLI or an HTTP server can all
+    drive it and persist it between requests.
+    """
+
+    def __init__(self, session_id=None, conversation_manager=None, candidate_collector=None, question_generator=None,
+                 event_log=None, grading_worker=None, post_interview_processor=None):
+        """Initialize the screening session.
+
+        Args:
+            session_id (str, optional): Identifier for the session. Defaults to a random UUID.
+            conversation_manager (ConversationManager, optional): Conversation helper
+            candidate_collector (CandidateInfoCollector, optional): Candidate info validator
+            question_generator (TechQuestionGenerator, optional): Question generator
+            event_log (EventLog, optional): Where messages are appended as they happen.
+                Defaults to the shared log, if enabled.
+            grading_worker (GradingWorker, optional): Grades the answers with the LLM once the
+                interview is complete. Defaults to the shared worker, if enabled.
+            post_interview_processor (PostInterviewProcessor, optional): Saves completed interviews
+                in the background. Defaults to the shared processor, if enabled.
+        """
+        self.session_id = session_id if session_id else uuid.uuid4().hex
+        self.candidate_collector = candidate_collector if candidate_collector else CandidateInfoCollector()
+        self.question_generator = question_generator if question_generator else TechQuestionGenerator()
+        self.event_log = event_log if event_log else get_event_log()
+        self.grading_worker = grading_worker if grading_worker else get_grading_worker()
+        self.post_interview_processor = post_interview_processor if post_interview_processor else get_post_interview_processor()
+        self.question_job = None
+        self.grading = None
+        self._reset_state()
+        # The manager reads the session transcript instead of keeping its own copy
+        self.conversation_manager = conversation_manager if conversation_manager else ConversationManager()
+        self.conversation_manager.share_history(self.messages)
+
+    def _reset_state(self):
+        self.current_stage = "greeting"
+        self.candidate_info = {}
+        self.tech_stack = []
+        self.current_questions = []
+        self.question_count = 0
+        self.current_question_index = 0
+        self.answered_questions = 0
+        self.skipped_questions = 0
+        self.questions_intro_shown = False
+        self.session_start_time = datetime.now()
+        self.messages = []
+        self.answers = []
+        self.evaluation = None
+        self.saved_as = None  # Timestamp of the candidate file once the interview is saved
+
+    def reset(self):
+        """Start the interview over, keeping the session id."""
+        self.question_job = None
+        self.grading = None
+        self._reset_state()
+        self.conversation_manager = ConversationManager()
+        self.conversation_manager.share_history(self.messages)
+        if self.event_log:
+            self.event_log.append(self.session_id, {"type": "reset", "time": time.time()})
+
+    @property
+    def interview_complete(self):
+        """True once the interview has finished."""
+        return self.current_stage == "interview_complete"
+
+    def add_message(self, role, content):
+        """Append a message to the transcript.
+
+        The display text is sanitized here, once, so renderers never have to
+        process the whole transcript again. The message is also appended to
+        the event log right away, so the transcript survives a crash.
+
+        Args:
+            role (str): "user" or "assistant"
+            content (str): The message text
+        """
+        self.messages.append(Message(role, content))
+        logger.debug("%s message: %r", role, content)
+        if self.event_log:
+            self.event_log.append(self.session_id, {"type": "message", "role": role, "content": content, "time": time.time()})
+
+    def _respond(self, content):
+        self.add_message("assistant", content)
+        return [content]
+
+    def start(self):
+        """Post the greeting if the conversation has not started yet.
+
+        Returns:
+            list: Assistant messages produced
+        """
+        if self.messages:
+            return []
+        return self._respond(self.conversation_manager.get_greeting())
+
+    def handle_input(self, user_input):
+        """Handle a candidate message and advance the interview.
+
+        Args:
+            user_input (str): The candidate's message
+
+        Returns:
+            list: Assistant messages produced, in order
+        """
+        # Timed per stage, under the stage the message arrived in
+        with timed("handle_input", self.current_stage):
+            return self._handle_input(user_input)
+
+    def _handle_input(self, user_input):
+        """Handle a candidate message; see handle_input."""
+        self.add_message("user", user_input)
+        stage = self.current_stage
+        manager = self.conversation_manager
+        collector = self.candidate_collector
+        intent = manager.classify_input(user_input)
+
+        if intent is Intent.END:
+            self.reset()
+            responses = self._respond("👋 Interview session terminated. Starting fresh...")
+            return responses + self._respond(self.conversation_manager.get_greeting())
+
+        if stage == "greeting":
+            # First, ask for the name
+            self.current_stage = "collect_name"
+            response = manager.get_name_prompt()
+
+        elif stage == "collect_name":
+            self.candidate_info["name"] = user_input.strip()
+            self.current_stage = "collect_email"
+            response = manager.get_email_prompt()
+
+        elif stage == "collect_email":
+            if collector.validate_email(user_input):
+                self.candidate_info["email"] = user_input.strip()
+                self.current_stage = "collect_phone"
+                response = manager.get_phone_prompt()
+            else:
+                response = "⚠️ Please provide a valid email address (e.g., john@example.com)"
+
+        elif stage == "collect_phone":
+            if collector.validate_phone(user_input):
+                self.candidate_info["phone"] = user_input.strip()
+                self.current_stage = "collect_experience"
+                response = manager.get_experience_prompt()
+            else:
+                response = "⚠️ Please provide a valid phone number (10-15 digits)"
+
+        elif stage == "collect_experience":
+            self.candidate_info["experience"] = user_input.strip()
+            self.current_stage = "collect_position"
+            response = manager.get_position_prompt()
+
+        elif stage == "collect_position":
+            self.candidate_info["position"] = user_input.strip()
+            self.current_stage = "collect_location"
+            response = manager.get_location_prompt()
+
+        elif stage == "collect_location":
+            self.candidate_info["location"] = user_input.strip()
+            self.current_stage = "collect_tech_stack"
+            response = manager.get_tech_stack_prompt()
+
+        elif stage == "collect_tech_stack":
+            self.tech_stack = collector.parse_tech_stack(user_input)
+            self.current_stage = "generate_questions"
+            # Generate questions in the background so this call returns immediately
+            self._start_question_job()
+            response = "⏳ Thanks! I'm preparing your technical questions based on your tech stack..."
+
+        elif stage == "generate_questions":
+            self._sync_questions()
+
+            if not self.current_questions and intent is not Intent.SUMMARY:
+                response = "⏳ Your technical questions are still being prepared. They will appear here in a moment."
+            elif intent is Intent.SUMMARY:
+                response = self._summary()
+            elif intent is Intent.NEXT:
+                response = "I can't generate more questions at this moment. You can provide your answers to the current questions or type 'done' to finish."
+            elif intent is Intent.SKIP:
+                if self.current_question_index < len(self.current_questions):
+                    self.skipped_questions += 1
+                    response = self._advance()
+                else:
+                    response = "All questions have been completed!"
+            elif intent is Intent.DONE:
+                # Handle early completion
+                response = self._complete()
+            elif not self.questions_intro_shown:
+                # Show first question if intro hasn't been shown
+                response = manager.format_single_question(self.current_questions[0], 0, len(self.current_questions))
+                self.questions_intro_shown = True
+            elif self.current_question_index < len(self.current_questions):
+                # Record the answer and move to next question
+                self.answered_questions += 1
+                self.answers.append({
+                    "question_index": self.current_question_index,
+                    "question": self.current_questions[self.current_question_index],
+                    "answer": user_input
+                })
+                response = self._advance()
+            else:
+                response = self._complete()
+
+        else:
+            response = manager.get_end_conversation_message()
+
+        return self._respond(response)
+
+    def _advance(self):
+        """Move to the next question, or complete the interview after the last one."""
+        if self.current_question_index + 1 >= len(self.current_questions):
+            return self._complete()
+
+        self.current_question_index += 1
+        return self.conversation_manager.format_single_question(
+            self.current_questions[self.current_question_index],
+            self.current_question_index,
+            len(self.current_questions)
+        )
+
+    def _complete(self):
+        self.current_stage = "interview_complete"
+        self._process_results()
+        return self.conversation_manager.format_question_completion(
+            len(self.current_questions),
+            self.answered_questions,
+            self.skipped_questions
+        )
+
+    def _process_results(self):
+        """Score the answers now and queue LLM grading and saving in the background.
+
+        The rubric scores are available immediately; the grading worker
+        replaces them with LLM grades, and the save job stores the result,
+        so the candidate never waits on either.
+        """
+        worker = self.grading_worker
+        evaluator = worker.evaluator if worker else AnswerEvaluator()
+        grades = evaluator.rubric_grades(self.answers, self.tech_stack)
+        pending = worker is not None and any(not evaluator.is_non_answer(answer["answer"]) for answer in self.answers)
+        self.evaluation = evaluator.summarize(grades, "pending" if pending else "complete")
+
+        self.saved_as = datetime.now().strftime("%Y%m%d_%H%M%S")
+        payload, key = self._save_request(self.saved_as)
+        # Wait for the LLM grades before saving, but save the rubric scores if they never arrive
+        self._queue_save(payload, key, delay=Config.GRADING_BATCH_WAIT + 2 * Config.LLM_TIMEOUT if pending else 0)
+        if pending:
+            grading = self.grading = Future()
+            worker.submit(list(self.answers), list(self.tech_stack), lambda graded: self._save_grades(grading, payload, key, graded))
+
+    def _save_grades(self, grading, payload, key, grades):
+        """Grading worker callback: save the interview again with its LLM grades.
+
+        Runs on the grading thread, so it leaves the session alone, which
+        may be a stale copy or restarted by now. Request handlers pick the
+        grades up with refresh_evaluation.
+        """
+        evaluation = AnswerEvaluator.summarize(grades, "complete")
+        grading.set_result(evaluation)
+        payload = {**payload, "evaluation": evaluation}
+        job_id = self._queue_save(payload, key, replace_pending=True)
+        # The first save has already started with the rubric scores, so save the grades separately
+        job = self.post_interview_processor.job_queue.get_job(job_id) if job_id else None
+        if job and job["status"] != "pending":
+            self._queue_save(payload, f"{key}:grades")
+
+    def _save_request(self, timestamp):
+        """Build the save job payload and idempotency key of the completed interview.
+
+        Returns:
+            tuple: (payload, idempotency key)
+        """
+        payload = {
+            "candidate_info": self.candidate_info,
+            "tech_stack": self.tech_stack,
+            "timestamp": timestamp,
+            "evaluation": self.evaluation
+        }
+        if self.event_log:
+            payload["session_id"] = self.session_id
+            payload["transcript_since"] = self.session_start_time.timestamp()
+        else:
+            payload["conversation_history"] = [message.to_dict() for message in self.messages]
+
+        # One save per interview, even if the session id is reused after a restart
+        return payload, f"{self.session_id}:{self.session_start_time.isoformat()}"
+
+    def _queue_save(self, payload, key, delay=0, replace_pending=False):
+        """Queue the completed interview to be saved by the post-interview processor.
+
+        Returns:
+            int or None: Id of the save job, or None if it could not be queued
+        """
+        processor = self.post_interview_processor
+        if processor is None:
+            return None
+        try:
+            return processor.enqueue_save(payload, key, delay, replace_pending)
+        except Exception as e:
+            print(f"Error queueing interview save: {e}")
+            return None
+
+    def refresh_evaluation(self):
+        """Take in LLM grades that arrived after the interview was completed.
+
+        The grades come from the grading job this object started or, for a
+        session restored from a store, from the saved candidate record.
+        Call it from the code that owns the session, e.g. under the API's
+        session lock, and save the session if it returns True.
+
+        Returns:
+            bool: True if the evaluation changed
+        """
+        if not self.evaluation or self.evaluation.get("status") != "pending":
+            return False
+        if self.grading is not None and self.grading.done():
+            evaluation = self.grading.result()
+        elif self.saved_as and self.post_interview_processor:
+            saved = self.post_interview_processor.data_handler.find_saved_candidate(self.candidate_info, self.saved_as)
+            evaluation = saved.get("evaluation") if saved else None
+        else:
+            evaluation = None
+        if not evaluation or evaluation.get("status") == "pending":
+            return False
+        self.evaluation = evaluation
+        self.grading = None
+        return True
+
+    def _summary(self):
+        profile_data = self.candidate_info.copy()
+        profile_data["tech_stack"] = ", ".join(self.tech_stack)
+
+        summary_text = "\n".join([f"**{k.title()}:** {v}" for k, v in profile_data.items()])
+        duration = datetime.now() - self.session_start_time
+        duration_str = f"{int(duration.total_seconds() / 60)} minutes"
+
+        return f"""
+            📊 **Your Complete Profile:**
+
+            {summary_text}
+
+            **Generated Questions:** {len(self.current_questions)}
+            **Session Duration:** {duration_str}
+
+            Would you like to download your profile or generate more questions?
+            """
+
+    def show_summary(self):
+        """Post the candidate's profile summary without changing the stage.
+
+        Returns:
+            list: Assistant messages produced
+        """
+        return self._respond(self._summary())
+
+    def _start_question_job(self):
+        self.question_job = start_question_job(
+            self.question_generator,
+            self.tech_stack,
+            self.candidate_info.get("experience", "1")
+        )
+        self.question_count = self.question_job.question_count
+        self.current_questions = []
+        self.questions_intro_shown = False
+
+    def _sync_questions(self):
+        """Wait for the background job and load the full question set."""
+        if self.question_job is not None and self.questions_intro_shown:
+            self.current_questions = self.question_job.result()
+
+    def is_generating_questions(self):
+        """Check whether the session is waiting for its first question.
+
+        Returns:
+            bool: True if questions are still being generated
+        """
+        return self.current_stage == "generate_questions" and not self.questions_intro_shown
+
+    def poll(self):
+        """Post the questions intro once the first question has been generated.
+
+        Returns:
+            list: Assistant messages produced (empty while still generating)
+        """
+        if not self.is_generating_questions():
+            return []
+
+        job = self.question_job
+        if job is None:
+            # Restored from storage while generation was pending; start again
+            self._start_question_job()
+            job = self.question_job
+
+        if not job.has_first_question():
+            if not job.is_finished():
+                return []
+            # The job finished without producing anything usable
+            job.add_questions(self.question_generator.generate_combined_questions_from_templates(
+                self.tech_stack,
+                self.candidate_info.get("experience", "1")
+            ))
+
+        manager = self.conversation_manager
+        self.current_questions = job.questions()
+        experience = self.candidate_info.get("experience", "1")
+
+        # Show questions introduction and first question; the rest are still streaming in
+        intro_response = manager.format_questions_intro(self.current_questions, experience, question_count=job.question_count)
+        first_question_response = manager.format_single_question(self.current_questions[0], 0, job.question_count)
+        self.questions_intro_shown = True
+        return self._respond(f"{intro_response}\n\n{first_question_response}")
+
+    def wait_for_questions(self, timeout=None):
+        """Block until the first question is ready, then post it.
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            list: Assistant messages produced
+        """
+        if self.is_generating_questions():
+            if self.question_job is None:
+                self._start_question_job()
+            list(self.question_job.iter_questions(limit=1, timeout=timeout))
+        return self.poll()
+
+    async def await_questions(self):
+        """Wait for the first question without blocking the event loop, then post it.
+
+        Returns:
+            list: Assistant messages produced
+        """
+        if not self.is_generating_questions():
+            return []
+        if self.question_job is None:
+            self._start_question_job()
+
+        async with aclosing(self.astream_questions()) as questions:
+            async for _ in questions:
+                break
+        # Posting the intro appends to the event log
+        return await asyncio.to_thread(self.poll)
+
+    async def astream_questions(self):
+        """Yield questions as the background job generates them, without blocking the event loop.
+
+        Yields:
+            tuple: (index, question) for each question, in order
+        """
+        job = self.question_job
+        if job is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        listener = lambda: loop.call_soon_threadsafe(changed.set)
+        job.add_listener(listener)
+        try:
+            sent = 0
+            while True:
+                # Check for completion before reading so no question is missed
+                finished = job.is_finished()
+                questions = job.questions()
+                while sent < len(questions):
+                    yield sent, questions[sent]
+                    sent += 1
+                if finished:
+                    break
+                await changed.wait()
+                changed.clear()
+        finally:
+            job.remove_listener(listener)
+
+    async def ahandle_input(self, user_input):
+        """Async variant of handle_input that never blocks the event loop.
+
+        handle_input appends to the event log and may queue the interview
+        save in SQLite, so it runs on a worker thread.
+
+        Args:
+            user_input (str): The candidate's message
+
+        Returns:
+            list: Assistant messages produced, in order
+        """
+        job = self.question_job
+        if job is not None and self.questions_intro_shown and not job.is_finished():
+            # The remaining questions are still streaming; wait without blocking
+            await asyncio.wrap_future(job.future)
+        return await asyncio.to_thread(self.handle_input, user_input)
+
+    def export_profile(self):
+        """Build the exportable candidate profile.
+
+        Returns:
+            dict: Candidate info, tech stack, questions, answers with their grades and session timing
+        """
+        return {
+            "candidate_info": self.candidate_info,
+            "tech_stack": self.tech_stack,
+            "questions": self.current_questions,
+            "answers": self.answers,
+            "evaluation": self.evaluation,
+            "session_date": datetime.now().isoformat(),
+            "duration": str(datetime.now() - self.session_start_time)
+        }
+
+    def on_questions_finished(self, callback):
+        """Run a callback once the remaining questions have been generated.
+
+        While questions are still streaming in after the first was shown,
+        to_dict only includes the questions generated so far, so stores use
+        this to save the session again with the full set.
+
+        Args:
+            callback (callable): Called with no arguments, on the worker thread
+
+        Returns:
+            bool: True if the callback was registered, False if no questions are pending
+        """
+        job = self.question_job
+        if job is None or not self.questions_intro_shown or job.is_finished():
+            return False
+        job.future.add_done_callback(lambda _: callback())
+        return True
+
+    def to_dict(self):
+        """Serialize the session state.
+
+        The background question job is not serialized; a session restored
+        while questions were being generated starts a new job on its next poll.
+        Once the first question has been shown, only the questions generated
+        so far are included until the job finishes (see on_questions_finished).
+
+        Returns:
+            dict: JSON-serializable session state
+        """
+        if self.question_job is not None and self.questions_intro_shown:
+            self.current_questions = self.question_job.questions()
+
+        data = {field: getattr(self, field) for field in STATE_FIELDS}
+        data["session_start_time"] = self.session_start_time.isoformat()
+        data["messages"] = [message.to_dict() for message in self.messages]
+        return data
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        """Restore a session from to_dict output.
+
+        Args:
+            data (dict): Serialized session state
+            **kwargs: Collaborators passed through to the constructor
+
+        Returns:
+            ScreeningSession: The restored session
+        """
+        session = cls(session_id=data.get("session_id"), **kwargs)
+        for field in STATE_FIELDS:
+            if field in data and field not in ("session_start_time", "messages"):
+                setattr(session, field, data[field])
+        if data.get("session_start_time"):
+            session.session_start_time = datetime.fromisoformat(data["session_start_time"])
+        # Filled in place, since the conversation manager shares the list
+        session.messages.extend(Message.from_dict(message) for message in data.get("messages", []))
+        return session
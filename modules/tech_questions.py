@@ -1,134 +1,83 @@
-from utils.llm_utils import get_llm_response
+import random
+import threading
+from utils.llm_utils import get_llm_response, iter_json_array_strings, extract_json_array
+from utils.question_cache import QuestionCache
+from utils.question_bank import get_question_bank, experience_band
+from modules.template_bank import get_template_bank
+from modules.tech_taxonomy import get_tech_taxonomy
+from modules.question_diversity import get_question_selector
+from utils.metrics import timed, count_fallback
 from config.config import Config
 
+# Limits the daemon threads generating the missing variants of cached keys. They
+# are best-effort, so unlike executor workers they never hold up process exit.
+_refill_slots = threading.BoundedSemaphore(Config.QUESTION_CACHE_REFILL_WORKERS)
+
+# Prompt template for combined question generation. Its hash is part of the
+# question cache key, so editing it invalidates previously cached sets.
+COMBINED_QUESTIONS_PROMPT = """
+        You are a technical interviewer for a tech recruitment agency. Generate {question_count} technical interview questions 
+        that cover the following technologies: {technologies}.
+        
+        The questions should:
+        1. Be challenging but appropriate for a candidate with {experience_years} years of experience
+        2. Test both theoretical knowledge and practical application
+        3. Reveal the depth of the candidate's understanding
+        4. Cover multiple technologies in a single question when possible
+        5. Be clear and concise
+        6. Focus on real-world scenarios and problem-solving
+        
+        Format your response as a JSON array of questions.
+        Example format:
+        ["Question 1", "Question 2", "Question 3"]
+        
+        Make sure the questions are comprehensive and test the candidate's ability to work with the combined tech stack.
+        """
+
+# Template questions considered per technology when picking a diverse set
+TEMPLATE_CANDIDATES_PER_TECH = 5
+
 class TechQuestionGenerator:
     """Generates technical questions based on the candidate's tech stack."""
     
-    def __init__(self):
-        """Initialize the tech question generator."""
-        # Dictionary of common technologies and sample questions
-        # This serves as a fallback if the LLM is not available
-        self.question_templates = {
-            "python": [
-                "What are Python decorators and how do you use them?",
-                "Explain the difference between lists and tuples in Python.",
-                "How does memory management work in Python?",
-                "What is the Global Interpreter Lock (GIL) and how does it affect multithreaded Python programs?",
-                "Explain the concept of list comprehensions and provide an example."
-            ],
-            "javascript": [
-                "Explain the concept of closures in JavaScript.",
-                "What is the difference between '==' and '===' operators?",
-                "How does prototypal inheritance work in JavaScript?",
-                "Explain the event loop in JavaScript.",
-                "What are Promises and how do they differ from callbacks?"
-            ],
-            "java": [
-                "What is the difference between an interface and an abstract class in Java?",
-                "Explain the concept of Java's Garbage Collection.",
-                "What are the key features introduced in Java 8?",
-                "How does multithreading work in Java?",
-                "Explain the principles of SOLID in Java programming."
-            ],
-            "react": [
-                "What is the virtual DOM and how does React use it?",
-                "Explain the component lifecycle in React.",
-                "What are hooks in React and how do you use them?",
-                "How do you manage state in a React application?",
-                "Explain the concept of props and state in React components."
-            ],
-            "angular": [
-                "What is dependency injection in Angular?",
-                "Explain the difference between components and directives in Angular.",
-                "How does change detection work in Angular?",
-                "What are Angular modules and how do they help organize code?",
-                "Explain the concept of services in Angular."
-            ],
-            "vue": [
-                "What is the Vue instance lifecycle?",
-                "Explain the difference between computed properties and methods in Vue.",
-                "How does Vue's reactivity system work?",
-                "What are Vue directives and how do you create custom directives?",
-                "Explain the concept of mixins in Vue."
-            ],
-            "node.js": [
-                "How does the event loop work in Node.js?",
-                "What is the purpose of middleware in Express.js?",
-                "Explain the difference between process.nextTick() and setImmediate().",
-                "How do you handle asynchronous operations in Node.js?",
-                "What are streams in Node.js and how are they used?"
-            ],
-            "django": [
-                "Explain Django's MTV (Model-Template-View) architecture.",
-                "How do you create a custom middleware in Django?",
-                "What are Django signals and how are they used?",
-                "Explain Django's ORM and how it interacts with databases.",
-                "How do you handle authentication and authorization in Django?"
-            ],
-            "flask": [
-                "What is the application factory pattern in Flask?",
-                "How do you handle database operations in Flask?",
-                "Explain Flask's context globals (g, request, session).",
-                "How do you implement authentication in a Flask application?",
-                "What are Flask extensions and how do you use them?"
-            ],
-            "sql": [
-                "Explain the difference between INNER JOIN and LEFT JOIN.",
-                "What are database transactions and how do they ensure data integrity?",
-                "How do you optimize a slow SQL query?",
-                "Explain normalization and denormalization in database design.",
-                "What are indexes and how do they improve query performance?"
-            ],
-            "mongodb": [
-                "What is sharding in MongoDB and how does it work?",
-                "Explain the concept of document embedding vs. referencing in MongoDB.",
-                "How do you ensure data consistency in a MongoDB database?",
-                "What are MongoDB aggregation pipelines?",
-                "Explain the concept of indexing in MongoDB."
-            ],
-            "docker": [
-                "What is the difference between a Docker image and a container?",
-                "How do you persist data in Docker containers?",
-                "Explain Docker networking and how containers communicate.",
-                "What is Docker Compose and how is it used?",
-                "How do you optimize Docker images for production?"
-            ],
-            "kubernetes": [
-                "What are Kubernetes pods and how do they work?",
-                "Explain the difference between a Deployment and a StatefulSet in Kubernetes.",
-                "How does service discovery work in Kubernetes?",
-                "What are Kubernetes operators and when would you use them?",
-                "Explain Kubernetes resource limits and requests."
-            ],
-            "aws": [
-                "What is the difference between EC2 and Lambda?",
-                "How do you design a highly available architecture in AWS?",
-                "Explain AWS IAM and best practices for security.",
-                "What are the different storage options in AWS and when would you use each?",
-                "How do you implement auto-scaling in AWS?"
-            ],
-            "devops": [
-                "Explain the concept of Infrastructure as Code.",
-                "What is CI/CD and how does it improve the development process?",
-                "How do you monitor applications in production?",
-                "What strategies do you use for database migrations in a CI/CD pipeline?",
-                "Explain the concept of blue-green deployment."
-            ],
-            "machine learning": [
-                "What is the difference between supervised and unsupervised learning?",
-                "Explain overfitting and how to prevent it.",
-                "What evaluation metrics do you use for classification problems?",
-                "How do you handle imbalanced datasets?",
-                "Explain the concept of feature engineering and why it's important."
-            ],
-            "data science": [
-                "What is the difference between correlation and causation?",
-                "How do you handle missing data in a dataset?",
-                "Explain the concept of dimensionality reduction and when you would use it.",
-                "What statistical tests do you use to validate hypotheses?",
-                "How do you communicate data insights to non-technical stakeholders?"
-            ]
-        }
+    def __init__(self, question_cache=None, question_bank=None):
+        """Initialize the tech question generator.
+        
+        Args:
+            question_cache (QuestionCache, optional): Cache for LLM-generated question sets
+            question_bank (QuestionBank, optional): Pre-generated question sets, checked first
+        """
+        self.question_cache = question_cache if question_cache else QuestionCache()
+        self._question_bank = question_bank
+    
+    # The shared banks and the template embeddings are built on first access,
+    # so creating a generator at startup costs nothing
+    
+    @property
+    def question_bank(self):
+        """Pre-generated question sets, checked before the cache and the LLM."""
+        if self._question_bank is None:
+            self._question_bank = get_question_bank()
+        return self._question_bank
+    
+    @property
+    def template_bank(self):
+        """Shared, read-only question templates used when the LLM is not available."""
+        return get_template_bank()
+    
+    @property
+    def taxonomy(self):
+        """Shared tech taxonomy; its technology IDs key the question cache and bank."""
+        return get_tech_taxonomy()
+    
+    @property
+    def question_templates(self):
+        return self.template_bank.templates
+    
+    @property
+    def question_selector(self):
+        """Embeddings of the templates, used to pick diverse sets and drop near-duplicates."""
+        return get_question_selector()
     
     def normalize_tech_name(self, tech):
         """Normalize technology names for matching with templates.
@@ -139,30 +88,7 @@ class TechQuestionGenerator:
         Returns:
             str: The normalized technology name
         """
-        tech_lower = tech.lower()
-        
-        # Map common variations to standard names
-        tech_mapping = {
-            "js": "javascript",
-            "py": "python",
-            "react.js": "react",
-            "reactjs": "react",
-            "vue.js": "vue",
-            "vuejs": "vue",
-            "angular.js": "angular",
-            "angularjs": "angular",
-            "node": "node.js",
-            "nodejs": "node.js",
-            "postgres": "postgresql",
-            "postgres sql": "postgresql",
-            "mongo": "mongodb",
-            "k8s": "kubernetes",
-            "ml": "machine learning",
-            "ai": "machine learning",
-            "artificial intelligence": "machine learning"
-        }
-        
-        return tech_mapping.get(tech_lower, tech_lower)
+        return self.template_bank.normalize(tech)
     
     def get_questions_from_template(self, tech, num_questions=3):
         """Get questions for a technology from the templates.
@@ -174,11 +100,10 @@ class TechQuestionGenerator:
         Returns:
             list: A list of questions for the technology
         """
-        normalized_tech = self.normalize_tech_name(tech)
+        questions = self.template_bank.get_questions(tech)
         
-        if normalized_tech in self.question_templates:
-            questions = self.question_templates[normalized_tech]
-            return questions[:min(num_questions, len(questions))]
+        if questions:
+            return list(questions[:min(num_questions, len(questions))])
         else:
             # If we don't have templates for this technology, return generic questions
             return [
@@ -211,58 +136,226 @@ class TechQuestionGenerator:
         except:
             return 3  # Default to 3 questions
     
-    def generate_combined_questions_with_llm(self, tech_stack, experience_years):
-        """Generate combined questions across all tech stacks using the LLM.
+    def get_cache_key(self, tech_stack, question_count):
+        """Build the question cache key for a tech stack.
+        
+        Args:
+            tech_stack (list): List of technologies
+            question_count (int): Number of questions in the set
+            
+        Returns:
+            str: The cache key
+        """
+        return QuestionCache.make_key(self.get_tech_ids(tech_stack), question_count, Config.DEFAULT_MODEL, COMBINED_QUESTIONS_PROMPT)
+    
+    def normalize_stack(self, tech_stack):
+        """Normalize every technology in a tech stack.
+        
+        Args:
+            tech_stack (list): List of technologies
+            
+        Returns:
+            list: Normalized technology names
+        """
+        return [self.normalize_tech_name(tech.strip()) for tech in tech_stack if tech.strip()]
+    
+    def get_tech_ids(self, tech_stack):
+        """Get the taxonomy IDs of every technology in a tech stack.
+        
+        Args:
+            tech_stack (list): List of technologies
+            
+        Returns:
+            list: Unique technology IDs
+        """
+        return self.taxonomy.tech_ids(tech_stack)
+    
+    def get_bank_key(self, tech_stack, experience_years, question_count):
+        """Build the question bank key for a tech stack and experience level.
         
         Args:
             tech_stack (list): List of technologies
             experience_years (str): Years of experience
+            question_count (int): Number of questions in the set
             
         Returns:
-            list: A list of combined questions
+            str: The bank key
         """
-        question_count = self.determine_question_count(experience_years)
+        return self.question_bank.make_key(
+            self.get_tech_ids(tech_stack),
+            experience_band(experience_years),
+            question_count,
+            Config.DEFAULT_MODEL,
+            COMBINED_QUESTIONS_PROMPT
+        )
+    
+    def build_combined_prompt(self, tech_stack, experience_years, question_count):
+        """Build the LLM prompt for a combined question set.
         
-        # Create a prompt for the LLM
-        prompt = f"""
-        You are a technical interviewer for a tech recruitment agency. Generate {question_count} technical interview questions 
-        that cover the following technologies: {', '.join(tech_stack)}.
+        Args:
+            tech_stack (list): List of technologies
+            experience_years (str): Years of experience
+            question_count (int): Number of questions to generate
+            
+        Returns:
+            str: The prompt
+        """
+        return COMBINED_QUESTIONS_PROMPT.format(
+            question_count=question_count,
+            technologies=', '.join(tech_stack),
+            experience_years=experience_years
+        )
+    
+    def get_stored_questions(self, tech_stack, experience_years, question_count):
+        """Get a question set from the pre-generated bank, or else from the cache.
         
-        The questions should:
-        1. Be challenging but appropriate for a candidate with {experience_years} years of experience
-        2. Test both theoretical knowledge and practical application
-        3. Reveal the depth of the candidate's understanding
-        4. Cover multiple technologies in a single question when possible
-        5. Be clear and concise
-        6. Focus on real-world scenarios and problem-solving
+        Args:
+            tech_stack (list): List of technologies
+            experience_years (str): Years of experience
+            question_count (int): Number of questions in the set
+            
+        Returns:
+            list or None: A stored question set, or None on a miss
+        """
+        questions = self.question_bank.get(self.get_bank_key(tech_stack, experience_years, question_count))
+        if questions:
+            return questions
+        cache_key = self.get_cache_key(tech_stack, question_count)
+        questions = self.question_cache.get(cache_key)
+        if questions and _refill_slots.acquire(blocking=False):
+            # Serve the stored set now and generate the key's other variants in the background
+            if self.question_cache.claim_refill(cache_key):
+                threading.Thread(
+                    target=self._refill_cache,
+                    args=(cache_key, list(tech_stack), experience_years, question_count),
+                    name="question-cache-refill",
+                    daemon=True
+                ).start()
+            else:
+                _refill_slots.release()
+        return questions
+    
+    def _refill_cache(self, cache_key, tech_stack, experience_years, question_count):
+        """Generate one more question set for a cache key that has fewer sets than its variants."""
+        try:
+            questions = self.request_llm_questions(tech_stack, experience_years, question_count)
+            if questions and len(questions) >= question_count:
+                self.question_cache.put(cache_key, questions[:question_count])
+        except Exception as e:
+            print(f"Error refilling question cache: {e}")
+        finally:
+            self.question_cache.release_refill(cache_key)
+            _refill_slots.release()
+    
+    def request_llm_questions(self, tech_stack, experience_years, question_count):
+        """Ask the LLM for a question set, without checking the bank or the cache.
         
-        Format your response as a JSON array of questions.
-        Example format:
-        ["Question 1", "Question 2", "Question 3"]
+        Args:
+            tech_stack (list): List of technologies
+            experience_years (str): Years of experience
+            question_count (int): Number of questions to ask for
+            
+        Returns:
+            list or None: Distinct questions (possibly fewer than asked for), or None
+                if the response was not a list
+        """
+        prompt = self.build_combined_prompt(tech_stack, experience_years, question_count)
+        # JSON mode wraps the requested array in an object
+        response = extract_json_array(get_llm_response(prompt, response_format="json"))
+        if response is None:
+            return None
+        # Drop questions that repeat an earlier one in different words
+        return self.question_selector.dedupe([q.strip() for q in response if isinstance(q, str) and q.strip()])
+    
+    def generate_combined_questions_with_llm(self, tech_stack, experience_years):
+        """Generate combined questions across all tech stacks using the LLM.
         
-        Make sure the questions are comprehensive and test the candidate's ability to work with the combined tech stack.
+        Args:
+            tech_stack (list): List of technologies
+            experience_years (str): Years of experience
+            
+        Returns:
+            list: A list of combined questions
         """
+        question_count = self.determine_question_count(experience_years)
+        
+        # Serve a pre-generated or cached set before calling the LLM
+        stored_questions = self.get_stored_questions(tech_stack, experience_years, question_count)
+        if stored_questions:
+            return stored_questions
+        cache_key = self.get_cache_key(tech_stack, question_count)
         
         try:
             # Try to get a response from the LLM
-            response = get_llm_response(prompt, response_format="json")
+            response = self.request_llm_questions(tech_stack, experience_years, question_count)
             
             # Parse the response as a list
-            if isinstance(response, list):
+            if response is not None:
                 # Ensure we have the right number of questions
                 if len(response) >= question_count:
-                    return response[:question_count]
+                    questions = response[:question_count]
+                    self.question_cache.put(cache_key, questions)
+                    return questions
                 else:
                     # If LLM returned fewer questions, pad with template questions
+                    count_fallback("generate_combined_questions", "padded")
                     return self._pad_questions_with_templates(response, tech_stack, question_count)
             else:
                 # Fallback to templates if response is not a list
+                count_fallback("generate_combined_questions", "invalid_response")
                 return self.generate_combined_questions_from_templates(tech_stack, experience_years)
         except Exception as e:
             # If there's an error with the LLM, fall back to templates
             print(f"Error generating questions with LLM: {e}")
+            count_fallback("generate_combined_questions", "error")
             return self.generate_combined_questions_from_templates(tech_stack, experience_years)
     
+    def stream_combined_questions_with_llm(self, tech_stack, experience_years):
+        """Stream combined questions from the LLM as each one is completed.
+        
+        Args:
+            tech_stack (list): List of technologies
+            experience_years (str): Years of experience
+            
+        Yields:
+            str: Each question as soon as it has been fully generated
+        """
+        question_count = self.determine_question_count(experience_years)
+        
+        stored_questions = self.get_stored_questions(tech_stack, experience_years, question_count)
+        if stored_questions:
+            yield from stored_questions
+            return
+        
+        cache_key = self.get_cache_key(tech_stack, question_count)
+        prompt = self.build_combined_prompt(tech_stack, experience_years, question_count)
+        
+        questions = []
+        for question in iter_json_array_strings(get_llm_response(prompt, stream=True)):
+            question = question.strip()
+            if question and question not in questions and not self.question_selector.is_near_duplicate(question, questions):
+                questions.append(question)
+                yield question
+            if len(questions) >= question_count:
+                break
+        
+        if len(questions) >= question_count:
+            self.question_cache.put(cache_key, questions)
+            return
+        
+        # Pad with template questions if the LLM returned too few (or none)
+        if questions:
+            count_fallback("stream_combined_questions", "padded")
+            padded_questions = self._pad_questions_with_templates(questions, tech_stack, question_count)
+        else:
+            count_fallback("stream_combined_questions", "invalid_response")
+            padded_questions = self.generate_combined_questions_from_templates(tech_stack, experience_years)
+        
+        for question in padded_questions:
+            if question not in questions:
+                questions.append(question)
+                yield question
+    
     def _pad_questions_with_templates(self, llm_questions, tech_stack, target_count):
         """Pad LLM questions with template questions to reach target count.
         
@@ -276,21 +369,35 @@ class TechQuestionGenerator:
         """
         padded_questions = llm_questions.copy()
         
-        # Get template questions for each tech
-        all_template_questions = []
-        for tech in tech_stack:
-            tech_questions = self.get_questions_from_template(tech, 2)
-            all_template_questions.extend(tech_questions)
-        
-        # Add template questions until we reach target count
-        for question in all_template_questions:
-            if len(padded_questions) >= target_count:
-                break
-            if question not in padded_questions:
-                padded_questions.append(question)
+        # Add the template questions that differ most from what we already have
+        candidates, relevance = self._template_candidates(tech_stack)
+        padded_questions.extend(self.question_selector.select(
+            candidates,
+            target_count - len(padded_questions),
+            relevance=relevance,
+            selected=padded_questions
+        ))
         
         return padded_questions[:target_count]
     
+    def _template_candidates(self, tech_stack):
+        """Collect template questions for every technology in the stack.
+        
+        Args:
+            tech_stack (list): List of technologies
+            
+        Returns:
+            tuple: (questions, relevance) where earlier templates of each technology rank higher
+        """
+        candidates = []
+        relevance = []
+        for tech in tech_stack:
+            for rank, question in enumerate(self.get_questions_from_template(tech, TEMPLATE_CANDIDATES_PER_TECH)):
+                if question not in candidates:
+                    candidates.append(question)
+                    relevance.append(1.0 - 0.1 * rank)
+        return candidates, relevance
+    
     def generate_combined_questions_from_templates(self, tech_stack, experience_years):
         """Generate combined questions from templates across all tech stacks.
         
@@ -302,16 +409,11 @@ class TechQuestionGenerator:
             list: A list of combined questions
         """
         question_count = self.determine_question_count(experience_years)
-        all_questions = []
-        
-        # Collect questions from all tech stacks
-        for tech in tech_stack:
-            tech_questions = self.get_questions_from_template(tech, 2)
-            all_questions.extend(tech_questions)
         
-        # Shuffle and select the required number of questions
-        import random
-        random.shuffle(all_questions)
+        # Pick a diverse set across all tech stacks, with a little randomness
+        # so candidates with the same stack get different questions
+        candidates, relevance = self._template_candidates(tech_stack)
+        all_questions = self.question_selector.select(candidates, question_count, relevance=relevance, rng=random)
         
         # Ensure we have enough questions
         if len(all_questions) < question_count:
@@ -323,10 +425,16 @@ class TechQuestionGenerator:
                 "What's your approach to code review and quality assurance?",
                 "How do you stay updated with the latest technology trends?"
             ]
-            all_questions.extend(generic_questions)
+            all_questions.extend(self.question_selector.select(
+                generic_questions,
+                question_count - len(all_questions),
+                selected=all_questions,
+                rng=random
+            ))
         
         return all_questions[:question_count]
     
+    @timed("generate_combined_questions")
     def generate_combined_questions(self, tech_stack, experience_years):
         """Generate combined technical questions across all tech stacks.
         
@@ -343,8 +451,36 @@ class TechQuestionGenerator:
         except Exception as e:
             # If there's an error, fall back to template-based questions
             print(f"Error generating questions with LLM: {e}")
+            count_fallback("generate_combined_questions", "error")
             return self.generate_combined_questions_from_templates(tech_stack, experience_years)
     
+    def stream_combined_questions(self, tech_stack, experience_years):
+        """Stream combined technical questions across all tech stacks.
+        
+        Args:
+            tech_stack (list): The candidate's tech stack
+            experience_years (str): Years of experience
+            
+        Yields:
+            str: Each question as soon as it is available (3-4 total)
+        """
+        yielded = []
+        try:
+            for question in self.stream_combined_questions_with_llm(tech_stack, experience_years):
+                yielded.append(question)
+                yield question
+        except Exception as e:
+            # If there's an error, fill the remaining slots from the templates
+            print(f"Error streaming questions with LLM: {e}")
+            count_fallback("stream_combined_questions", "error")
+            question_count = self.determine_question_count(experience_years)
+            for question in self.generate_combined_questions_from_templates(tech_stack, experience_years):
+                if len(yielded) >= question_count:
+                    break
+                if question not in yielded:
+                    yielded.append(question)
+                    yield question
+    
     def get_next_question(self, questions, current_index):
         """Get the next question from the list.
         
@@ -0,0 +1,374 @@
+import re
+import zlib
+import threading
+from functools import lru_cache
+from collections import namedtuple
+
+Tech = namedtuple("Tech", ["id", "name", "label", "category", "aliases"])
+
+# Known technologies: (id, canonical name, display label, category, aliases).
+# IDs are part of the question cache and question bank keys, so an ID must
+# never be renumbered or reused; add new technologies with new IDs.
+TECHNOLOGIES = tuple(Tech(*row) for row in (
+    # Languages
+    (1, "python", "Python", "language", ("py", "cpython")),
+    (2, "javascript", "JavaScript", "language", ("js", "ecmascript", "es6", "es2015", "vanilla js")),
+    (3, "typescript", "TypeScript", "language", ("ts",)),
+    (4, "java", "Java", "language", ("jdk", "java ee", "j2ee", "jakarta ee")),
+    (5, "c", "C", "language", ()),
+    (6, "c++", "C++", "language", ("cpp", "cplusplus")),
+    (7, "c#", "C#", "language", ("csharp", "c sharp")),
+    (8, "go", "Go", "language", ("golang",)),
+    (9, "rust", "Rust", "language", ()),
+    (10, "ruby", "Ruby", "language", ()),
+    (11, "php", "PHP", "language", ()),
+    (12, "kotlin", "Kotlin", "language", ()),
+    (13, "swift", "Swift", "language", ()),
+    (14, "scala", "Scala", "language", ()),
+    (15, "r", "R", "language", ()),
+    (16, "html", "HTML", "markup", ("html5",)),
+    (17, "css", "CSS", "markup", ("css3", "scss", "sass")),
+    # Frontend
+    (100, "react", "React", "frontend", ("react.js", "reactjs", "react js")),
+    (101, "angular", "Angular", "frontend", ("angular.js", "angularjs")),
+    (102, "vue", "Vue", "frontend", ("vue.js", "vuejs")),
+    (103, "redux", "Redux", "frontend", ()),
+    (104, "next.js", "Next.js", "frontend", ("nextjs",)),
+    (105, "svelte", "Svelte", "frontend", ()),
+    (106, "jquery", "jQuery", "frontend", ()),
+    # Backend
+    (200, "node.js", "Node.js", "backend", ("node", "nodejs")),
+    (201, "express", "Express", "backend", ("expressjs", "express.js")),
+    (202, "django", "Django", "backend", ("django rest framework", "drf")),
+    (203, "flask", "Flask", "backend", ()),
+    (204, "fastapi", "FastAPI", "backend", ()),
+    (205, "spring", "Spring", "backend", ("spring framework",)),
+    (206, "spring boot", "Spring Boot", "backend", ("springboot",)),
+    (207, "ruby on rails", "Ruby on Rails", "backend", ("rails", "ror")),
+    (208, "laravel", "Laravel", "backend", ()),
+    (209, ".net", ".NET", "backend", ("dotnet", ".net core", "asp.net", "asp.net core")),
+    (210, "graphql", "GraphQL", "backend", ()),
+    (211, "mongoose", "Mongoose", "backend", ("mongoosejs", "mongoose.js")),
+    # Databases
+    (300, "sql", "SQL", "database", ()),
+    (301, "postgresql", "PostgreSQL", "database", ("postgres", "postgres sql", "postgre sql", "psql")),
+    (302, "mysql", "MySQL", "database", ()),
+    (303, "sqlite", "SQLite", "database", ()),
+    (304, "mariadb", "MariaDB", "database", ()),
+    (305, "mongodb", "MongoDB", "database", ("mongo",)),
+    (306, "redis", "Redis", "database", ()),
+    (307, "elasticsearch", "Elasticsearch", "database", ("elastic search",)),
+    (308, "cassandra", "Cassandra", "database", ()),
+    (309, "dynamodb", "DynamoDB", "database", ()),
+    (310, "oracle", "Oracle", "database", ("oracle db",)),
+    (311, "sql server", "SQL Server", "database", ("mssql", "ms sql", "microsoft sql server")),
+    (312, "pl/sql", "PL/SQL", "database", ("plsql",)),
+    # Cloud
+    (400, "aws", "AWS", "cloud", ("amazon web services",)),
+    (401, "azure", "Azure", "cloud", ("microsoft azure",)),
+    (402, "gcp", "GCP", "cloud", ("google cloud", "google cloud platform")),
+    (403, "ec2", "EC2", "cloud", ("amazon ec2", "aws ec2")),
+    (404, "s3", "S3", "cloud", ("amazon s3", "aws s3")),
+    (405, "aws lambda", "AWS Lambda", "cloud", ("amazon lambda",)),
+    # DevOps
+    (500, "devops", "DevOps", "devops", ()),
+    (501, "docker", "Docker", "devops", ()),
+    (502, "kubernetes", "Kubernetes", "devops", ("k8s",)),
+    (503, "terraform", "Terraform", "devops", ()),
+    (504, "ansible", "Ansible", "devops", ()),
+    (505, "jenkins", "Jenkins", "devops", ()),
+    (506, "ci/cd", "CI/CD", "devops", ("cicd", "continuous integration")),
+    (507, "git", "Git", "devops", ("github", "gitlab")),
+    (508, "linux", "Linux", "devops", ()),
+    # Data
+    (600, "machine learning", "Machine Learning", "data", ("ml", "ai", "artificial intelligence")),
+    (601, "data science", "Data Science", "data", ()),
+    (602, "deep learning", "Deep Learning", "data", ("dl",)),
+    (603, "pandas", "pandas", "data", ()),
+    (604, "numpy", "NumPy", "data", ()),
+    (605, "tensorflow", "TensorFlow", "data", ()),
+    (606, "pytorch", "PyTorch", "data", ("torch",)),
+    (607, "scikit-learn", "scikit-learn", "data", ("sklearn", "scikit learn")),
+    (608, "spark", "Spark", "data", ("apache spark", "pyspark")),
+    (609, "a/b testing", "A/B Testing", "data", ("a/b tests", "ab testing", "split testing"))
+))
+
+# Technologies that are not in the table get IDs from this offset up, derived
+# from a checksum of their normalized name so they are the same in every process
+UNKNOWN_ID_BASE = 1 << 32
+
+# Unknown technology labels kept for display
+MAX_UNKNOWN_LABELS = 65536
+
+# Separators between technologies: , ; / & | ( ) [ ], the word "and", and a
+# "+" that is not part of a name such as C++
+_SPLIT_PATTERN = re.compile(r"(\s*(?:[,;/&|()\[\]]|(?<!\+)\+(?!\+)|\band\b)\s*)", re.IGNORECASE)
+# Characters the split pattern treats as separators, to find names containing one (CI/CD, PL/SQL)
+_SEPARATOR_CHARS = set(",;/&|()[]+")
+# Trailing version numbers such as "18", "3.11" or "v2"
+_VERSION_PATTERN = re.compile(r"[\s\-_]*v?\d+(?:\.\d+)*[a-z]?$")
+_SEPARATOR_PATTERN = re.compile(r"[\s.\-_]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# Punctuation left around a token, e.g. the full stop in "Python, Django."
+_TOKEN_PUNCTUATION = " \t\r\n.:-*'\"`"
+
+# Minimum trigram similarity for a fuzzy match to be accepted. Typos of known
+# names ("kubernets", "typscript") score above 0.6; related but different
+# technologies ("mongoose" vs "mongo", "sveltekit" vs "svelte") score lower.
+FUZZY_THRESHOLD = 0.6
+
+def _compact(name):
+    return _SEPARATOR_PATTERN.sub("", name)
+
+def _trigrams(name):
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class TechTaxonomy:
+    """Tokenizes tech stack text into integer technology IDs.
+
+    Each technology has a stable ID, a canonical name, a display label, a
+    category and aliases. Names are resolved with exact, alias,
+    separator-insensitive and version-stripped lookups, then a trigram
+    fuzzy match, so "Postgre SQL", "ReactJS 18" and "python3" all resolve.
+    Technologies outside the table get a stable ID derived from their name,
+    so every input maps to a compact integer key.
+    """
+
+    def __init__(self, technologies=TECHNOLOGIES):
+        """Initialize the taxonomy and build its lookup indexes.
+
+        Args:
+            technologies (iterable): Tech entries. Defaults to TECHNOLOGIES.
+
+        Raises:
+            ValueError: If two entries share an ID, or a name or alias is used twice
+        """
+        self.by_id = {}
+        self.by_name = {}
+        for tech in technologies:
+            if tech.id in self.by_id or tech.id >= UNKNOWN_ID_BASE:
+                raise ValueError(f"Invalid or duplicate technology id {tech.id}")
+            self.by_id[tech.id] = tech
+            self.by_name[tech.name] = tech
+
+        # Exact and separator-insensitive spellings of every known name
+        self._index = {}
+        self._joined = set()
+        for tech in self.by_id.values():
+            for spelling in (tech.name,) + tuple(tech.aliases):
+                if self._index.get(spelling, tech.name) != tech.name:
+                    raise ValueError(f"'{spelling}' names both {self._index[spelling]} and {tech.name}")
+                self._index[spelling] = tech.name
+                if _SEPARATOR_CHARS & set(spelling):
+                    self._joined.add(_WHITESPACE_PATTERN.sub("", spelling))
+        for spelling in list(self._index):
+            self._index.setdefault(_compact(spelling), self._index[spelling])
+
+        # Trigram inverted index over the compact spellings for fuzzy matching
+        self._trigrams = {}
+        self._postings = {}
+        for spelling in self._index:
+            if spelling != _compact(spelling):
+                continue
+            grams = _trigrams(spelling)
+            self._trigrams[spelling] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(spelling)
+
+        self._unknown_labels = {}
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+        self._parse_cached = lru_cache(maxsize=4096)(self._parse)
+
+    def _lookup(self, name):
+        return self._index.get(name) or self._index.get(_compact(name))
+
+    def _fuzzy(self, name):
+        """Find the closest known spelling by trigram (Jaccard) similarity."""
+        compact = _compact(name)
+        if len(compact) < 4:
+            return None
+
+        grams = _trigrams(compact)
+        best_name, best_score = None, 0.0
+        seen = set()
+        for gram in grams:
+            for spelling in self._postings.get(gram, ()):
+                if spelling in seen:
+                    continue
+                seen.add(spelling)
+                other = self._trigrams[spelling]
+                score = len(grams & other) / len(grams | other)
+                if score > best_score:
+                    best_name, best_score = spelling, score
+
+        if best_score >= FUZZY_THRESHOLD:
+            return self._index[best_name]
+        return None
+
+    def _resolve(self, tech):
+        """Resolve a technology name to its canonical name, or None if unknown."""
+        name = " ".join(tech.lower().split())
+        if not name:
+            return None
+
+        candidates = [name]
+        unversioned = _VERSION_PATTERN.sub("", name)
+        if unversioned and unversioned != name:
+            candidates.append(unversioned)
+
+        for candidate in candidates:
+            match = self._lookup(candidate)
+            if match:
+                return match
+            # "reactjs" / "vue js" style suffixes
+            if candidate.endswith("js") and len(candidate) > 4:
+                match = self._lookup(candidate[:-2])
+                if match:
+                    return match
+
+        return self._fuzzy(candidates[-1])
+
+    def tokenize(self, text):
+        """Split tech stack text into technology names.
+
+        Splits on , ; / & | ( ) [ ], a standalone "+" and the word "and", so
+        "Python/Django", "React + Redux" and "AWS (EC2, S3)" each give one
+        token per technology. Known names that contain a separator, such as
+        "CI/CD", "PL/SQL" or "A/B testing", are kept whole.
+
+        Args:
+            text (str): Raw tech stack text
+
+        Returns:
+            list: Token strings, stripped, in input order
+        """
+        pieces = _SPLIT_PATTERN.split(text)
+        tokens = []
+        i = 0
+        while i < len(pieces):
+            token = pieces[i]
+            # Even pieces are tokens and odd pieces the separators between them
+            while i + 2 < len(pieces) and _WHITESPACE_PATTERN.sub("", f"{token}{pieces[i + 1]}{pieces[i + 2]}").lower() in self._joined:
+                token = f"{token}{pieces[i + 1]}{pieces[i + 2]}"
+                i += 2
+            token = token.strip(_TOKEN_PUNCTUATION)
+            if token:
+                tokens.append(token)
+            i += 2
+        return tokens
+
+    def tech_id(self, tech):
+        """Get the ID of a single technology name.
+
+        Args:
+            tech (str): A technology name, in any supported spelling
+
+        Returns:
+            int: The taxonomy ID, or a stable ID of at least UNKNOWN_ID_BASE for unknown names
+        """
+        name = self.resolve(tech)
+        if name is not None:
+            return self.by_name[name].id
+
+        normalized = " ".join(tech.lower().split())
+        normalized = _VERSION_PATTERN.sub("", normalized) or normalized
+        tech_id = UNKNOWN_ID_BASE + zlib.crc32(normalized.encode("utf-8"))
+        if tech_id not in self._unknown_labels and len(self._unknown_labels) < MAX_UNKNOWN_LABELS:
+            self._unknown_labels[tech_id] = " ".join(tech.split())
+        return tech_id
+
+    def tech_ids(self, tech_stack):
+        """Get the IDs of an already split list of technology names.
+
+        Args:
+            tech_stack (list): Technology names
+
+        Returns:
+            list: Unique IDs in first-seen order
+        """
+        return list(dict.fromkeys(self.tech_id(tech) for tech in tech_stack if tech.strip()))
+
+    def _parse(self, text):
+        """Tokenize text into unique (id, label) pairs; unknown technologies keep the candidate's spelling."""
+        technologies = {}
+        for token in self.tokenize(text):
+            tech_id = self.tech_id(token)
+            if tech_id not in technologies:
+                technologies[tech_id] = self.by_id[tech_id].label if tech_id in self.by_id else token
+        return tuple(technologies.items())
+
+    def parse(self, text):
+        """Tokenize tech stack text into technology IDs.
+
+        Args:
+            text (str): Raw tech stack text
+
+        Returns:
+            list: Unique IDs in input order
+        """
+        return [tech_id for tech_id, _ in self._parse_cached(text)]
+
+    def parse_labels(self, text):
+        """Tokenize tech stack text into display labels, e.g. ["Python", "Django"] for "python3/django".
+
+        Args:
+            text (str): Raw tech stack text
+
+        Returns:
+            list: One label per unique technology, in input order
+        """
+        return [label for _, label in self._parse_cached(text)]
+
+    def parse_batch(self, texts, labels=False):
+        """Tokenize many tech stack texts, e.g. a column of an import file.
+
+        Each distinct text is tokenized once.
+
+        Args:
+            texts (list): Raw tech stack texts
+            labels (bool): Return display labels instead of IDs
+
+        Returns:
+            list: A list of IDs (or labels) for each text, in the same order
+        """
+        parsed = {}
+        for text in texts:
+            if text not in parsed:
+                parsed[text] = [pair[1 if labels else 0] for pair in self._parse_cached(text)]
+        return [list(parsed[text]) for text in texts]
+
+    def name(self, tech_id):
+        """Get the canonical name of an ID; unknown technologies get their lower-cased label."""
+        tech = self.by_id.get(tech_id)
+        if tech is not None:
+            return tech.name
+        return self.label(tech_id).lower()
+
+    def label(self, tech_id):
+        """Get the display label of an ID, e.g. "Node.js", or the candidate's spelling for unknown technologies."""
+        tech = self.by_id.get(tech_id)
+        if tech is not None:
+            return tech.label
+        return self._unknown_labels.get(tech_id, str(tech_id))
+
+    def category(self, tech_id):
+        """Get the category of an ID ("language", "frontend", "database", ...), or None if unknown."""
+        tech = self.by_id.get(tech_id)
+        return tech.category if tech is not None else None
+
+_default_taxonomy = None
+_default_taxonomy_lock = threading.Lock()
+
+def get_tech_taxonomy():
+    """Get the shared tech taxonomy, building its indexes on first use.
+
+    Returns:
+        TechTaxonomy: The shared taxonomy
+    """
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        with _default_taxonomy_lock:
+            if _default_taxonomy is None:
+                _default_taxonomy = TechTaxonomy()
+    return _default_taxonomy
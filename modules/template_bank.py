@@ -0,0 +1,217 @@
+import threading
+from types import MappingProxyType
+from modules.tech_taxonomy import get_tech_taxonomy
+
+# Dictionary of common technologies and sample questions
+# This serves as a fallback if the LLM is not available
+_TEMPLATES = {
+    "python": [
+        "What are Python decorators and how do you use them?",
+        "Explain the difference between lists and tuples in Python.",
+        "How does memory management work in Python?",
+        "What is the Global Interpreter Lock (GIL) and how does it affect multithreaded Python programs?",
+        "Explain the concept of list comprehensions and provide an example."
+    ],
+    "javascript": [
+        "Explain the concept of closures in JavaScript.",
+        "What is the difference between '==' and '===' operators?",
+        "How does prototypal inheritance work in JavaScript?",
+        "Explain the event loop in JavaScript.",
+        "What are Promises and how do they differ from callbacks?"
+    ],
+    "java": [
+        "What is the difference between an interface and an abstract class in Java?",
+        "Explain the concept of Java's Garbage Collection.",
+        "What are the key features introduced in Java 8?",
+        "How does multithreading work in Java?",
+        "Explain the principles of SOLID in Java programming."
+    ],
+    "react": [
+        "What is the virtual DOM and how does React use it?",
+        "Explain the component lifecycle in React.",
+        "What are hooks in React and how do you use them?",
+        "How do you manage state in a React application?",
+        "Explain the concept of props and state in React components."
+    ],
+    "angular": [
+        "What is dependency injection in Angular?",
+        "Explain the difference between components and directives in Angular.",
+        "How does change detection work in Angular?",
+        "What are Angular modules and how do they help organize code?",
+        "Explain the concept of services in Angular."
+    ],
+    "vue": [
+        "What is the Vue instance lifecycle?",
+        "Explain the difference between computed properties and methods in Vue.",
+        "How does Vue's reactivity system work?",
+        "What are Vue directives and how do you create custom directives?",
+        "Explain the concept of mixins in Vue."
+    ],
+    "node.js": [
+        "How does the event loop work in Node.js?",
+        "What is the purpose of middleware in Express.js?",
+        "Explain the difference between process.nextTick() and setImmediate().",
+        "How do you handle asynchronous operations in Node.js?",
+        "What are streams in Node.js and how are they used?"
+    ],
+    "django": [
+        "Explain Django's MTV (Model-Template-View) architecture.",
+        "How do you create a custom middleware in Django?",
+        "What are Django signals and how are they used?",
+        "Explain Django's ORM and how it interacts with databases.",
+        "How do you handle authentication and authorization in Django?"
+    ],
+    "flask": [
+        "What is the application factory pattern in Flask?",
+        "How do you handle database operations in Flask?",
+        "Explain Flask's context globals (g, request, session).",
+        "How do you implement authentication in a Flask application?",
+        "What are Flask extensions and how do you use them?"
+    ],
+    "sql": [
+        "Explain the difference between INNER JOIN and LEFT JOIN.",
+        "What are database transactions and how do they ensure data integrity?",
+        "How do you optimize a slow SQL query?",
+        "Explain normalization and denormalization in database design.",
+        "What are indexes and how do they improve query performance?"
+    ],
+    "mongodb": [
+        "What is sharding in MongoDB and how does it work?",
+        "Explain the concept of document embedding vs. referencing in MongoDB.",
+        "How do you ensure data consistency in a MongoDB database?",
+        "What are MongoDB aggregation pipelines?",
+        "Explain the concept of indexing in MongoDB."
+    ],
+    "docker": [
+        "What is the difference between a Docker image and a container?",
+        "How do you persist data in Docker containers?",
+        "Explain Docker networking and how containers communicate.",
+        "What is Docker Compose and how is it used?",
+        "How do you optimize Docker images for production?"
+    ],
+    "kubernetes": [
+        "What are Kubernetes pods and how do they work?",
+        "Explain the difference between a Deployment and a StatefulSet in Kubernetes.",
+        "How does service discovery work in Kubernetes?",
+        "What are Kubernetes operators and when would you use them?",
+        "Explain Kubernetes resource limits and requests."
+    ],
+    "aws": [
+        "What is the difference between EC2 and Lambda?",
+        "How do you design a highly available architecture in AWS?",
+        "Explain AWS IAM and best practices for security.",
+        "What are the different storage options in AWS and when would you use each?",
+        "How do you implement auto-scaling in AWS?"
+    ],
+    "devops": [
+        "Explain the concept of Infrastructure as Code.",
+        "What is CI/CD and how does it improve the development process?",
+        "How do you monitor applications in production?",
+        "What strategies do you use for database migrations in a CI/CD pipeline?",
+        "Explain the concept of blue-green deployment."
+    ],
+    "machine learning": [
+        "What is the difference between supervised and unsupervised learning?",
+        "Explain overfitting and how to prevent it.",
+        "What evaluation metrics do you use for classification problems?",
+        "How do you handle imbalanced datasets?",
+        "Explain the concept of feature engineering and why it's important."
+    ],
+    "data science": [
+        "What is the difference between correlation and causation?",
+        "How do you handle missing data in a dataset?",
+        "Explain the concept of dimensionality reduction and when you would use it.",
+        "What statistical tests do you use to validate hypotheses?",
+        "How do you communicate data insights to non-technical stakeholders?"
+    ]
+}
+
+# Read-only template bank shared by every generator in the process
+QUESTION_TEMPLATES = MappingProxyType({tech: tuple(questions) for tech, questions in _TEMPLATES.items()})
+
+# Technologies without their own templates that share a closely related set
+TEMPLATE_FALLBACKS = MappingProxyType({
+    "postgresql": "sql",
+    "mysql": "sql",
+    "sqlite": "sql",
+    "mariadb": "sql",
+    "sql server": "sql",
+    "oracle": "sql",
+    "pl/sql": "sql",
+    "typescript": "javascript",
+    "redux": "react",
+    "next.js": "react",
+    "express": "node.js",
+    "spring": "java",
+    "spring boot": "java",
+    "deep learning": "machine learning",
+    "tensorflow": "machine learning",
+    "pytorch": "machine learning",
+    "scikit-learn": "machine learning",
+    "pandas": "data science",
+    "numpy": "data science"
+})
+
+class TemplateBank:
+    """Read-only question templates, looked up through the tech taxonomy.
+
+    Technology names are resolved by the taxonomy, so inputs such as
+    "Postgre SQL", "ReactJS 18" or "python3" still reach the right templates.
+    """
+
+    def __init__(self, templates=QUESTION_TEMPLATES, fallbacks=TEMPLATE_FALLBACKS, taxonomy=None):
+        """Initialize the template bank.
+
+        Args:
+            templates (Mapping): Canonical technology name to question tuple
+            fallbacks (Mapping): Canonical name to the template set it borrows
+            taxonomy (TechTaxonomy, optional): Resolves technology names. Defaults to the shared taxonomy.
+        """
+        self.templates = templates
+        self.fallbacks = fallbacks
+        self.taxonomy = taxonomy if taxonomy else get_tech_taxonomy()
+
+    def resolve(self, tech):
+        """Resolve a technology name to its canonical name, or None if unknown."""
+        return self.taxonomy.resolve(tech)
+
+    def normalize(self, tech):
+        """Normalize a technology name.
+
+        Args:
+            tech (str): The technology name to normalize
+
+        Returns:
+            str: The canonical name if known, otherwise the lower-cased input
+        """
+        return self.resolve(tech) or tech.lower().strip()
+
+    def get_questions(self, tech):
+        """Get the template questions for a technology.
+
+        Args:
+            tech (str): The technology name, in any supported spelling
+
+        Returns:
+            tuple or None: The template questions, or None if there are none
+        """
+        name = self.resolve(tech)
+        if name is None:
+            return None
+        return self.templates.get(name) or self.templates.get(self.fallbacks.get(name))
+
+_default_bank = None
+_default_bank_lock = threading.Lock()
+
+def get_template_bank():
+    """Get the shared template bank, building its indexes on first use.
+
+    Returns:
+        TemplateBank: The shared template bank
+    """
+    global _default_bank
+    if _default_bank is None:
+        with _default_bank_lock:
+            if _default_bank is None:
+                _default_bank = TemplateBank()
+    return _default_bank
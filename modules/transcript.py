@@ -0,0 +1,101 @@
+import sys
+from functools import lru_cache
+from datetime import datetime
+
+def sanitize_content(content):
+    """Escape angle brackets so message text cannot inject HTML into the chat.
+
+    Args:
+        content (str): Raw message text
+
+    Returns:
+        str: Text safe to render as markdown
+    """
+    return content.replace('<', '&lt;').replace('>', '&gt;')
+
+def _pack(text):
+    """Keep ASCII text as a str (one byte per character) and anything else as UTF-8."""
+    return text if text.isascii() else _encode(text)
+
+@lru_cache(maxsize=256)
+def _encode(text):
+    # Fixed prompts repeat in every session; the cache lets them share one copy
+    return text.encode("utf-8")
+
+def _unpack(text):
+    return text.decode("utf-8") if isinstance(text, bytes) else text
+
+class Message:
+    """One chat message in a session transcript.
+
+    Messages are kept for the whole session and there can be thousands of
+    sessions per process, so records use __slots__ instead of a dict each.
+    Roles and timestamps are interned, so every message shares the same few
+    strings. Text with emoji would take four bytes per character as a str,
+    so it is kept as UTF-8 and decoded when read, and the display text is
+    only stored when sanitizing changed it. Reading fields by key
+    (message["role"]) still works for code written against message
+    dictionaries.
+    """
+
+    __slots__ = ("role", "_content", "_display", "timestamp")
+
+    # Field names, as in to_dict
+    FIELDS = ("role", "content", "display", "timestamp")
+
+    def __init__(self, role, content, display=None, timestamp=None):
+        """Initialize the message.
+
+        Args:
+            role (str): "user" or "assistant"
+            content (str): The message text
+            display (str, optional): Text to render. Defaults to the sanitized content.
+            timestamp (str, optional): Time shown next to the message. Defaults to the current "%H:%M".
+        """
+        display = display if display is not None else sanitize_content(content)
+        self.role = sys.intern(role)
+        self._content = _pack(content)
+        self._display = None if display == content else _pack(display)
+        self.timestamp = sys.intern(timestamp if timestamp else datetime.now().strftime("%H:%M"))
+
+    @property
+    def content(self):
+        return _unpack(self._content)
+
+    @property
+    def display(self):
+        return _unpack(self._display if self._display is not None else self._content)
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def __repr__(self):
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+    def to_dict(self):
+        """Serialize the message.
+
+        Returns:
+            dict: Role, content, display text and timestamp
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a message from to_dict output or an older message dictionary.
+
+        Args:
+            data (dict): Serialized message
+
+        Returns:
+            Message: The restored message
+        """
+        return cls(data["role"], data["content"], data.get("display"), data.get("timestamp"))
@@ -0,0 +1,32 @@
+import pytest
+
+from utils.data_handler import DataHandler
+from utils.event_log import EventLog
+
+@pytest.fixture
+def handler(tmp_path):
+    return DataHandler(str(tmp_path), event_log=EventLog(str(tmp_path / "events"), shards=1))
+
+def _anonymize(handler, name, messages):
+    data = {"candidate_info": {"name": name}, "conversation_history": messages}
+    return [message["content"] for message in handler.anonymize_data(data)["conversation_history"]]
+
+def test_full_name_is_masked_everywhere(handler):
+    contents = _anonymize(handler, "Jane Doe", [
+        {"role": "user", "content": "jane  doe"},
+        {"role": "assistant", "content": "**Name:** Jane Doe"},
+    ])
+    assert contents == ["*********", "**Name:** ********"]
+
+def test_name_parts_are_masked_only_as_typed(handler):
+    contents = _anonymize(handler, "Will May", [
+        {"role": "user", "content": "Call me Will, it may help"},
+        {"role": "assistant", "content": "Thanks, Will! Will you explain how a cache may help?"},
+    ])
+    assert contents == ["Call me ****, it may help", "Thanks, Will! Will you explain how a cache may help?"]
+
+def test_contact_details_are_masked(handler):
+    contents = _anonymize(handler, "Grant Long", [
+        {"role": "user", "content": "grant.long@example.com, +1 (555) 123-4567"},
+    ])
+    assert contents == ["g********g@example.com, +* (***) ***-4567"]
@@ -0,0 +1,88 @@
+import time
+import multiprocessing
+
+from utils.event_log import EventLog, _encode_lines
+
+def _append_events(log_dir, writer, count):
+    log = EventLog(log_dir, shards=2, fsync_interval=-1, compact_bytes=4096)
+    for i in range(count):
+        log.append(f"session-{i % 5}", {"type": "message", "role": "user", "content": f"{writer}:{i}", "time": time.time()})
+    log.close()
+
+def _message(log, session_id, content, role="user"):
+    log.append(session_id, {"type": "message", "role": role, "content": content, "time": time.time()})
+
+def _contents(transcript):
+    return [message["content"] for message in transcript]
+
+def _open_log(log_dir):
+    return EventLog(str(log_dir), shards=1, fsync_interval=-1, compact_bytes=1 << 30)
+
+def test_framing(tmp_path):
+    log = _open_log(tmp_path)
+    _message(log, "a", "héllo\nworld")
+    _message(log, "b", "other")
+    assert log.read_transcript("a") == [{"role": "user", "content": "héllo\nworld"}]
+    log.close()
+
+def test_torn_write_is_cut_off(tmp_path):
+    log = _open_log(tmp_path)
+    _message(log, "a", "before")
+    # A crash in the middle of an append leaves a torn frame, which the next writer cuts off
+    with open(log._path(0), "ab") as f:
+        f.write(_encode_lines([b'{"session_id":"a"}'])[:-3])
+    log.close()
+
+    log = _open_log(tmp_path)
+    _message(log, "a", "after", role="assistant")
+    assert _contents(log.read_transcript("a")) == ["before", "after"]
+    log.close()
+
+def test_saved_conversation_survives_reset(tmp_path):
+    log = _open_log(tmp_path)
+    start = time.time()
+    _message(log, "a", "first")
+    log.append("a", {"type": "reset", "time": time.time()})
+    _message(log, "a", "second")
+    assert _contents(log.read_transcript("a", since=start)) == ["first"]
+    assert _contents(log.read_transcript("a")) == ["second"]
+    log.close()
+
+def test_compaction_drops_purged_sessions(tmp_path):
+    log = _open_log(tmp_path)
+    _message(log, "a", "kept")
+    for i in range(50):
+        _message(log, "b", f"dropped {i}")
+    log.purge("b")
+    before, after = log.compact(0)
+    assert after < before
+    assert log.read_transcript("b") == []
+    assert _contents(log.read_transcript("a")) == ["kept"]
+    log.close()
+
+def test_purge_keeps_restarted_conversation(tmp_path):
+    log = _open_log(tmp_path)
+    start = time.time()
+    log.append("a", {"type": "reset", "time": start})
+    _message(log, "a", "saved")
+    log.append("a", {"type": "reset", "time": time.time()})
+    _message(log, "a", "restarted")
+    log.purge("a", since=start)
+    _message(log, "a", "later")
+    log.compact(0)
+    assert [event["type"] for event in log.read_session("a")] == ["reset", "message", "message"]
+    assert _contents(log.read_transcript("a")) == ["restarted", "later"]
+    log.close()
+
+def test_concurrent_writers(tmp_path):
+    # Writers in separate processes, each compacting the shards it fills
+    writers = [multiprocessing.Process(target=_append_events, args=(str(tmp_path), writer, 500)) for writer in range(4)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+    events = list(EventLog(str(tmp_path), shards=2).iter_events())
+    assert len(events) == 2000
+    for writer in range(4):
+        sequence = [int(event["content"].split(":")[1]) for event in events if event["content"].startswith(f"{writer}:")]
+        assert sorted(sequence) == list(range(500))
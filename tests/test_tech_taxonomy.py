@@ -0,0 +1,33 @@
+import pytest
+
+from modules.tech_taxonomy import TechTaxonomy, UNKNOWN_ID_BASE
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return TechTaxonomy()
+
+@pytest.mark.parametrize("text, tokens", [
+    ("Python/Django", ["Python", "Django"]),
+    ("React + Redux", ["React", "Redux"]),
+    ("C++ and C#", ["C++", "C#"]),
+    ("CI/CD, PL/SQL", ["CI/CD", "PL/SQL"]),
+    ("A/B testing", ["A/B testing"]),
+    ("AWS (EC2, S3)", ["AWS", "EC2", "S3"]),
+    ("Python, Django.", ["Python", "Django"]),
+])
+def test_tokenize(taxonomy, text, tokens):
+    assert taxonomy.tokenize(text) == tokens
+
+def test_aws_services_keep_their_own_ids(taxonomy):
+    assert taxonomy.parse_labels("AWS (EC2, S3, Lambda)") == ["AWS", "EC2", "S3", "Lambda"]
+    assert taxonomy.parse_labels("aws lambda / amazon s3") == ["AWS Lambda", "S3"]
+
+def test_spellings_share_an_id(taxonomy):
+    assert taxonomy.parse("django / python3") == taxonomy.parse("Python, Django")[::-1]
+    assert taxonomy.tech_id("Postgre SQL") == taxonomy.tech_id("PostgreSQL")
+    assert taxonomy.tech_id("ab testing") == taxonomy.tech_id("A/B Testing")
+
+def test_unknown_technologies_get_stable_ids(taxonomy):
+    tech_id = taxonomy.tech_id("Fargate")
+    assert tech_id >= UNKNOWN_ID_BASE
+    assert TechTaxonomy().tech_id("fargate 2") == tech_id
@@ -0,0 +1,335 @@
+import os
+import json
+import sqlite3
+import threading
+from config.config import Config
+from modules.tech_taxonomy import get_tech_taxonomy
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    email TEXT COLLATE NOCASE,
+    phone TEXT,
+    experience TEXT,
+    position TEXT COLLATE NOCASE,
+    location TEXT,
+    tech_stack TEXT,
+    timestamp TEXT,
+    source_file TEXT UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidate_tech (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    tech_id INTEGER NOT NULL,
+    PRIMARY KEY (candidate_id, tech_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+CREATE INDEX IF NOT EXISTS idx_candidates_position ON candidates(position);
+CREATE INDEX IF NOT EXISTS idx_candidates_timestamp ON candidates(timestamp);
+CREATE INDEX IF NOT EXISTS idx_candidate_tech_id ON candidate_tech(tech_id, candidate_id);
+"""
+
+_INSERT_COLUMNS = """
+    (name, email, phone, experience, position, location, tech_stack, timestamp, source_file, data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+class CandidateStore:
+    """SQLite-backed repository of screened candidates.
+
+    Candidate records are stored as JSON alongside indexed columns for email,
+    position, timestamp and tech stack, so listing and filtering are index
+    lookups rather than a parse of every file in the data directory. Tech
+    stacks are indexed by tech taxonomy ID, so a filter for "Postgres" finds
+    candidates who wrote "PostgreSQL".
+    """
+
+    ROW_COLUMNS = {"id", "name", "email", "phone", "experience", "position", "location", "tech_stack", "timestamp"}
+
+    def __init__(self, db_path=None, taxonomy=None):
+        """Initialize the candidate store.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database. Defaults to Config.CANDIDATE_DB_PATH.
+            taxonomy (TechTaxonomy, optional): Maps technologies to IDs. Defaults to the shared taxonomy.
+        """
+        self.db_path = db_path if db_path else Config.CANDIDATE_DB_PATH
+        self.taxonomy = taxonomy if taxonomy else get_tech_taxonomy()
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers list candidates while a session is being saved
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, conn, data, source_file, replace=True):
+        """Write one candidate and its tech rows on an open transaction.
+
+        A record whose source_file is already stored replaces the old row
+        and its tech rows, or is skipped when replace is False.
+
+        Returns:
+            int or None: The candidate id, or None if the record was skipped
+        """
+        info = data.get("candidate_info", {}) or {}
+        tech_stack = data.get("tech_stack", []) or []
+        values = (
+            info.get("name"),
+            info.get("email"),
+            info.get("phone"),
+            info.get("experience"),
+            info.get("position"),
+            info.get("location"),
+            ", ".join(tech_stack),
+            data.get("timestamp"),
+            source_file,
+            json.dumps(data)
+        )
+
+        if source_file is None:
+            candidate_id = conn.execute(f"INSERT INTO candidates {_INSERT_COLUMNS}", values).lastrowid
+        elif replace:
+            conn.execute(
+                f"""
+                INSERT INTO candidates {_INSERT_COLUMNS}
+                ON CONFLICT(source_file) DO UPDATE SET
+                    name = excluded.name, email = excluded.email, phone = excluded.phone,
+                    experience = excluded.experience, position = excluded.position,
+                    location = excluded.location, tech_stack = excluded.tech_stack,
+                    timestamp = excluded.timestamp, data = excluded.data
+                """,
+                values
+            )
+            candidate_id = conn.execute("SELECT id FROM candidates WHERE source_file = ?", (source_file,)).fetchone()[0]
+            conn.execute("DELETE FROM candidate_tech WHERE candidate_id = ?", (candidate_id,))
+        else:
+            cursor = conn.execute(f"INSERT OR IGNORE INTO candidates {_INSERT_COLUMNS}", values)
+            if cursor.rowcount == 0:
+                return None
+            candidate_id = cursor.lastrowid
+
+        tech_ids = self.taxonomy.tech_ids([tech for tech in tech_stack if tech])
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_tech (candidate_id, tech_id) VALUES (?, ?)",
+            [(candidate_id, tech_id) for tech_id in tech_ids]
+        )
+        return candidate_id
+
+    def add_candidate(self, data, source_file=None, replace=True):
+        """Add a candidate record, replacing the record previously saved from the same file.
+
+        Args:
+            data (dict): Candidate data with candidate_info, tech_stack and timestamp
+            source_file (str, optional): Name of the JSON file the record came from
+            replace (bool): Replace a record already stored for source_file; if False it is kept
+                and this one skipped
+
+        Returns:
+            int or None: The candidate id, or None if the record was skipped
+        """
+        conn = self._connect()
+        with conn:
+            return self._insert(conn, data, source_file, replace)
+
+    def add_candidates(self, records):
+        """Add many candidate records in one transaction, e.g. from a bulk import.
+
+        Args:
+            records (iterable): (data, source_file) pairs, as passed to add_candidate
+
+        Returns:
+            int: Number of candidates added; records whose source_file was already stored are skipped
+        """
+        added = 0
+        conn = self._connect()
+        with conn:
+            for data, source_file in records:
+                if self._insert(conn, data, source_file, replace=False) is not None:
+                    added += 1
+        return added
+
+    def get_candidate(self, candidate_id):
+        """Get a candidate by id.
+
+        Args:
+            candidate_id (int): The candidate id
+
+        Returns:
+            dict or None: The candidate data
+        """
+        row = self._connect().execute("SELECT data FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_by_source_file(self, source_file):
+        """Get a candidate by the name of the JSON file it was saved to.
+
+        Args:
+            source_file (str): The file name
+
+        Returns:
+            dict or None: The candidate data
+        """
+        row = self._connect().execute("SELECT data FROM candidates WHERE source_file = ?", (source_file,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def find_by_email(self, email):
+        """Get every record for an email address (case-insensitive).
+
+        Args:
+            email (str): The email address
+
+        Returns:
+            list: Candidate data dictionaries, newest first
+        """
+        rows = self._connect().execute(
+            "SELECT data FROM candidates WHERE email = ? ORDER BY timestamp DESC",
+            (email.strip(),)
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    def list_candidates(self, position=None, tech=None, since=None, until=None, limit=None, offset=0):
+        """List candidates, optionally filtered.
+
+        Args:
+            position (str, optional): Exact desired position (case-insensitive)
+            tech (str, optional): A technology the candidate declared, in any spelling the tech taxonomy resolves
+            since (str, optional): Earliest timestamp (inclusive), in "%Y%m%d_%H%M%S" format
+            until (str, optional): Latest timestamp (inclusive), in "%Y%m%d_%H%M%S" format
+            limit (int, optional): Maximum number of candidates to return
+            offset (int): Number of candidates to skip
+
+        Returns:
+            list: Candidate data dictionaries, oldest first
+        """
+        query, params = self._build_query("c.data", position, tech, since, until, limit, offset)
+        return [json.loads(row["data"]) for row in self._connect().execute(query, params)]
+
+    def iter_rows(self, columns, chunk_size=1000, position=None, tech=None, since=None, until=None):
+        """Lazily read selected candidate columns in bounded-size chunks.
+
+        Only the requested columns are read, so the stored JSON documents are
+        never loaded or decoded.
+
+        Args:
+            columns (list): Column names to select (e.g. "name", "email", "tech_stack")
+            chunk_size (int): Maximum number of rows per chunk
+            position (str, optional): Exact desired position (case-insensitive)
+            tech (str, optional): A technology the candidate declared, in any spelling the tech taxonomy resolves
+            since (str, optional): Earliest timestamp (inclusive)
+            until (str, optional): Latest timestamp (inclusive)
+
+        Yields:
+            list: Up to chunk_size tuples of column values
+        """
+        unknown = set(columns) - self.ROW_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown candidate columns: {', '.join(sorted(unknown))}")
+
+        select = ", ".join(f"c.{column}" for column in columns)
+        query, params = self._build_query(select, position, tech, since, until)
+        cursor = self._connect().execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+
+    def _build_query(self, columns, position=None, tech=None, since=None, until=None, limit=None, offset=0):
+        clauses = []
+        params = []
+
+        if tech:
+            clauses.append("c.id IN (SELECT candidate_id FROM candidate_tech WHERE tech_id = ?)")
+            params.append(self.taxonomy.tech_id(tech))
+        if position:
+            clauses.append("c.position = ?")
+            params.append(position.strip())
+        if since:
+            clauses.append("c.timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("c.timestamp <= ?")
+            params.append(until)
+
+        query = f"SELECT {columns} FROM candidates c"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY c.timestamp, c.id"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        return query, params
+
+    def count(self):
+        """Get the number of stored candidates.
+
+        Returns:
+            int: The candidate count
+        """
+        return self._connect().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def is_migrated(self):
+        """Check whether the legacy JSON files have been imported.
+
+        Returns:
+            bool: True once migrate_json_files has completed
+        """
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        return row is not None
+
+    def migrate_json_files(self, data_dir, force=False):
+        """Import legacy per-candidate JSON files into the store.
+
+        Files already imported are skipped, so running this again is safe.
+        JSON files without candidate_info are not candidates and are ignored.
+
+        Args:
+            data_dir (str): Directory containing the JSON files
+            force (bool): Rescan the directory even if a migration already ran
+
+        Returns:
+            int: Number of candidates imported
+        """
+        if not force and self.is_migrated():
+            return 0
+
+        imported = 0
+        if os.path.exists(data_dir):
+            for filename in sorted(os.listdir(data_dir)):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(data_dir, filename), "r") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    print(f"Error migrating candidate file {filename}: {e}")
+                    continue
+                # Other JSON files kept in the data directory are not candidates
+                if not isinstance(data, dict) or not isinstance(data.get("candidate_info"), dict):
+                    continue
+                if self.add_candidate(data, source_file=filename, replace=False) is not None:
+                    imported += 1
+
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')")
+        return imported
@@ -1,51 +1,123 @@
 import os
+import re
+import copy
 import json
-import pandas as pd
 from datetime import datetime
 from config.config import Config
+from utils.candidate_store import CandidateStore
+from utils.event_log import get_event_log
+from utils.metrics import timed
+
+# Email addresses and phone-like digit runs in free text; a match is masked
+# as a phone number only if it has 10 to 15 digits, like a valid phone
+EMAIL_IN_TEXT = re.compile(r"[\w.+-]+@(?:[\w-]+\.)+[A-Za-z]{2,}")
+PHONE_IN_TEXT = re.compile(r"\+?\d[\d\s\-().]{8,}\d")
 
 class DataHandler:
     """Handles data processing and storage for the TalentScout chatbot."""
     
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, store=None, event_log=None):
         """Initialize the data handler.
         
         Args:
             data_dir (str, optional): Directory to store data files. Defaults to Config.DATA_DIR.
+            store (CandidateStore, optional): Candidate index. Defaults to a store in the data directory.
+            event_log (EventLog, optional): Log holding session transcripts. Defaults to the shared log, if enabled.
         """
         self.data_dir = data_dir if data_dir else Config.DATA_DIR
+        self.event_log = event_log if event_log else get_event_log()
         
         # Create data directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
+        
+        if store:
+            self.store = store
+        elif data_dir:
+            self.store = CandidateStore(os.path.join(self.data_dir, "candidates.db"))
+        else:
+            self.store = CandidateStore()
+        
+        # Import candidates saved as JSON files before the store existed (runs once)
+        self.store.migrate_json_files(self.data_dir)
+    
+    @staticmethod
+    def candidate_filename(candidate_info, timestamp):
+        """Get the name of the file a candidate is saved to.
+        
+        Args:
+            candidate_info (dict): The candidate's information
+            timestamp (str): Save timestamp in "%Y%m%d_%H%M%S" format
+            
+        Returns:
+            str: The file name, unique per candidate name and timestamp
+        """
+        name_slug = candidate_info.get("name", "anonymous").lower().replace(" ", "_")
+        return f"{name_slug}_{timestamp}.json"
+    
+    def find_saved_candidate(self, candidate_info, timestamp):
+        """Look up a saved candidate in the index.
+        
+        Args:
+            candidate_info (dict): The candidate's information
+            timestamp (str): Timestamp the candidate was saved with
+            
+        Returns:
+            dict or None: The saved data, or None if the save has not run yet
+        """
+        return self.store.get_by_source_file(self.candidate_filename(candidate_info, timestamp))
     
-    def save_candidate_data(self, candidate_info, tech_stack, conversation_history):
+    @timed("save_candidate_data")
+    def save_candidate_data(self, candidate_info, tech_stack, conversation_history, session_id=None, timestamp=None, evaluation=None,
+                            transcript_since=None):
         """Save candidate data to a JSON file.
         
+        When the session's messages are in the event log, the conversation is
+        read from the log, starting at transcript_since, even if the session
+        has been restarted since. Once saved, the log can purge it.
+        
         Args:
             candidate_info (dict): The candidate's information
             tech_stack (list): The candidate's tech stack
             conversation_history (list): The conversation history
+            session_id (str, optional): Id of the screening session that logged the conversation
+            timestamp (str, optional): Save timestamp in "%Y%m%d_%H%M%S" format. Defaults to now;
+                passing it makes a retried save overwrite the same file.
+            evaluation (dict, optional): Answer grades from the AnswerEvaluator
+            transcript_since (float, optional): Start time of the logged conversation, as a Unix timestamp.
+                Without it, the session's messages since its last reset are read back.
             
         Returns:
             str: Path to the saved file
         """
         # Create a unique filename based on candidate name and timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name_slug = candidate_info.get("name", "anonymous").lower().replace(" ", "_")
-        filename = f"{name_slug}_{timestamp}.json"
+        timestamp = timestamp if timestamp else datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.candidate_filename(candidate_info, timestamp)
         file_path = os.path.join(self.data_dir, filename)
         
         # Prepare data for saving
         data = {
             "candidate_info": candidate_info,
             "tech_stack": tech_stack,
-            "conversation_history": conversation_history,
             "timestamp": timestamp
         }
+        if evaluation:
+            data["evaluation"] = evaluation
+        if session_id and self.event_log:
+            data["session_id"] = session_id
+            history = self.event_log.read_transcript(session_id, transcript_since)
+            if not history and os.path.exists(file_path):
+                # A later save of the same interview, e.g. with LLM grades, after the log was compacted
+                history = (self.load_candidate_data(file_path) or {}).get("conversation_history", [])
+            data["conversation_history"] = history
+        else:
+            data["conversation_history"] = [dict(message) for message in conversation_history]
         
         # Save to JSON file
         with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, separators=(",", ":"))
+        
+        # Index the candidate so listing and filtering don't need to read the file
+        self.store.add_candidate(data, source_file=filename)
         
         return file_path
     
@@ -72,60 +144,111 @@ class DataHandler:
         Returns:
             list: List of candidate data dictionaries
         """
-        candidates = []
+        return self.store.list_candidates()
+    
+    def find_candidates(self, position=None, tech=None, since=None, until=None):
+        """Find saved candidates matching the given filters.
+        
+        Args:
+            position (str, optional): Desired position (case-insensitive)
+            tech (str, optional): A technology in the candidate's tech stack
+            since (str, optional): Earliest timestamp, in "%Y%m%d_%H%M%S" format
+            until (str, optional): Latest timestamp, in "%Y%m%d_%H%M%S" format
+            
+        Returns:
+            list: List of candidate data dictionaries
+        """
+        return self.store.list_candidates(position=position, tech=tech, since=since, until=until)
+    
+    def find_candidates_by_email(self, email):
+        """Find saved candidates by email address.
         
-        # Check if data directory exists
-        if not os.path.exists(self.data_dir):
-            return candidates
+        Args:
+            email (str): The email address (case-insensitive)
+            
+        Returns:
+            list: List of candidate data dictionaries, newest first
+        """
+        return self.store.find_by_email(email)
+    
+    # Export column headers and the candidate store columns they are read from
+    EXPORT_COLUMNS = {
+        "Name": "name",
+        "Email": "email",
+        "Phone": "phone",
+        "Experience": "experience",
+        "Position": "position",
+        "Location": "location",
+        "Tech Stack": "tech_stack",
+        "Timestamp": "timestamp"
+    }
+    
+    def _export_columns(self, columns):
+        """Resolve the export headers to write, in a stable order.
         
-        # Load all JSON files in the data directory
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith(".json"):
-                file_path = os.path.join(self.data_dir, filename)
-                data = self.load_candidate_data(file_path)
-                if data:
-                    candidates.append(data)
+        Args:
+            columns (list, optional): Headers to include. Defaults to every export column.
+            
+        Returns:
+            list: The selected headers
+        """
+        if not columns:
+            return list(self.EXPORT_COLUMNS)
         
-        return candidates
+        unknown = [column for column in columns if column not in self.EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+        return list(columns)
     
-    def export_to_csv(self, output_path="candidates.csv"):
-        """Export all candidate data to a CSV file.
+    def iter_export_chunks(self, columns=None, chunk_size=None, **filters):
+        """Lazily yield candidate rows for export in bounded-size chunks.
+        
+        Args:
+            columns (list, optional): Headers to include. Defaults to every export column.
+            chunk_size (int, optional): Rows per chunk. Defaults to Config.EXPORT_CHUNK_SIZE.
+            **filters: Filters accepted by find_candidates (position, tech, since, until)
+            
+        Yields:
+            list: Up to chunk_size rows, each a tuple of values in column order
+        """
+        headers = self._export_columns(columns)
+        chunk_size = chunk_size if chunk_size else Config.EXPORT_CHUNK_SIZE
+        store_columns = [self.EXPORT_COLUMNS[header] for header in headers]
+        
+        for chunk in self.store.iter_rows(store_columns, chunk_size=chunk_size, **filters):
+            yield [tuple("" if value is None else value for value in row) for row in chunk]
+    
+    def export_to_csv(self, output_path="candidates.csv", columns=None, chunk_size=None, **filters):
+        """Export candidate data to a CSV file.
+        
+        Candidates are streamed from the store and written one chunk at a time,
+        so memory use stays bounded regardless of how many candidates exist.
         
         Args:
             output_path (str): Path to save the CSV file
+            columns (list, optional): Headers to include. Defaults to every export column.
+            chunk_size (int, optional): Rows per chunk. Defaults to Config.EXPORT_CHUNK_SIZE.
+            **filters: Filters accepted by find_candidates (position, tech, since, until)
             
         Returns:
             bool: True if export was successful, False otherwise
         """
         try:
-            candidates = self.get_all_candidates()
+            # Imported on first export; pandas takes about half a second to load
+            import pandas as pd
             
-            if not candidates:
-                return False
+            headers = self._export_columns(columns)
+            written = 0
             
-            # Extract relevant information for CSV
-            csv_data = []
-            for candidate in candidates:
-                info = candidate.get("candidate_info", {})
-                tech = ", ".join(candidate.get("tech_stack", []))
-                timestamp = candidate.get("timestamp", "")
-                
-                row = {
-                    "Name": info.get("name", ""),
-                    "Email": info.get("email", ""),
-                    "Phone": info.get("phone", ""),
-                    "Experience": info.get("experience", ""),
-                    "Position": info.get("position", ""),
-                    "Location": info.get("location", ""),
-                    "Tech Stack": tech,
-                    "Timestamp": timestamp
-                }
-                
-                csv_data.append(row)
-            
-            # Create DataFrame and save to CSV
-            df = pd.DataFrame(csv_data)
-            df.to_csv(output_path, index=False)
+            with open(output_path, "w", newline="") as f:
+                for chunk in self.iter_export_chunks(headers, chunk_size, **filters):
+                    # Write the header with the first chunk only
+                    pd.DataFrame(chunk, columns=headers).to_csv(f, header=written == 0, index=False)
+                    written += len(chunk)
+            
+            if not written:
+                os.remove(output_path)
+                return False
             
             return True
         
@@ -133,17 +256,104 @@ class DataHandler:
             print(f"Error exporting to CSV: {e}")
             return False
     
+    def export_to_parquet(self, output_path="candidates.parquet", columns=None, chunk_size=None, **filters):
+        """Export candidate data to a Parquet file.
+        
+        Every column is written as a string with a fixed schema, and each chunk
+        becomes a row group, so memory use stays bounded.
+        
+        Args:
+            output_path (str): Path to save the Parquet file
+            columns (list, optional): Headers to include. Defaults to every export column.
+            chunk_size (int, optional): Rows per chunk. Defaults to Config.EXPORT_CHUNK_SIZE.
+            **filters: Filters accepted by find_candidates (position, tech, since, until)
+            
+        Returns:
+            bool: True if export was successful, False otherwise
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Error exporting to Parquet: pyarrow is not installed")
+            return False
+        
+        try:
+            headers = self._export_columns(columns)
+            schema = pa.schema([(header, pa.string()) for header in headers])
+            written = 0
+            
+            with pq.ParquetWriter(output_path, schema) as writer:
+                for chunk in self.iter_export_chunks(headers, chunk_size, **filters):
+                    arrays = [pa.array([str(row[i]) for row in chunk], type=pa.string()) for i in range(len(headers))]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                    written += len(chunk)
+            
+            if not written:
+                os.remove(output_path)
+                return False
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error exporting to Parquet: {e}")
+            return False
+    
+    @staticmethod
+    def _mask_email(email):
+        """Mask the username of an email address, keeping its first and last characters."""
+        email_parts = email.split("@")
+        if len(email_parts) != 2:
+            return email
+        username = email_parts[0]
+        domain = email_parts[1]
+        masked_username = username[0] + "*" * (len(username) - 2) + username[-1] if len(username) > 2 else username
+        return f"{masked_username}@{domain}"
+    
+    @staticmethod
+    def _mask_phone(phone):
+        """Mask every digit of a phone number except the last four."""
+        digits = [i for i, char in enumerate(phone) if char.isdigit()]
+        hidden = set(digits[:-4])
+        return "".join("*" if i in hidden else char for i, char in enumerate(phone))
+    
+    def _scrub_text(self, text, known):
+        """Mask the candidate's name and any email address or phone number in free text.
+        
+        Args:
+            text (str): Message text
+            known (list): Patterns matching the candidate's name
+            
+        Returns:
+            str: The text with personal details masked
+        """
+        text = EMAIL_IN_TEXT.sub(lambda match: self._mask_email(match.group()), text)
+        text = PHONE_IN_TEXT.sub(
+            lambda match: self._mask_phone(match.group()) if 10 <= sum(c.isdigit() for c in match.group()) <= 15 else match.group(),
+            text
+        )
+        for pattern in known:
+            text = pattern.sub(lambda match: "*" * len(match.group()), text)
+        return text
+    
     def anonymize_data(self, data):
         """Anonymize sensitive candidate data for privacy.
         
+        The candidate's email and phone number are masked in candidate_info
+        and in every message of the conversation history. The full name is
+        masked in every message; single parts of it only where the candidate
+        typed them with the same capitalization, so a name like "Will May"
+        does not mask "will" or "may" in the questions.
+        
         Args:
             data (dict): The candidate data to anonymize
             
         Returns:
             dict: Anonymized data
         """
-        # Create a copy to avoid modifying the original
-        anonymized = data.copy()
+        # Deep copy, so masking never modifies the caller's candidate_info or messages
+        anonymized = copy.deepcopy(data)
+        name_parts = []
         
         # Anonymize sensitive fields in candidate_info
         if "candidate_info" in anonymized:
@@ -157,12 +367,7 @@ class DataHandler:
             
             if "email" in info:
                 # Replace email with partial masking
-                email_parts = info["email"].split("@")
-                if len(email_parts) == 2:
-                    username = email_parts[0]
-                    domain = email_parts[1]
-                    masked_username = username[0] + "*" * (len(username) - 2) + username[-1] if len(username) > 2 else username
-                    info["email"] = f"{masked_username}@{domain}"
+                info["email"] = self._mask_email(info["email"])
             
             if "phone" in info:
                 # Mask phone number
@@ -170,4 +375,19 @@ class DataHandler:
                 if len(phone) > 4:
                     info["phone"] = "*" * (len(phone) - 4) + phone[-4:]
         
-        return anonymized
\ No newline at end of file
+        # Scrub the same details from the transcript
+        if anonymized.get("conversation_history"):
+            everywhere = []
+            typed = []
+            if name_parts:
+                everywhere.append(re.compile(r"\b" + r"\s+".join(map(re.escape, name_parts)) + r"\b", re.IGNORECASE))
+                parts = sorted({part for part in name_parts if len(part) > 1}, key=len, reverse=True)
+                if parts:
+                    typed.append(re.compile(r"\b(?:" + "|".join(map(re.escape, parts)) + r")\b"))
+            for message in anonymized["conversation_history"]:
+                known = everywhere + typed if message.get("role") == "user" else everywhere
+                for field in ("content", "display"):
+                    if isinstance(message.get(field), str):
+                        message[field] = self._scrub_text(message[field], known)
+        
+        return anonymized
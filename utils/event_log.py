@@ -0,0 +1,483 @@
+import os
+import json
+import time
+import zlib
+import atexit
+import struct
+import threading
+from contextlib import contextmanager
+from config.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, so one process per log directory
+    fcntl = None
+
+# Shard file header: magic bytes and format version
+_MAGIC = b"TSEL\x01"
+
+# Frame header: payload length and CRC32 of the payload
+_FRAME_HEADER = struct.Struct(">II")
+
+# Uncompressed size of the blocks written by compaction
+COMPACT_BLOCK_BYTES = 64 * 1024
+
+# Strings that recur in almost every transcript, used as a preset DEFLATE
+# dictionary. A single message is too short to compress well on its own;
+# with the dictionary the fixed prompts shrink to a few bytes. Logs are
+# decoded with this exact dictionary, so it must not change within a
+# format version.
+_DICTIONARY_STRINGS = [
+    "Thank you for taking the time to chat with me today! Your information has been recorded. "
+    "A recruiter will review your responses and get back to you soon if there's a potential match. "
+    "If you have any questions in the meantime, please feel free to reach out. Have a great day!",
+    "\n        🎉 **Interview Complete!**\n        \n        You've completed all ",
+    " questions:\n        • **Answered:** ",
+    " questions\n        • **Skipped:** ",
+    " questions\n        • **Total Completed:** ",
+    " questions\n        \n        Thank you for your time! Your responses have been recorded and will be "
+    "reviewed by our recruitment team.\n        ",
+    "\n        🎯 **Technical Interview Time!**\n        \n        Based on your ",
+    " years of experience and tech stack, I've prepared ",
+    " comprehensive technical questions.\n        These questions will test your knowledge across all the "
+    "technologies you mentioned.\n        \n        I'll ask you one question at a time. For each question, "
+    "you can:\n        • **Answer the question** - Provide your response\n        • **Type 'skip'** - "
+    "Move to the next question\n        • **Type 'done'** - Finish the interview early\n        \n        "
+    "Let's begin with the first question!\n        \n\n",
+    "⏳ Your technical questions are still being prepared. They will appear here in a moment.",
+    "⏳ Thanks! I'm preparing your technical questions based on your tech stack...",
+    "Please list your tech stack, including programming languages, frameworks, databases, and tools you are "
+    "proficient in. For example: 'Python, Django, React, PostgreSQL, Docker'",
+    "What is your current location? (City and Country)",
+    "What position(s) are you interested in applying for at TalentScout?",
+    "How many years of professional experience do you have in the tech industry?",
+    "Thank you. Could you please share your phone number?",
+    "Great! Now, could you please provide your email address where we can contact you?",
+    "First, could you please tell me your full name?",
+    "👋 Hello! I'm the TalentScout Hiring Assistant. I'm here to help with your initial screening for "
+    "tech positions. I'll ask you a few questions about your background and technical skills, then provide "
+    "some technical questions based on your expertise. Let's get started!",
+    " Explain the difference between How would you What is the Describe how you would ",
+    "\n\n**Options:**\n• Answer the question\n• Type 'skip' to move to the next question\n"
+    "• Type 'done' to finish the interview",
+    "**Question ",
+    " of ",
+    "\"},\n{\"session_id\":\"",
+    "\",\"type\":\"reset\",\"time\":",
+    "\",\"type\":\"message\",\"role\":\"user\",\"content\":\"",
+    "\",\"type\":\"message\",\"role\":\"assistant\",\"content\":\"",
+    "\",\"time\":17",
+]
+_ZDICT = "".join(json.dumps(text)[1:-1] for text in _DICTIONARY_STRINGS).encode("ascii")
+
+def _compress(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15, zdict=_ZDICT)
+    return compressor.compress(data) + compressor.flush()
+
+def _decompress(payload):
+    decompressor = zlib.decompressobj(-15, zdict=_ZDICT)
+    return decompressor.decompress(payload) + decompressor.flush()
+
+def _encode_lines(lines):
+    """Encode JSON lines as one length-prefixed, checksummed, compressed frame."""
+    payload = _compress(b"\n".join(lines))
+    return _FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def _read_frames(path, offset=None):
+    """Read the intact frames of a shard file.
+
+    Reading stops at the first truncated or corrupt frame, which is where a
+    crash interrupted an append.
+
+    Args:
+        path (str): Path of the shard file
+        offset (int, optional): Start at this frame boundary instead of the first frame
+
+    Yields:
+        tuple: (JSON lines of the frame, file offset just past the frame)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not an event log")
+        if offset:
+            f.seek(offset)
+        else:
+            offset = len(_MAGIC)
+        while True:
+            header = f.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            length, checksum = _FRAME_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            offset += _FRAME_HEADER.size + length
+            yield _decompress(payload).split(b"\n"), offset
+
+def _after_purge(entries, since):
+    """Keep the (event, line) entries of a session that follow a purged conversation.
+
+    The conversation starting at since ends at the first reset after one of
+    its messages, like in read_transcript. Without since, nothing is kept.
+    """
+    if since is None:
+        return []
+    started = False
+    for index, (event, _) in enumerate(entries):
+        if event.get("time", 0) < since:
+            continue
+        if event.get("type") == "message":
+            started = True
+        elif event.get("type") == "reset" and started:
+            return entries[index:]
+    return []
+
+class EventLog:
+    """Append-only, compressed log of session events, split into shards.
+
+    Each event is appended as its own length-prefixed DEFLATE frame as soon
+    as it happens, so a crash loses at most a torn final frame, which is
+    dropped on the next open. Shards are fsynced at most once per
+    fsync_interval, and a shard is compacted in the background once it has
+    grown by compact_bytes: its frames are regrouped by session into large
+    blocks that compress much better, and purged events are dropped.
+
+    Several processes can write the same log directory. Appends, repairs
+    of torn frames and compaction hold an exclusive flock on the shard's
+    lock file, and a writer reopens a shard that another process has
+    compacted. Readers take no lock.
+    """
+
+    def __init__(self, log_dir=None, shards=None, fsync_interval=None, compact_bytes=None):
+        """Initialize the event log.
+
+        Args:
+            log_dir (str, optional): Directory of the shard files. Defaults to Config.EVENT_LOG_DIR.
+            shards (int, optional): Number of shard files. Defaults to Config.EVENT_LOG_SHARDS.
+            fsync_interval (float, optional): Seconds between fsyncs of a shard; 0 syncs every
+                append and a negative value leaves syncing to the OS. Defaults to Config.EVENT_LOG_FSYNC_INTERVAL.
+            compact_bytes (int, optional): Growth of a shard that triggers compaction.
+                Defaults to Config.EVENT_LOG_COMPACT_BYTES.
+        """
+        self.log_dir = log_dir if log_dir else Config.EVENT_LOG_DIR
+        self.shards = shards if shards else Config.EVENT_LOG_SHARDS
+        self.fsync_interval = fsync_interval if fsync_interval is not None else Config.EVENT_LOG_FSYNC_INTERVAL
+        self.compact_bytes = compact_bytes if compact_bytes else Config.EVENT_LOG_COMPACT_BYTES
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self._locks = [threading.Lock() for _ in range(self.shards)]
+        self._lock_fds = [None] * self.shards
+        self._fds = [None] * self.shards
+        self._last_sync = [0.0] * self.shards
+        self._dirty = [False] * self.shards
+        self._base_size = [0] * self.shards  # Size of each shard when opened or last compacted
+        self._end = [0] * self.shards  # Offset of the end of the last intact frame
+        self._compacting = set()
+
+    def _path(self, shard):
+        return os.path.join(self.log_dir, f"shard-{shard:03d}.log")
+
+    def shard_for(self, session_id):
+        """Get the shard a session's events are written to.
+
+        Args:
+            session_id (str): The session id
+
+        Returns:
+            int: The shard number
+        """
+        return zlib.crc32(session_id.encode("utf-8")) % self.shards
+
+    @contextmanager
+    def _locked(self, shard):
+        """Hold a shard's thread lock and an exclusive flock on its lock file.
+
+        The lock file is separate from the shard, which compaction replaces.
+        """
+        with self._locks[shard]:
+            if fcntl is None:
+                yield
+                return
+            if self._lock_fds[shard] is None:
+                self._lock_fds[shard] = os.open(f"{self._path(shard)}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fds[shard], fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fds[shard], fcntl.LOCK_UN)
+
+    def _open(self, shard):
+        """Open a shard for appending, cutting off a torn final frame. Call with the shard locked.
+
+        Another process may have replaced the shard by compacting it, or
+        appended frames since this process last wrote, so both are checked
+        on every call. Frames appended elsewhere are scanned up to the first
+        torn one.
+        """
+        path = self._path(shard)
+        fd = self._fds[shard]
+        if fd is not None:
+            try:
+                replaced = os.fstat(fd).st_ino != os.stat(path).st_ino
+            except FileNotFoundError:
+                replaced = True
+            if replaced:
+                os.close(fd)
+                fd = None
+
+        opened = fd is None
+        if opened:
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._fds[shard] = fd
+            self._end[shard] = 0
+            self._dirty[shard] = False
+
+        size = os.fstat(fd).st_size
+        if opened or size != self._end[shard]:
+            if size < len(_MAGIC):
+                os.ftruncate(fd, 0)
+                os.write(fd, _MAGIC)
+                end = len(_MAGIC)
+            else:
+                # Rescan from the start if the shard somehow shrank
+                end = self._end[shard] if size > self._end[shard] else 0
+                for _, end in _read_frames(path, end):
+                    pass
+                end = max(end, len(_MAGIC))
+                if end < size:
+                    print(f"Error in event log {path}: dropping {size - end} bytes of a torn write")
+                    os.ftruncate(fd, end)
+            self._end[shard] = end
+        if opened:
+            self._base_size[shard] = self._end[shard]
+        return fd
+
+    def _sync(self, shard, force=False):
+        """Fsync a shard if it is due. Call with the shard lock held."""
+        fd = self._fds[shard]
+        if fd is None or not self._dirty[shard] or (self.fsync_interval < 0 and not force):
+            return
+        now = time.monotonic()
+        if force or now - self._last_sync[shard] >= self.fsync_interval:
+            os.fsync(fd)
+            self._last_sync[shard] = now
+            self._dirty[shard] = False
+
+    def append(self, session_id, event):
+        """Append an event for a session.
+
+        Args:
+            session_id (str): The session id
+            event (dict): JSON-serializable event; "type" says what happened
+
+        Returns:
+            bool: True if the event was written
+        """
+        try:
+            record = {"session_id": session_id, **event}
+            frame = _encode_lines([json.dumps(record, separators=(",", ":")).encode("utf-8")])
+            shard = self.shard_for(session_id)
+            with self._locked(shard):
+                os.write(self._open(shard), frame)
+                self._dirty[shard] = True
+                self._end[shard] += len(frame)
+                self._sync(shard)
+                due = (
+                    self._end[shard] - self._base_size[shard] >= max(self.compact_bytes, self._base_size[shard])
+                    and shard not in self._compacting
+                )
+                if due:
+                    self._compacting.add(shard)
+            if due:
+                threading.Thread(target=self._compact_in_background, args=(shard,), daemon=True).start()
+            return True
+        except Exception as e:
+            print(f"Error appending to event log: {e}")
+            return False
+
+    def purge(self, session_id, since=None):
+        """Mark a session's conversation for removal at the next compaction.
+
+        Call this once the transcript has been stored elsewhere.
+
+        Args:
+            session_id (str): The session id
+            since (float, optional): Start time of the stored conversation, as passed to
+                read_transcript. Events up to the reset that ended it are dropped, so the
+                conversation of a restarted session is kept. Defaults to every event
+                logged before the purge.
+
+        Returns:
+            bool: True if the purge was recorded
+        """
+        event = {"type": "purge", "time": time.time()}
+        if since is not None:
+            event["since"] = since
+        return self.append(session_id, event)
+
+    def iter_events(self, session_id=None):
+        """Iterate over logged events in the order they were written.
+
+        Args:
+            session_id (str, optional): Only read this session's events
+
+        Yields:
+            dict: Each event, including its session_id
+        """
+        shards = [self.shard_for(session_id)] if session_id else range(self.shards)
+        needle = json.dumps(session_id).encode("utf-8") if session_id else None
+        for shard in shards:
+            path = self._path(shard)
+            if not os.path.exists(path):
+                continue
+            for lines, _ in _read_frames(path):
+                for line in lines:
+                    # Skip other sessions without parsing them
+                    if needle and needle not in line:
+                        continue
+                    event = json.loads(line)
+                    if not session_id or event.get("session_id") == session_id:
+                        yield event
+
+    def read_session(self, session_id):
+        """Read every logged event of a session.
+
+        Args:
+            session_id (str): The session id
+
+        Returns:
+            list: The session's events, oldest first
+        """
+        return list(self.iter_events(session_id))
+
+    def read_transcript(self, session_id, since=None):
+        """Rebuild a session's conversation from its message events.
+
+        Args:
+            session_id (str): The session id
+            since (float, optional): Start time of the conversation. Reads from there up to the
+                next reset, so a later restart of the session does not replace it. Defaults to
+                the conversation since the last reset.
+
+        Returns:
+            list: Messages with role and content
+        """
+        transcript = []
+        for event in self.iter_events(session_id):
+            if since is not None and event.get("time", 0) < since:
+                continue
+            if event.get("type") == "message":
+                transcript.append({"role": event["role"], "content": event["content"]})
+            elif event.get("type") == "reset":
+                # With since, the reset that started the conversation comes before any message
+                if since is not None and transcript:
+                    break
+                transcript = []
+        return transcript
+
+    def compact(self, shard):
+        """Rewrite a shard with its events grouped by session into large blocks.
+
+        Purged events are dropped. Events of each session keep their order.
+
+        Args:
+            shard (int): The shard number
+
+        Returns:
+            tuple: (size before, size after) in bytes
+        """
+        with self._locked(shard):
+            path = self._path(shard)
+            if not os.path.exists(path):
+                return 0, 0
+            self._open(shard)
+
+            sessions = {}
+            for lines, _ in _read_frames(path):
+                for line in lines:
+                    event = json.loads(line)
+                    entries = sessions.setdefault(event["session_id"], [])
+                    if event.get("type") == "purge":
+                        sessions[event["session_id"]] = _after_purge(entries, event.get("since"))
+                    else:
+                        entries.append((event, line))
+
+            before = self._end[shard]
+            tmp_path = f"{path}.compact"
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC)
+                block = []
+                block_size = 0
+                for entries in sessions.values():
+                    for _, line in entries:
+                        block.append(line)
+                        block_size += len(line) + 1
+                        if block_size >= COMPACT_BLOCK_BYTES:
+                            f.write(_encode_lines(block))
+                            block = []
+                            block_size = 0
+                if block:
+                    f.write(_encode_lines(block))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._sync_dir()
+
+            os.close(self._fds[shard])
+            self._fds[shard] = None
+            self._dirty[shard] = False
+            after = os.path.getsize(path)
+            self._open(shard)
+            return before, after
+
+    def _compact_in_background(self, shard):
+        try:
+            self.compact(shard)
+        except Exception as e:
+            print(f"Error compacting event log shard {shard}: {e}")
+        finally:
+            with self._locks[shard]:
+                self._compacting.discard(shard)
+
+    def _sync_dir(self):
+        """Fsync the log directory so renamed shard files survive a crash."""
+        fd = os.open(self.log_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def flush(self):
+        """Fsync every shard with unsynced appends."""
+        for shard in range(self.shards):
+            with self._locks[shard]:
+                self._sync(shard, force=True)
+
+    def close(self):
+        """Flush and close every open shard."""
+        for shard in range(self.shards):
+            with self._locks[shard]:
+                self._sync(shard, force=True)
+                for fds in (self._fds, self._lock_fds):
+                    if fds[shard] is not None:
+                        os.close(fds[shard])
+                        fds[shard] = None
+
+_shared_log = None
+_shared_log_lock = threading.Lock()
+
+def get_event_log():
+    """Get the process-wide event log.
+
+    Returns:
+        EventLog or None: The shared log, or None if Config.EVENT_LOG_ENABLED is off
+    """
+    global _shared_log
+    if not Config.EVENT_LOG_ENABLED:
+        return None
+    if _shared_log is None:
+        with _shared_log_lock:
+            if _shared_log is None:
+                _shared_log = EventLog()
+                atexit.register(_shared_log.close)
+    return _shared_log
@@ -0,0 +1,309 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from config.config import Config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_after);
+"""
+
+class JobQueue:
+    """Durable background job queue stored in SQLite.
+
+    Jobs are rows in a SQLite database, so queued work survives a restart.
+    Worker threads claim ready jobs with a lease; a job whose worker died
+    is picked up again once its lease runs out. Failed jobs are retried
+    with exponential backoff until max_attempts. An idempotency key makes
+    enqueueing the same work twice a no-op.
+
+    Handlers receive the job payload and should be safe to run more than
+    once, since a crash after the work but before the job is marked done
+    runs it again.
+    """
+
+    def __init__(self, db_path=None, workers=None, max_attempts=None, lease=None, poll_interval=None):
+        """Initialize the job queue.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database. Defaults to Config.JOB_DB_PATH.
+            workers (int, optional): Worker threads. Defaults to Config.JOB_WORKERS.
+            max_attempts (int, optional): Attempts before a job fails. Defaults to Config.JOB_MAX_ATTEMPTS.
+            lease (float, optional): Seconds a claimed job is reserved for its worker. Defaults to Config.JOB_LEASE.
+            poll_interval (float, optional): Seconds between checks for jobs queued by other processes.
+                Defaults to Config.JOB_POLL_INTERVAL.
+        """
+        self.db_path = db_path if db_path else Config.JOB_DB_PATH
+        self.workers = workers if workers else Config.JOB_WORKERS
+        self.max_attempts = max_attempts if max_attempts else Config.JOB_MAX_ATTEMPTS
+        self.lease = lease if lease else Config.JOB_LEASE
+        self.poll_interval = poll_interval if poll_interval else Config.JOB_POLL_INTERVAL
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._handlers = {}
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def register(self, kind, handler):
+        """Register the handler for a kind of job.
+
+        Args:
+            kind (str): Job kind
+            handler (callable): Called with the job payload; its return value is stored as the result
+        """
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind, payload, idempotency_key=None, delay=0, replace_pending=False):
+        """Add a job to the queue.
+
+        Args:
+            kind (str): Job kind
+            payload (dict): JSON-serializable job arguments
+            idempotency_key (str, optional): Jobs with the same key are only queued once
+            delay (float): Seconds before the job may run
+            replace_pending (bool): If a job with the same key has not started yet,
+                give it this payload and run time instead of ignoring the new one
+
+        Returns:
+            int: Id of the queued job, or of the existing job with the same key
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = None
+            if idempotency_key:
+                existing = conn.execute(
+                    "SELECT id, status FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+
+            if existing is None:
+                job_id = conn.execute(
+                    """
+                    INSERT INTO jobs (kind, payload, idempotency_key, max_attempts, run_after, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (kind, json.dumps(payload), idempotency_key, self.max_attempts, now + delay, now, now)
+                ).lastrowid
+            else:
+                job_id = existing["id"]
+                if replace_pending and existing["status"] == "pending":
+                    conn.execute(
+                        "UPDATE jobs SET payload = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(payload), now + delay, now, job_id)
+                    )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if delay <= 0:
+            self._wakeup.set()
+        return job_id
+
+    def _claim(self):
+        """Claim the oldest ready job, or a running job whose lease expired.
+
+        Returns:
+            sqlite3.Row or None: The claimed job
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE (status = 'pending' AND run_after <= ?) OR (status = 'running' AND lease_until < ?)
+                ORDER BY run_after, id LIMIT 1
+                """,
+                (now, now)
+            ).fetchone()
+            if job is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease, now, job["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return job
+
+    def _finish(self, job, result=None, error=None):
+        """Record the outcome of a job, scheduling a retry if it failed and attempts remain."""
+        now = time.time()
+        attempts = job["attempts"] + 1
+        if error is None:
+            status, run_after = "done", job["run_after"]
+        elif attempts < job["max_attempts"]:
+            backoff = min(Config.JOB_BACKOFF_BASE * (2 ** (attempts - 1)), Config.JOB_BACKOFF_MAX)
+            status, run_after = "pending", now + backoff
+        else:
+            status, run_after = "failed", job["run_after"]
+
+        self._connect().execute(
+            """
+            UPDATE jobs SET status = ?, run_after = ?, lease_until = NULL, last_error = ?, result = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (status, run_after, error, json.dumps(result) if result is not None else None, now, job["id"])
+        )
+        return status
+
+    def run_job(self, job):
+        """Run a claimed job and record its outcome.
+
+        Args:
+            job (sqlite3.Row): A job returned by _claim
+
+        Returns:
+            str: The job's new status
+        """
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            return self._finish(job, error=f"No handler registered for {job['kind']}")
+        try:
+            result = handler(json.loads(job["payload"]))
+        except Exception as e:
+            print(f"Error running {job['kind']} job {job['id']}: {e}")
+            return self._finish(job, error=str(e))
+        return self._finish(job, result=result)
+
+    def run_pending(self):
+        """Run every ready job on the calling thread, e.g. from a script or a test.
+
+        Returns:
+            int: Number of jobs run
+        """
+        count = 0
+        while True:
+            job = self._claim()
+            if job is None:
+                return count
+            self.run_job(job)
+            count += 1
+
+    def _next_wait(self):
+        """Seconds until the next delayed job is due, capped at the poll interval."""
+        row = self._connect().execute(
+            "SELECT MIN(run_after) AS next_run FROM jobs WHERE status = 'pending'"
+        ).fetchone()
+        if row["next_run"] is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, row["next_run"] - time.time()))
+
+    def purge_finished(self, older_than=None):
+        """Delete completed jobs, freeing their idempotency keys.
+
+        Args:
+            older_than (float, optional): Minimum age in seconds. Defaults to Config.JOB_RETENTION.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        older_than = older_than if older_than is not None else Config.JOB_RETENTION
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status = 'done' AND updated_at < ?", (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+    def _work(self):
+        last_purge = 0.0
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() - last_purge > 3600:
+                    last_purge = time.monotonic()
+                    self.purge_finished()
+                job = self._claim()
+                if job is not None:
+                    self.run_job(job)
+                    continue
+                wait = self._next_wait()
+            except Exception as e:
+                print(f"Error in job worker: {e}")
+                wait = self.poll_interval
+
+            if self._wakeup.wait(wait):
+                self._wakeup.clear()
+
+    def start(self):
+        """Start the worker threads (once)."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Stop the worker threads after their current job.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each thread
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def get_job(self, job_id):
+        """Get a job by id.
+
+        Args:
+            job_id (int): The job id
+
+        Returns:
+            dict or None: The job's columns, with payload and result decoded
+        """
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self):
+        """Count jobs by status.
+
+        Returns:
+            dict: Status -> number of jobs
+        """
+        rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
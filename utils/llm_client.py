@@ -0,0 +1,214 @@
+import time
+import random
+import threading
+from contextlib import contextmanager
+from utils.metrics import LLM_RETRIES
+from config.config import Config
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter."""
+
+    def __init__(self, rate, capacity):
+        """Initialize the token bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum number of tokens held, i.e. the burst size
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take a token, waiting until one is available.
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up
+
+        Returns:
+            bool: True if a token was acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+class LLMClient:
+    """Process-wide OpenAI client with pooling, retries and admission control.
+
+    All sessions share one pooled HTTP client. Requests wait for a concurrency
+    slot and a rate-limit token before being sent, and rate-limit, timeout,
+    connection and 5xx errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_retries=None, max_concurrency=None, rate_limit=None):
+        """Initialize the LLM client.
+
+        Args:
+            api_key (str, optional): OpenAI API key. Defaults to Config.OPENAI_API_KEY.
+            base_url (str, optional): API endpoint. Defaults to Config.OPENAI_BASE_URL.
+            max_retries (int, optional): Retries per request. Defaults to Config.LLM_MAX_RETRIES.
+            max_concurrency (int, optional): Concurrent requests. Defaults to Config.LLM_MAX_CONCURRENCY.
+            rate_limit (float, optional): Requests per second. Defaults to Config.LLM_RATE_LIMIT.
+        """
+        self.api_key = api_key if api_key else Config.OPENAI_API_KEY
+        self.base_url = base_url if base_url else Config.OPENAI_BASE_URL
+        self.max_retries = max_retries if max_retries is not None else Config.LLM_MAX_RETRIES
+        max_concurrency = max_concurrency if max_concurrency else Config.LLM_MAX_CONCURRENCY
+        rate_limit = rate_limit if rate_limit is not None else Config.LLM_RATE_LIMIT
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._rate_limiter = TokenBucket(rate_limit, Config.LLM_RATE_BURST) if rate_limit > 0 else None
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The underlying OpenAI client, created on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    # Imported on first use: openai takes over half a second to load,
+                    # which would otherwise delay every process start
+                    import httpx
+                    from openai import OpenAI
+
+                    http_client = httpx.Client(
+                        timeout=httpx.Timeout(Config.LLM_TIMEOUT, connect=Config.LLM_CONNECT_TIMEOUT),
+                        limits=httpx.Limits(
+                            max_connections=Config.LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=Config.LLM_MAX_KEEPALIVE
+                        )
+                    )
+                    # Retries are handled here so they share the backoff policy and admission control
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        max_retries=0,
+                        http_client=http_client
+                    )
+        return self._client
+
+    @contextmanager
+    def _slot(self):
+        """Wait for a concurrency slot and a rate-limit token."""
+        if not self._semaphore.acquire(timeout=Config.LLM_QUEUE_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free LLM request slot")
+        try:
+            if self._rate_limiter and not self._rate_limiter.acquire(timeout=Config.LLM_QUEUE_TIMEOUT):
+                raise TimeoutError("Timed out waiting for the LLM rate limiter")
+            yield
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    def _is_retryable(error):
+        # Usually already loaded by the request that raised the error
+        from openai import APIConnectionError, APITimeoutError, APIStatusError, RateLimitError
+
+        if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError)):
+            return True
+        return isinstance(error, APIStatusError) and error.status_code >= 500
+
+    def _backoff_delay(self, attempt, error):
+        # Honour the server's Retry-After hint on rate limits when it is sent
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return min(float(retry_after), Config.LLM_BACKOFF_MAX)
+            except ValueError:
+                pass
+
+        # Full jitter spreads out retries from sessions that failed together
+        return random.uniform(0, min(Config.LLM_BACKOFF_MAX, Config.LLM_BACKOFF_BASE * (2 ** attempt)))
+
+    def _with_retries(self, request):
+        attempt = 0
+        while True:
+            try:
+                with self._slot():
+                    return request()
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                print(f"LLM request failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                LLM_RETRIES.inc()
+                time.sleep(delay)
+                attempt += 1
+
+    def create_chat_completion(self, **params):
+        """Create a chat completion, retrying transient failures.
+
+        Args:
+            **params: Parameters for the chat completion request
+
+        Returns:
+            ChatCompletion: The completion response
+        """
+        return self._with_retries(lambda: self.client.chat.completions.create(**params))
+
+    def stream_chat_completion(self, **params):
+        """Stream a chat completion, retrying failures before the first chunk.
+
+        The concurrency slot is held until the stream is exhausted or closed.
+
+        Args:
+            **params: Parameters for the chat completion request
+
+        Yields:
+            ChatCompletionChunk: Each streamed chunk
+        """
+        attempt = 0
+        while True:
+            started = False
+            try:
+                # Closing the stream returns its connection to the pool even
+                # when the consumer stops reading early
+                with self._slot(), self.client.chat.completions.create(stream=True, **params) as stream:
+                    for chunk in stream:
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                # Once output has been delivered a retry would duplicate it
+                if started or attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                print(f"LLM stream failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                LLM_RETRIES.inc()
+                time.sleep(delay)
+                attempt += 1
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_client():
+    """Get the process-wide LLM client.
+
+    Returns:
+        LLMClient: The shared client
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = LLMClient()
+    return _shared_client
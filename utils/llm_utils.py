@@ -1,12 +1,82 @@
 import json
-from openai import OpenAI
+from utils.llm_client import get_client
+from utils.metrics import timed
 from config.config import Config
 
-# Set up OpenAI API key
-client = OpenAI(api_key=Config.OPENAI_API_KEY)
+def _stream_completion(params):
+    """Yield content deltas from a streaming chat completion.
+    
+    Args:
+        params (dict): Parameters for the chat completion request
+        
+    Yields:
+        str: Content deltas as they arrive
+    """
+    yielded = False
+    with timed("stream_completion") as timer:
+        try:
+            for chunk in get_client().stream_chat_completion(**params):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yielded = True
+                    yield delta
+        except Exception as e:
+            print(f"Error streaming LLM response: {e}")
+            # Only fall back if the caller has not already received partial output
+            if not yielded:
+                timer.fallback("error")
+                yield Config.FALLBACK_MESSAGE
 
-def get_llm_response(prompt, model=Config.DEFAULT_MODEL, temperature=Config.DEFAULT_TEMPERATURE, max_tokens=1000, response_format=None):
-    """Get a response from the language model.
+def iter_json_array_strings(deltas):
+    """Incrementally parse a streamed JSON array of strings.
+    
+    Each string element is yielded as soon as its closing quote arrives, so
+    callers can use the first item long before the array is complete. Text
+    before the opening bracket (e.g. a code fence) is ignored.
+    
+    Args:
+        deltas (iterable): Chunks of the streamed JSON text
+        
+    Yields:
+        str: Each decoded string element of the top-level array
+    """
+    containers = []
+    in_string = False
+    escaped = False
+    buffer = []
+    
+    for delta in deltas:
+        for char in delta:
+            if in_string:
+                if escaped:
+                    escaped = False
+                    buffer.append(char)
+                elif char == "\\":
+                    escaped = True
+                    buffer.append(char)
+                elif char == '"':
+                    in_string = False
+                    if containers == ["["]:
+                        try:
+                            yield json.loads('"' + "".join(buffer) + '"')
+                        except json.JSONDecodeError:
+                            pass
+                    buffer = []
+                else:
+                    buffer.append(char)
+            elif char == '"' and containers:
+                in_string = True
+            elif char in "[{":
+                containers.append(char)
+            elif char in "]}" and containers:
+                containers.pop()
+                if not containers:
+                    return
+
+def build_request_params(prompt, model=Config.DEFAULT_MODEL, temperature=Config.DEFAULT_TEMPERATURE, max_tokens=1000, response_format=None):
+    """Build the chat completion parameters for a single-prompt request.
     
     Args:
         prompt (str): The prompt to send to the model
@@ -16,37 +86,86 @@ def get_llm_response(prompt, model=Config.DEFAULT_MODEL, temperature=Config.DEFA
         response_format (str, optional): The format of the response (e.g., "json")
         
     Returns:
-        str or dict: The model's response, either as a string or parsed JSON
+        dict: Parameters for the chat completion request
+    """
+    params = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if response_format == "json":
+        params["response_format"] = {"type": "json_object"}
+    return params
+
+def parse_json_content(content):
+    """Parse JSON model output, returning the raw content if it is not valid JSON.
+    
+    Args:
+        content (str): The message content from the model
+        
+    Returns:
+        dict or list or str: The parsed JSON, or the raw content
     """
     try:
-        params = {
-            "model": model,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
+        return json.loads(content)
+    except json.JSONDecodeError:
+        print("Warning: Response was not valid JSON. Returning raw content.")
+        return content
 
-        if response_format == "json":
-            params["response_format"] = {"type": "json_object"}   
+def extract_json_array(response):
+    """Get the array from a parsed JSON response.
+    
+    JSON mode always returns an object, so an array the prompt asked for
+    arrives wrapped in one (e.g. {"questions": [...]}).
+    
+    Args:
+        response (list or dict or str): The parsed LLM response
+        
+    Returns:
+        list or None: The array, or None if the response holds none
+    """
+    if isinstance(response, dict):
+        response = next((value for value in response.values() if isinstance(value, list)), None)
+    return response if isinstance(response, list) else None
 
-        response = client.chat.completions.create(**params)
+def get_llm_response(prompt, model=Config.DEFAULT_MODEL, temperature=Config.DEFAULT_TEMPERATURE, max_tokens=1000, response_format=None, stream=False):
+    """Get a response from the language model.
+    
+    Args:
+        prompt (str): The prompt to send to the model
+        model (str): The model to use
+        temperature (float): The temperature parameter for generation
+        max_tokens (int): The maximum number of tokens to generate
+        response_format (str, optional): The format of the response (e.g., "json")
+        stream (bool): If True, return a generator of content deltas instead
+        
+    Returns:
+        str or dict or generator: The model's response, either as a string, parsed JSON,
+        or a generator of content deltas when streaming
+    """
+    if stream:
+        return _stream_completion(build_request_params(prompt, model, temperature, max_tokens))
+    
+    with timed("get_llm_response") as timer:
+        try:
+            params = build_request_params(prompt, model, temperature, max_tokens, response_format)
+            response = get_client().create_chat_completion(**params)
+            timer.tokens(response.usage)
 
-        content = response.choices[0].message.content
+            content = response.choices[0].message.content
 
-        if response_format == "json":
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                print("Warning: Response was not valid JSON. Returning raw content.")
-                return content
+            if response_format == "json":
+                return parse_json_content(content)
 
-        return content
+            return content
 
-    except Exception as e:
-        print(f"Error getting LLM response: {e}")
-        return {} if response_format == "json" else Config.FALLBACK_MESSAGE
+        except Exception as e:
+            print(f"Error getting LLM response: {e}")
+            timer.fallback("error")
+            return {} if response_format == "json" else Config.FALLBACK_MESSAGE
 
-def create_chat_completion(messages, model=Config.DEFAULT_MODEL, temperature=Config.DEFAULT_TEMPERATURE, max_tokens=1000):
+def create_chat_completion(messages, model=Config.DEFAULT_MODEL, temperature=Config.DEFAULT_TEMPERATURE, max_tokens=1000, stream=False):
     """Create a chat completion with a series of messages.
     
     Args:
@@ -54,18 +173,30 @@ def create_chat_completion(messages, model=Config.DEFAULT_MODEL, temperature=Con
         model (str): The model to use
         temperature (float): The temperature parameter for generation
         max_tokens (int): The maximum number of tokens to generate
+        stream (bool): If True, return a generator of content deltas instead
         
     Returns:
-        str: The model's response
+        str or generator: The model's response, or a generator of content deltas when streaming
     """
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"Error creating chat completion: {e}")
-        return Config.FALLBACK_MESSAGE
\ No newline at end of file
+    if stream:
+        return _stream_completion({
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        })
+    
+    with timed("create_chat_completion") as timer:
+        try:
+            response = get_client().create_chat_completion(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            timer.tokens(response.usage)
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error creating chat completion: {e}")
+            timer.fallback("error")
+            return Config.FALLBACK_MESSAGE
\ No newline at end of file
@@ -0,0 +1,429 @@
+import json
+import time
+import bisect
+import logging
+import threading
+import functools
+from config.config import Config
+
+# Histogram buckets in seconds, from in-process stages to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger("talentscout.metrics")
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names, values, extra=""):
+    """Format a label set, leaving out empty labels."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values) if value != ""]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Thread-safe counter with labels."""
+
+    def __init__(self, name, help_text, label_names=()):
+        """Initialize the counter.
+
+        Args:
+            name (str): Metric name
+            help_text (str): Description shown in the exposition
+            label_names (tuple): Names of the labels, in order
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Add to the counter.
+
+        Args:
+            amount (float): Amount to add
+            **labels: Label values
+        """
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        """Render the counter in the Prometheus text format.
+
+        Returns:
+            list: Exposition lines
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}")
+        return lines
+
+class Histogram:
+    """Thread-safe histogram with fixed buckets and labels."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            name (str): Metric name
+            help_text (str): Description shown in the exposition
+            label_names (tuple): Names of the labels, in order
+            buckets (tuple): Sorted upper bounds of the buckets
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record an observation.
+
+        Args:
+            value (float): The observed value
+            **labels: Label values
+        """
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            return series[2] if series else 0
+
+    def render(self):
+        """Render the histogram in the Prometheus text format.
+
+        Returns:
+            list: Exposition lines
+        """
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, label_names=()):
+        """Get or create a counter.
+
+        Returns:
+            Counter: The counter registered under name
+        """
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram.
+
+        Returns:
+            Histogram: The histogram registered under name
+        """
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def render(self):
+        """Render every metric in the Prometheus text format.
+
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+OPERATION_SECONDS = registry.histogram(
+    "talentscout_operation_seconds", "Time spent in instrumented operations", ("operation", "stage")
+)
+OPERATION_ERRORS = registry.counter(
+    "talentscout_operation_errors_total", "Instrumented operations that raised an exception", ("operation", "stage")
+)
+SLO_BREACHES = registry.counter(
+    "talentscout_slo_breaches_total", "Instrumented operations slower than their SLO", ("operation", "stage")
+)
+LLM_TOKENS = registry.counter(
+    "talentscout_llm_tokens_total", "Tokens used by LLM requests", ("operation", "kind")
+)
+FALLBACKS = registry.counter(
+    "talentscout_fallbacks_total", "Results replaced by a fallback", ("operation", "reason")
+)
+LLM_RETRIES = registry.counter(
+    "talentscout_llm_retries_total", "LLM requests retried after a transient error"
+)
+
+def parse_slos(spec):
+    """Parse SLOs written as "operation=seconds" or "operation:stage=seconds", comma-separated.
+
+    Args:
+        spec (str): The SLO specification
+
+    Returns:
+        dict: "operation" or "operation:stage" -> seconds
+    """
+    slos = {}
+    for item in spec.split(","):
+        name, _, seconds = item.partition("=")
+        try:
+            slos[name.strip()] = float(seconds)
+        except ValueError:
+            if item.strip():
+                print(f"Error parsing SLO {item.strip()!r}: expected name=seconds")
+    return slos
+
+_slos = parse_slos(Config.METRICS_SLOS)
+
+def slo_for(operation, stage=""):
+    """Get the SLO of an operation, preferring one set for its stage.
+
+    Returns:
+        float or None: Seconds, or None if the operation has no SLO
+    """
+    if stage:
+        slo = _slos.get(f"{operation}:{stage}")
+        if slo is not None:
+            return slo
+    return _slos.get(operation)
+
+def _configure_log():
+    """Write every metrics event to METRICS_LOG_PATH as JSON lines, if set."""
+    if not Config.METRICS_LOG_PATH:
+        return
+    try:
+        handler = logging.FileHandler(Config.METRICS_LOG_PATH)
+    except OSError as e:
+        print(f"Error opening metrics log: {e}")
+        return
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_configure_log()
+
+def record(operation, seconds, stage="", error=None, **fields):
+    """Record one run of an operation and log it as a JSON line.
+
+    Runs slower than their SLO are counted and logged as warnings, so they
+    show up with the default log level; the rest are logged at INFO.
+
+    Args:
+        operation (str): Operation name
+        seconds (float): How long it took
+        stage (str): Interview stage, for per-stage operations
+        error (str, optional): Name of the exception it raised
+        **fields: Extra fields for the log line, e.g. token counts
+    """
+    if not Config.METRICS_ENABLED:
+        return
+    OPERATION_SECONDS.observe(seconds, operation=operation, stage=stage)
+    if error:
+        OPERATION_ERRORS.inc(operation=operation, stage=stage)
+    slo = slo_for(operation, stage)
+    breached = slo is not None and seconds > slo
+    if breached:
+        SLO_BREACHES.inc(operation=operation, stage=stage)
+
+    level = logging.WARNING if breached or error else logging.INFO
+    if logger.isEnabledFor(level):
+        event = {"time": round(time.time(), 3), "operation": operation, "seconds": round(seconds, 6)}
+        if stage:
+            event["stage"] = stage
+        if error:
+            event["error"] = error
+        if breached:
+            event["slo_seconds"] = slo
+            event["slo_breach"] = True
+        event.update(fields)
+        logger.log(level, json.dumps(event, separators=(",", ":")))
+
+class timed:
+    """Time an operation, as a context manager or a decorator.
+
+    Usage:
+        with timed("handle_input", stage) as timer:
+            ...
+            timer.tokens(response.usage)
+
+        @timed("save_candidate_data")
+        def save_candidate_data(...):
+            ...
+    """
+
+    __slots__ = ("operation", "stage", "fields", "_start")
+
+    def __init__(self, operation, stage=""):
+        """Initialize the timer.
+
+        Args:
+            operation (str): Operation name
+            stage (str): Interview stage, for per-stage operations
+        """
+        self.operation = operation
+        self.stage = stage
+        self.fields = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        # A consumer closing a generator early is not a failure
+        error = exc_type.__name__ if exc_type is not None and not issubclass(exc_type, GeneratorExit) else None
+        record(self.operation, seconds, self.stage, error, **(self.fields or {}))
+        return False
+
+    def __call__(self, func):
+        operation, stage = self.operation, self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(operation, stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def annotate(self, **fields):
+        """Add fields to this run's log line."""
+        if self.fields is None:
+            self.fields = {}
+        self.fields.update(fields)
+
+    def tokens(self, usage):
+        """Count the tokens an LLM response used.
+
+        Args:
+            usage: The response's usage object, or None if the server did not report it
+        """
+        if usage is None or not Config.METRICS_ENABLED:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        LLM_TOKENS.inc(prompt_tokens, operation=self.operation, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, operation=self.operation, kind="completion")
+        self.annotate(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def fallback(self, reason):
+        """Count a fallback used in place of the operation's normal result.
+
+        Args:
+            reason (str): Why the fallback was used, e.g. "error"
+        """
+        count_fallback(self.operation, reason)
+        self.annotate(fallback=reason)
+
+def count_fallback(operation, reason):
+    """Count a fallback used in place of an operation's normal result.
+
+    Args:
+        operation (str): Operation name
+        reason (str): Why the fallback was used
+    """
+    if Config.METRICS_ENABLED:
+        FALLBACKS.inc(operation=operation, reason=reason)
+
+def render_prometheus():
+    """Render every metric in the Prometheus text format.
+
+    Returns:
+        str: The exposition text
+    """
+    return registry.render()
+
+_server = None
+_server_attempted = False
+_server_lock = threading.Lock()
+
+def start_metrics_server(host=None, port=None):
+    """Serve /metrics over HTTP on a background thread (once per process).
+
+    Args:
+        host (str, optional): Interface to bind. Defaults to Config.METRICS_HOST.
+        port (int, optional): Port to bind; 0 disables the server. Defaults to Config.METRICS_PORT.
+
+    Returns:
+        ThreadingHTTPServer or None: The server, or None if it is disabled or could not start
+    """
+    global _server, _server_attempted
+    host = host if host else Config.METRICS_HOST
+    port = port if port is not None else Config.METRICS_PORT
+    if not Config.METRICS_ENABLED or not port:
+        return None
+    if not _server_attempted:
+        with _server_lock:
+            if not _server_attempted:
+                # Only try once, so a taken port is reported once rather than on every rerun
+                _server_attempted = True
+                # http.server pulls in the email package; only load it when serving
+                from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+                class MetricsHandler(BaseHTTPRequestHandler):
+                    def do_GET(self):
+                        if self.path.split("?", 1)[0] != "/metrics":
+                            self.send_error(404)
+                            return
+                        body = render_prometheus().encode("utf-8")
+                        self.send_response(200)
+                        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+
+                    def log_message(self, format, *args):
+                        pass
+
+                try:
+                    server = ThreadingHTTPServer((host, port), MetricsHandler)
+                except OSError as e:
+                    print(f"Error starting metrics server on {host}:{port}: {e}")
+                    return None
+                server.daemon_threads = True
+                threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+                _server = server
+    return _server
@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from config.config import Config
+
+# Experience bands and the years of experience used when generating for each
+EXPERIENCE_BANDS = {
+    "junior": 1,
+    "mid": 4,
+    "senior": 8
+}
+
+def experience_band(experience_years):
+    """Map a free-text experience answer to an experience band.
+
+    Args:
+        experience_years (str): Years of experience as entered by the candidate
+
+    Returns:
+        str: "junior" (0-2 years), "mid" (3-5 years) or "senior" (6+ years)
+    """
+    years_match = re.search(r'(\d+)', str(experience_years))
+    years = int(years_match.group(1)) if years_match else 0
+    if years <= 2:
+        return "junior"
+    if years <= 5:
+        return "mid"
+    return "senior"
+
+class QuestionBank:
+    """Pre-generated question sets stored in a single JSON file.
+
+    The bank is filled offline by build_question_bank.py and is read-only
+    during screenings. Each entry holds several question sets for one
+    normalized tech stack and experience band, served round-robin. The file
+    is reloaded when it changes on disk, so a rebuilt bank is picked up
+    without a restart.
+    """
+
+    def __init__(self, bank_path=None):
+        """Initialize the question bank.
+
+        Args:
+            bank_path (str, optional): Path of the bank file. Defaults to Config.QUESTION_BANK_PATH.
+        """
+        self.bank_path = bank_path if bank_path else Config.QUESTION_BANK_PATH
+        self._entries = {}
+        self._mtime = None
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tech_stack, band, question_count, model, prompt):
+        """Build the key for a bank entry.
+
+        Args:
+            tech_stack (list): Technology IDs from the tech taxonomy
+            band (str): Experience band
+            question_count (int): Number of questions in each set
+            model (str): The model used for generation
+            prompt (str): The prompt template used for generation
+
+        Returns:
+            str: Hex digest identifying the entry
+        """
+        payload = {
+            "stack": sorted(set(tech_stack)),
+            "band": band,
+            "count": question_count,
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.bank_path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.bank_path, "r") as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self._mtime = mtime
+        except Exception as e:
+            print(f"Error loading question bank: {e}")
+
+    def get(self, key):
+        """Get the next question set for a key.
+
+        Args:
+            key (str): The key from make_key
+
+        Returns:
+            list or None: A question set, or None if the bank has no entry
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+            if not entry or not entry.get("sets"):
+                return None
+
+            sets = entry["sets"]
+            index = self._cursors.get(key, 0) % len(sets)
+            self._cursors[key] = index + 1
+            return list(sets[index])
+
+    def count(self, key):
+        """Get the number of question sets stored for a key.
+
+        Args:
+            key (str): The key from make_key
+
+        Returns:
+            int: Number of sets
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(key)
+            return len(entry["sets"]) if entry else 0
+
+    def add(self, key, questions, tech_stack, band, question_count):
+        """Add a question set to the bank in memory; call save() to persist it.
+
+        Args:
+            key (str): The key from make_key
+            questions (list): The generated questions
+            tech_stack (list): Normalized technology names
+            band (str): Experience band
+            question_count (int): Number of questions in the set
+
+        Returns:
+            bool: True if the set was new
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.setdefault(key, {
+                "stack": sorted(set(tech_stack)),
+                "band": band,
+                "question_count": question_count,
+                "sets": []
+            })
+            if questions in entry["sets"]:
+                return False
+            entry["sets"].append(list(questions))
+            entry["updated_at"] = time.time()
+            return True
+
+    def save(self):
+        """Write the bank to disk atomically."""
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.bank_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"version": 1, "entries": self._entries}, f)
+                os.replace(tmp_path, self.bank_path)
+                self._mtime = os.path.getmtime(self.bank_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def __len__(self):
+        with self._lock:
+            self._reload_if_changed()
+            return len(self._entries)
+
+_shared_bank = None
+_shared_bank_lock = threading.Lock()
+
+def get_question_bank():
+    """Get the process-wide question bank.
+
+    Returns:
+        QuestionBank: The shared bank
+    """
+    global _shared_bank
+    if _shared_bank is None:
+        with _shared_bank_lock:
+            if _shared_bank is None:
+                _shared_bank = QuestionBank()
+    return _shared_bank
@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from config.config import Config
+
+class QuestionCache:
+    """Disk-backed, content-addressed cache for LLM-generated question sets.
+
+    Each key holds up to ``variants`` question sets which are served round-robin,
+    so candidates with the same stack do not all receive identical questions.
+    A key is a hit as soon as it has one set; callers fill the remaining
+    variants in the background (see claim_refill). Entries expire after
+    ``ttl`` seconds and the least recently used entries are evicted once more
+    than ``max_entries`` keys are stored.
+
+    Reads do not write: the round-robin cursor and the last access time are
+    kept in memory and flushed to the entry files at most once per
+    ``flush_interval`` seconds.
+    """
+
+    _lock = threading.Lock()
+    _refilling = set()  # Keys with a background refill in progress, shared by every instance
+
+    def __init__(self, cache_dir=None, ttl=None, max_entries=None, variants=None, flush_interval=None):
+        """Initialize the question cache.
+
+        Args:
+            cache_dir (str, optional): Directory for cache files. Defaults to Config.QUESTION_CACHE_DIR.
+            ttl (int, optional): Seconds before an entry expires. Defaults to Config.QUESTION_CACHE_TTL.
+            max_entries (int, optional): Maximum number of keys kept. Defaults to Config.QUESTION_CACHE_MAX_ENTRIES.
+            variants (int, optional): Question sets kept per key. Defaults to Config.QUESTION_CACHE_VARIANTS.
+            flush_interval (float, optional): Seconds between writes of cursors and access times.
+                Defaults to Config.QUESTION_CACHE_FLUSH_INTERVAL.
+        """
+        self.cache_dir = cache_dir if cache_dir else Config.QUESTION_CACHE_DIR
+        self.ttl = ttl if ttl is not None else Config.QUESTION_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else Config.QUESTION_CACHE_MAX_ENTRIES
+        self.variants = max(1, variants if variants is not None else Config.QUESTION_CACHE_VARIANTS)
+        self.flush_interval = flush_interval if flush_interval is not None else Config.QUESTION_CACHE_FLUSH_INTERVAL
+
+        self._cursors = {}  # key -> index of the next set to serve
+        self._accessed = {}  # key -> last access time not yet written to the entry file
+        self._last_flush = time.monotonic()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(tech_stack, question_count, model, prompt):
+        """Build a content-addressed cache key.
+
+        Args:
+            tech_stack (list): Technology IDs from the tech taxonomy
+            question_count (int): Number of questions in the set
+            model (str): The model used for generation
+            prompt (str): The prompt template used for generation
+
+        Returns:
+            str: Hex digest identifying the question set
+        """
+        payload = {
+            "stack": sorted(set(tech_stack)),
+            "count": question_count,
+            "model": model,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading question cache entry: {e}")
+            return None
+
+    def _write(self, path, entry):
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _is_expired(self, entry):
+        return self.ttl > 0 and time.time() - entry.get("created_at", 0) > self.ttl
+
+    def get(self, key):
+        """Get the next cached question set for a key.
+
+        Any stored set is a hit, even before all variants have been filled.
+
+        Args:
+            key (str): The cache key from make_key
+
+        Returns:
+            list or None: A question set, or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            entry = self._read(path)
+            if not entry:
+                return None
+
+            if self._is_expired(entry):
+                self._remove(path)
+                self._cursors.pop(key, None)
+                self._accessed.pop(key, None)
+                return None
+
+            sets = entry.get("sets", [])
+            if not sets:
+                return None
+
+            # Serve the sets round-robin and record the access for LRU eviction, in memory
+            index = self._cursors.get(key, entry.get("next", 0)) % len(sets)
+            self._cursors[key] = index + 1
+            self._accessed[key] = time.time()
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+            return list(sets[index])
+
+    def missing_variants(self, key):
+        """Count the question sets a key still needs.
+
+        Args:
+            key (str): The cache key from make_key
+
+        Returns:
+            int: Variants not yet stored (all of them on a miss)
+        """
+        with self._lock:
+            entry = self._read(self._path(key))
+        if not entry or self._is_expired(entry):
+            return self.variants
+        return max(0, self.variants - len(entry.get("sets", [])))
+
+    def claim_refill(self, key):
+        """Claim the background generation of another set for a key.
+
+        Args:
+            key (str): The cache key from make_key
+
+        Returns:
+            bool: True if the caller should generate a set and then call release_refill,
+                False if the key is full or another refill is already running
+        """
+        if not self.missing_variants(key):
+            return False
+        with self._lock:
+            if key in self._refilling:
+                return False
+            self._refilling.add(key)
+            return True
+
+    def release_refill(self, key):
+        """Mark a refill claimed with claim_refill as finished."""
+        with self._lock:
+            self._refilling.discard(key)
+
+    def _flush(self):
+        """Write the in-memory cursors and access times to the entry files. Call with the lock held."""
+        for key, accessed in self._accessed.items():
+            path = self._path(key)
+            entry = self._read(path)
+            if not entry:
+                continue
+            try:
+                if entry.get("next") != self._cursors.get(key):
+                    entry["next"] = self._cursors.get(key, 0)
+                    self._write(path, entry)
+                # Eviction orders entries by modification time
+                os.utime(path, (accessed, accessed))
+            except Exception as e:
+                print(f"Error updating question cache entry: {e}")
+        self._accessed.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write pending cursors and access times now."""
+        with self._lock:
+            self._flush()
+
+    def put(self, key, questions):
+        """Store a generated question set under a key.
+
+        Args:
+            key (str): The cache key from make_key
+            questions (list): The generated questions
+        """
+        if not questions:
+            return
+
+        path = self._path(key)
+        with self._lock:
+            entry = self._read(path)
+            if not entry or self._is_expired(entry):
+                entry = {"created_at": time.time(), "sets": [], "next": 0}
+
+            if questions not in entry["sets"]:
+                entry["sets"].append(list(questions))
+                # Keep only the newest variants
+                entry["sets"] = entry["sets"][-self.variants:]
+
+            try:
+                self._write(path, entry)
+                # Record recent hits first, so eviction sees them
+                self._flush()
+                self._evict()
+            except Exception as e:
+                print(f"Error writing question cache entry: {e}")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Remove the least recently used entries once the cache exceeds its limit."""
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    continue
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    def clear(self):
+        """Remove every cached question set."""
+        with self._lock:
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(".json"):
+                    self._remove(os.path.join(self.cache_dir, filename))
+            self._cursors.clear()
+            self._accessed.clear()
@@ -0,0 +1,531 @@
+import os
+import abc
+import json
+import time
+import zlib
+import socket
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, unquote
+from config.config import Config
+
+# Header of a serialized session: format name and version
+SESSION_FORMAT = b"TSS\x01"
+
+class SessionStore(abc.ABC):
+    """Interface for storing screening sessions by id.
+
+    Backends must implement get, save and delete; the API server
+    and the Streamlit app talk to every backend through this interface.
+    """
+
+    @abc.abstractmethod
+    def get(self, session_id):
+        """Load a session.
+
+        Args:
+            session_id (str): The session id
+
+        Returns:
+            ScreeningSession: The session, or None if it does not exist or has expired
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def save(self, session):
+        """Store a session under its session_id.
+
+        Args:
+            session (ScreeningSession): The session to store
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, session_id):
+        """Remove a session.
+
+        Args:
+            session_id (str): The session id
+
+        Returns:
+            bool: True if a session was removed
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        return 0
+
+class InMemorySessionStore(SessionStore):
+    """Keeps live session objects in process memory.
+
+    Sessions idle for longer than the TTL expire, and the least recently used
+    sessions are evicted once the store is full. Because the objects are kept
+    as-is, background question jobs keep running between requests.
+    """
+
+    def __init__(self, ttl=None, max_sessions=None):
+        """Initialize the store.
+
+        Args:
+            ttl (float, optional): Idle seconds before a session expires. Defaults to Config.SESSION_TTL.
+            max_sessions (int, optional): Maximum sessions kept. Defaults to Config.MAX_SESSIONS.
+        """
+        self.ttl = ttl if ttl is not None else Config.SESSION_TTL
+        self.max_sessions = max_sessions if max_sessions else Config.MAX_SESSIONS
+        self._sessions = OrderedDict()  # session_id -> (last_access, session), oldest first
+        self._lock = threading.Lock()
+
+    def _expired(self, last_access, now):
+        return self.ttl > 0 and now - last_access > self.ttl
+
+    def _purge_expired(self, now):
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if not self._expired(last_access, now):
+                break
+            del self._sessions[session_id]
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            last_access, session = entry
+            if self._expired(last_access, now):
+                del self._sessions[session_id]
+                return None
+            self._sessions[session_id] = (now, session)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session):
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session.session_id] = (now, session)
+            self._sessions.move_to_end(session.session_id)
+            self._purge_expired(now)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+def dump_session(session):
+    """Serialize a session to compact bytes: a header, then zlib-compressed compact JSON.
+
+    Args:
+        session (ScreeningSession): The session
+
+    Returns:
+        bytes: The serialized session
+    """
+    data = json.dumps(session.to_dict(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return SESSION_FORMAT + zlib.compress(data, 6)
+
+def load_session_data(blob):
+    """Decode bytes written by dump_session.
+
+    Args:
+        blob (bytes): The serialized session
+
+    Returns:
+        dict: The session state, as returned by ScreeningSession.to_dict
+
+    Raises:
+        ValueError: If the bytes are not a serialized session
+    """
+    if not blob.startswith(SESSION_FORMAT):
+        raise ValueError("Unknown session format")
+    return json.loads(zlib.decompress(blob[len(SESSION_FORMAT):]))
+
+def _restore_session(data):
+    # Imported here because the session module depends on much of utils
+    from modules.screening_session import ScreeningSession
+    return ScreeningSession.from_dict(data)
+
+class SerializedSessionStore(SessionStore):
+    """Base for stores that keep sessions serialized outside the process.
+
+    Any replica can load any session, and sessions survive a restart. Each
+    save writes a new random revision next to the data. Loaded sessions are
+    kept in a small LRU cache with their revision; a get first reads only
+    the stored revision and returns the cached object when it still matches,
+    so a session that keeps hitting the same replica is not deserialized on
+    every request and keeps its background question job.
+
+    Subclasses implement _fetch, _store and _remove.
+    """
+
+    def __init__(self, session_factory=None, ttl=None, cache_size=None):
+        """Initialize the store.
+
+        Args:
+            session_factory (callable, optional): Builds a session from to_dict output.
+                Defaults to ScreeningSession.from_dict with default collaborators.
+            ttl (float, optional): Seconds after its last save before a session expires.
+                Defaults to Config.SESSION_TTL.
+            cache_size (int, optional): Loaded sessions kept in memory. Defaults to Config.SESSION_CACHE_SIZE.
+        """
+        self.session_factory = session_factory if session_factory else _restore_session
+        self.ttl = ttl if ttl is not None else Config.SESSION_TTL
+        self.cache_size = cache_size if cache_size is not None else Config.SESSION_CACHE_SIZE
+        self._cache = OrderedDict()  # session_id -> (revision, session), least recently used first
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _fetch(self, session_id, revision):
+        """Read a stored session.
+
+        Args:
+            session_id (str): The session id
+            revision (str or None): Revision of the cached copy
+
+        Returns:
+            tuple or None: (revision, data) where data is None if the stored revision
+            equals the given one, or None if there is no live session
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _store(self, session_id, revision, blob):
+        """Write a serialized session under a new revision."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _remove(self, session_id):
+        """Delete a stored session, returning True if it existed."""
+        raise NotImplementedError
+
+    def _cache_put(self, session_id, revision, session):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[session_id] = (revision, session)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get(self, session_id):
+        with self._lock:
+            cached = self._cache.get(session_id)
+        try:
+            entry = self._fetch(session_id, cached[0] if cached else None)
+        except Exception as e:
+            print(f"Error loading session {session_id}: {e}")
+            return None
+
+        if entry is None:
+            with self._lock:
+                self._cache.pop(session_id, None)
+            return None
+        revision, blob = entry
+        if blob is None and cached is not None:
+            with self._lock:
+                if session_id in self._cache:
+                    self._cache.move_to_end(session_id)
+            return cached[1]
+
+        try:
+            session = self.session_factory(load_session_data(bytes(blob)))
+        except Exception as e:
+            print(f"Error restoring session {session_id}: {e}")
+            return None
+        self._cache_put(session_id, revision, session)
+        return session
+
+    def save(self, session):
+        revision = os.urandom(8).hex()
+        try:
+            self._store(session.session_id, revision, dump_session(session))
+        except Exception as e:
+            # The session carries on in memory; the next save retries
+            print(f"Error saving session {session.session_id}: {e}")
+            return
+        self._cache_put(session.session_id, revision, session)
+        # The stored copy only has the questions generated so far; store the full set once they are in
+        session.on_questions_finished(lambda: self._resave(session, revision))
+
+    def _resave(self, session, revision):
+        """Save a session again, unless it has been saved or deleted since the given revision."""
+        try:
+            entry = self._fetch(session.session_id, revision)
+        except Exception as e:
+            print(f"Error loading session {session.session_id}: {e}")
+            return
+        if entry is not None and entry[1] is None:
+            self.save(session)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._cache.pop(session_id, None)
+        return self._remove(session_id)
+
+_SESSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    revision TEXT NOT NULL,
+    data BLOB NOT NULL,
+    expires_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
+"""
+
+class SQLiteSessionStore(SerializedSessionStore):
+    """Stores sessions in a SQLite database.
+
+    Several app processes on one host, or replicas sharing a volume that
+    supports file locking, can use the same database file.
+    """
+
+    def __init__(self, db_path=None, **kwargs):
+        """Initialize the store.
+
+        Args:
+            db_path (str, optional): Path to the database. Defaults to Config.SESSION_DB_PATH.
+            **kwargs: Passed to SerializedSessionStore
+        """
+        super().__init__(**kwargs)
+        self.db_path = db_path if db_path else Config.SESSION_DB_PATH
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self._connect().executescript(_SESSIONS_SCHEMA)
+
+    def _connect(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _fetch(self, session_id, revision):
+        row = self._connect().execute(
+            """
+            SELECT revision, CASE WHEN revision = ? THEN NULL ELSE data END
+            FROM sessions WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)
+            """,
+            (revision, session_id, time.time())
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def _store(self, session_id, revision, blob):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            """
+            INSERT INTO sessions (id, revision, data, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                revision = excluded.revision, data = excluded.data,
+                expires_at = excluded.expires_at, updated_at = excluded.updated_at
+            """,
+            (session_id, revision, blob, now + self.ttl if self.ttl > 0 else None, now)
+        )
+        if now - self._last_purge > 60:
+            self._last_purge = now
+            conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+
+    def _remove(self, session_id):
+        return self._connect().execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def __len__(self):
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at IS NULL OR expires_at > ?", (time.time(),)
+        ).fetchone()
+        return row[0]
+
+class RedisError(Exception):
+    """An error reply from a Redis server."""
+
+class RedisConnection:
+    """Minimal Redis client speaking RESP2 over one socket.
+
+    Only what the session store needs: sending commands, optionally
+    pipelined, and parsing the replies.
+    """
+
+    def __init__(self, host="127.0.0.1", port=6379, db=0, password=None, username=None, timeout=None):
+        """Connect to a Redis server.
+
+        Args:
+            host (str): Server host
+            port (int): Server port
+            db (int): Database number to select
+            password (str, optional): Password for AUTH
+            username (str, optional): ACL user for AUTH
+            timeout (float, optional): Socket timeout in seconds. Defaults to Config.REDIS_TIMEOUT.
+        """
+        timeout = timeout if timeout else Config.REDIS_TIMEOUT
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if password:
+            self.execute("AUTH", *((username, password) if username else (password,)))
+        if db:
+            self.execute("SELECT", db)
+
+    @staticmethod
+    def _encode(args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif not isinstance(arg, (bytes, bytearray)):
+                arg = str(arg).encode("ascii")
+            parts.append(b"$%d\r\n" % len(arg))
+            parts.append(arg)
+            parts.append(b"\r\n")
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by Redis server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected Redis reply: {line[:20]!r}")
+
+    def pipeline(self, commands):
+        """Send several commands in one round trip.
+
+        Args:
+            commands (list): Commands, each a tuple of arguments
+
+        Returns:
+            list: One reply per command
+
+        Raises:
+            RedisError: If any command failed
+        """
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def execute(self, *args):
+        """Send one command and return its reply."""
+        return self.pipeline([args])[0]
+
+    def close(self):
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+class RedisSessionStore(SerializedSessionStore):
+    """Stores sessions in Redis, or any server speaking the Redis protocol.
+
+    Each session is a hash with "rev" and "data" fields whose expiry is reset
+    on every save, so Redis drops idle sessions by itself.
+    """
+
+    def __init__(self, url=None, key_prefix="talentscout:session:", **kwargs):
+        """Initialize the store.
+
+        Args:
+            url (str, optional): redis://[[user]:password@]host[:port][/db]. Defaults to Config.REDIS_URL.
+            key_prefix (str): Prefix of the session keys
+            **kwargs: Passed to SerializedSessionStore
+        """
+        super().__init__(**kwargs)
+        parts = urlsplit(url if url else Config.REDIS_URL)
+        self._connect_args = {
+            "host": parts.hostname or "127.0.0.1",
+            "port": parts.port or 6379,
+            "db": int(parts.path.strip("/") or 0),
+            "password": unquote(parts.password) if parts.password else None,
+            "username": unquote(parts.username) if parts.username else None
+        }
+        self.key_prefix = key_prefix
+        self._local = threading.local()
+
+    def _execute(self, commands):
+        """Run pipelined commands on this thread's connection, reconnecting once if it dropped."""
+        for attempt in range(2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = RedisConnection(**self._connect_args)
+            try:
+                return conn.pipeline(commands)
+            except (OSError, ConnectionError):
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+    def _fetch(self, session_id, revision):
+        key = self.key_prefix + session_id
+        if revision is not None:
+            stored = self._execute([("HGET", key, "rev")])[0]
+            if stored is None:
+                return None
+            if stored.decode("ascii") == revision:
+                return revision, None
+        stored, data = self._execute([("HMGET", key, "rev", "data")])[0]
+        if stored is None or data is None:
+            return None
+        return stored.decode("ascii"), data
+
+    def _store(self, session_id, revision, blob):
+        key = self.key_prefix + session_id
+        commands = [("HSET", key, "rev", revision, "data", blob)]
+        if self.ttl > 0:
+            commands.append(("EXPIRE", key, max(1, int(self.ttl))))
+        self._execute(commands)
+
+    def _remove(self, session_id):
+        return self._execute([("DEL", self.key_prefix + session_id)])[0] > 0
+
+def create_session_store(backend=None, session_factory=None):
+    """Create the configured session store.
+
+    Args:
+        backend (str, optional): "memory", "sqlite" or "redis". Defaults to Config.SESSION_STORE.
+        session_factory (callable, optional): Builds a session from to_dict output,
+            for the serialized backends
+
+    Returns:
+        SessionStore: The store
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend if backend else Config.SESSION_STORE).lower()
+    if backend == "memory":
+        return InMemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(session_factory=session_factory)
+    if backend == "redis":
+        return RedisSessionStore(session_factory=session_factory)
+    raise ValueError(f"Unknown session store backend: {backend}")
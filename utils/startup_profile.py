@@ -0,0 +1,128 @@
+import sys
+import time
+import importlib
+
+# Project modules loaded when the app or the API server starts, dependencies first
+STARTUP_MODULES = [
+    "config.config",
+    "utils.metrics",
+    "utils.token_utils",
+    "utils.llm_client",
+    "utils.llm_utils",
+    "utils.event_log",
+    "utils.candidate_store",
+    "utils.data_handler",
+    "utils.job_queue",
+    "utils.session_store",
+    "utils.question_cache",
+    "utils.question_bank",
+    "modules.tech_taxonomy",
+    "modules.template_bank",
+    "modules.question_diversity",
+    "modules.transcript",
+    "modules.intent",
+    "modules.context_window",
+    "modules.conversation",
+    "modules.candidate_info",
+    "modules.tech_questions",
+    "modules.question_pipeline",
+    "modules.answer_evaluator",
+    "modules.post_interview",
+    "modules.screening_session"
+]
+
+# Top-level packages that belong to the project rather than to a dependency
+_PROJECT_PACKAGES = {"config", "utils", "modules", "benchmarks"}
+
+def _first_use_steps():
+    """Work deferred until a candidate needs it, in the order a first interview hits it."""
+    from modules.candidate_info import CandidateInfoCollector
+    from modules.tech_questions import TechQuestionGenerator
+    from modules.tech_taxonomy import get_tech_taxonomy
+    from modules.template_bank import get_template_bank
+    from modules.question_diversity import get_question_selector
+    from utils.question_bank import get_question_bank
+    from utils.token_utils import count_tokens
+    from utils.llm_client import get_client
+
+    return [
+        ("CandidateInfoCollector()", CandidateInfoCollector),
+        ("TechQuestionGenerator()", TechQuestionGenerator),
+        ("tech taxonomy", get_tech_taxonomy),
+        ("template bank", get_template_bank),
+        ("question selector (template embeddings)", get_question_selector),
+        ("question bank", lambda: len(get_question_bank())),
+        ("token encoder", lambda: count_tokens("warm up")),
+        ("LLM client (openai, httpx)", lambda: get_client().client),
+        ("pandas (CSV export)", lambda: importlib.import_module("pandas"))
+    ]
+
+def _dependencies(names):
+    """Top-level third-party packages among newly loaded module names."""
+    packages = {name.split(".", 1)[0] for name in names} - _PROJECT_PACKAGES - sys.stdlib_module_names
+    return sorted(package for package in packages if not package.startswith("_"))
+
+def _measure(action):
+    """Run an action, returning (seconds, names of modules it loaded, error)."""
+    before = set(sys.modules)
+    start = time.perf_counter()
+    error = None
+    try:
+        action()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+    return seconds, set(sys.modules) - before, error
+
+def profile_startup(modules=None, first_use=True, out=None):
+    """Report the import cost of each startup module and the cost of deferred initialization.
+
+    Each module is imported in order, so its time includes whatever it pulls
+    in that earlier modules did not. Run this before the app imports its own
+    modules; anything already imported is reported as such.
+
+    Args:
+        modules (list, optional): Modules to import. Defaults to STARTUP_MODULES.
+        first_use (bool): Also time the work deferred to first use (template
+            embeddings, the LLM client, pandas, ...)
+        out (file, optional): Where to write the report. Defaults to stdout.
+
+    Returns:
+        list: (section, name, seconds, new module count) rows, in report order
+    """
+    out = out if out else sys.stdout
+    modules = modules if modules else STARTUP_MODULES
+    rows = []
+
+    def report(section, name, seconds, loaded, error=None):
+        rows.append((section, name, seconds, len(loaded)))
+        dependencies = _dependencies(loaded)
+        note = f"  [{', '.join(dependencies[:6])}{', ...' if len(dependencies) > 6 else ''}]" if dependencies else ""
+        if error:
+            note += f"  ({error})"
+        print(f"  {name:<42} {seconds * 1000:9.1f} ms {len(loaded):6d} modules{note}", file=out)
+
+    print("Startup profile: imports", file=out)
+    total = 0.0
+    for name in modules:
+        if name in sys.modules:
+            print(f"  {name:<42}   already imported", file=out)
+            continue
+        seconds, loaded, error = _measure(lambda: importlib.import_module(name))
+        total += seconds
+        report("import", name, seconds, loaded, error)
+    print(f"  {'total':<42} {total * 1000:9.1f} ms", file=out)
+
+    if first_use:
+        print("Startup profile: first use", file=out)
+        total = 0.0
+        for name, action in _first_use_steps():
+            seconds, loaded, error = _measure(action)
+            total += seconds
+            report("first_use", name, seconds, loaded, error)
+        print(f"  {'total':<42} {total * 1000:9.1f} ms", file=out)
+    out.flush()
+    return rows
+
+if __name__ == "__main__":
+    profile_startup()
@@ -0,0 +1,69 @@
+import threading
+from config.config import Config
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+def _get_encoder(model):
+    """Get the tiktoken encoder for a model, or None if tiktoken is unavailable."""
+    with _encoders_lock:
+        if model in _encoders:
+            return _encoders[model]
+
+        encoder = None
+        try:
+            import tiktoken
+            try:
+                encoder = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # Missing package or encoding files that cannot be downloaded
+            print(f"Warning: tiktoken unavailable, estimating token counts: {e}")
+
+        _encoders[model] = encoder
+        return encoder
+
+def count_tokens(text, model=Config.DEFAULT_MODEL):
+    """Count the tokens in a piece of text.
+
+    Uses the model's tiktoken encoding when available and falls back to an
+    estimate of four characters per token otherwise.
+
+    Args:
+        text (str): The text to count
+        model (str): The model whose tokenizer to use
+
+    Returns:
+        int: The number of tokens
+    """
+    if not text:
+        return 0
+
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text, max_tokens, model=Config.DEFAULT_MODEL):
+    """Truncate text to at most max_tokens tokens.
+
+    Args:
+        text (str): The text to truncate
+        max_tokens (int): The maximum number of tokens to keep
+        model (str): The model whose tokenizer to use
+
+    Returns:
+        str: The truncated text
+    """
+    if max_tokens <= 0:
+        return ""
+
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return text[:max_tokens * 4]
+
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])